@@ -90,6 +90,24 @@ def process_coupang_difference_report(
     while retry_count < max_retries:
         unmapped_items = []
 
+        # 미매핑 행의 옵션명 매핑을 스냅샷에서 조회하고, DB에 없는 보고서 옵션명은 GPT로 일괄 매칭
+        pending_rows = df[~(df["standard_product_name"].notna() & (df["standard_product_name"] != ""))]
+        option_names = [
+            str(row.get(column, "")).strip()
+            for _, row in pending_rows.iterrows()
+            for column in ("DB_옵션명", "월별보고서_옵션명")
+        ]
+        mappings = db.get_mappings_with_set([name for name in dict.fromkeys(option_names) if name])
+        gpt_targets = []
+        for _, row in pending_rows.iterrows():
+            db_option_name = str(row.get("DB_옵션명", "")).strip()
+            report_option_name = str(row.get("월별보고서_옵션명", "")).strip()
+            if db_option_name and mappings.get(db_option_name):
+                continue
+            if report_option_name and not mappings.get(report_option_name):
+                gpt_targets.append(report_option_name)
+        gpt_results = db.match_products_with_gpt(gpt_targets) if gpt_targets else {}
+
         for idx, row in df.iterrows():
             # 이미 매핑된 경우 스킵
             if pd.notna(df.at[idx, "standard_product_name"]) and df.at[idx, "standard_product_name"]:
@@ -100,7 +118,7 @@ def process_coupang_difference_report(
 
             # DB_옵션명이 있으면 DB 조회
             if db_option_name:
-                mapping = db.get_mapping_with_set(db_option_name)
+                mapping = mappings.get(db_option_name)
 
                 if mapping:
                     cost_price = float(mapping.get("cost_price", 0))
@@ -122,7 +140,7 @@ def process_coupang_difference_report(
             # DB_옵션명이 없거나 매핑이 없으면 월별보고서_옵션명으로 시도
             if report_option_name:
                 # 먼저 DB에서 조회
-                mapping = db.get_mapping_with_set(report_option_name)
+                mapping = mappings.get(report_option_name)
 
                 if mapping:
                     # DB에 매핑이 있으면 사용
@@ -142,10 +160,10 @@ def process_coupang_difference_report(
                         df.at[idx, "set_items"] = mapping["items"]
                     continue
 
-                # DB에 없으면 GPT 매핑 시도
-                print(f"  🤖 [보고서: {report_option_name}] GPT 자동 매칭 시도 중...")
+                # DB에 없으면 GPT 매핑 결과 적용
+                print(f"  🤖 [보고서: {report_option_name}] GPT 자동 매칭 결과 확인 중...")
 
-                gpt_result = db.match_product_with_gpt(report_option_name)
+                gpt_result = gpt_results.get(report_option_name)
 
                 if gpt_result and gpt_result.get("confidence", 0) >= 0.7:
                     # 신뢰도 높은 경우 자동 저장
@@ -164,8 +182,9 @@ def process_coupang_difference_report(
                         is_set_product=is_set
                     )
 
-                    # 원가 정보 조회
+                    # 원가 정보 조회 (같은 옵션명의 다음 행은 저장된 매핑 사용)
                     saved_mapping = db.get_mapping_with_set(report_option_name)
+                    mappings[report_option_name] = saved_mapping
                     cost_price = float(saved_mapping.get("cost_price", 0)) if saved_mapping else 0.0
 
                     df.at[idx, "standard_product_name"] = gpt_result["standard_product_name"]
@@ -7,12 +7,22 @@
 - 브랜드 정보
 """
 
-import mysql.connector
 from mysql.connector import Error
 import os
+import re
+import json
+import threading
+from types import MappingProxyType
 from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 import openai
+from db_pool import ensure_database, get_connection, run_once
+from migrations import ensure_schema
+from gpt_utils import (
+    cached_chat_completion_json, candidates_hash, chat_completion_with_backoff,
+    get_gpt_cache, run_concurrently
+)
+from name_matcher import get_fuzzy_index
 
 # Load environment variables
 load_dotenv()
@@ -27,11 +37,177 @@ DB_NAME = os.environ.get("DB_NAME", "seller_mapping")  # 같은 DB 사용
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 if OPENAI_API_KEY:
     openai.api_key = OPENAI_API_KEY
+# SDK 자체 재시도 끄기 (재시도/백오프는 gpt_utils.chat_completion_with_backoff에서만)
+openai.max_retries = 0
+
+# GPT 프롬프트에 넣을 최대 후보 상품 수 (상품 목록이 이보다 작으면 전체 전송)
+GPT_CANDIDATE_TOP_K = int(os.environ.get("GPT_CANDIDATE_TOP_K", "30"))
+PRODUCT_BRANDS = ["닥터시드", "딸로", "테르스", "에이더"]
+# 에이더 상품코드 (예: ADWRB01)
+PRODUCT_CODE_PATTERN = re.compile(r"[A-Za-z]{5}\d{2}")
+# GPT 일괄 매칭 시 요청 하나에 묶을 옵션 수
+GPT_BATCH_SIZE = int(os.environ.get("GPT_BATCH_SIZE", "10"))
+
+PRODUCT_MATCH_SYSTEM_PROMPT = "당신은 상품명 매칭 전문가입니다. 쿠팡 옵션명을 분석하여 정확한 상품명(개별상품 또는 세트상품), 수량 배수, 브랜드를 찾아주세요."
+PRODUCT_MATCH_FIELDS = """1. standard_product_name: 매칭되는 상품명 (개별상품 또는 세트상품명)
+2. quantity_multiplier: 수량 배수 (예: "3개입"이면 3, "5+1"이면 6, "1개"면 1)
+3. brand: 브랜드명 (닥터시드/딸로/테르스/에이더 중 하나) 혹은 시작이 ADDWS01 처럼 영문5자리 숫자2자리로 이루어진경우 에이더입니다.
+4. is_set_product: 세트상품 여부 (true/false)
+5. confidence: 매칭 신뢰도 (0.0 ~ 1.0)
+6. reason: 매칭 이유 설명"""
+PRODUCT_MATCH_EXAMPLES = """예시:
+- 개별상품: standard_product_name은 "ADWRB01 손목 보호대 T1", is_set_product: false
+- 세트상품: standard_product_name은 "닥터시드 건강 3종 세트", is_set_product: true
+
+매칭이 불확실하면 confidence를 낮게 설정하세요.
+매칭할 수 없으면 null을 반환하세요."""
+
+
+def shortlist_products(coupang_option_name: str, standard_products: List[Dict],
+                       set_products: List[Dict], top_k: int = GPT_CANDIDATE_TOP_K) -> Tuple[List[Dict], List[Dict]]:
+    """
+    GPT 프롬프트에 넣을 후보 상품 추리기
+
+    우선순위:
+    1. 옵션명의 상품코드(ADWRB01 등)가 들어간 상품
+    2. 옵션명에서 인식한 브랜드의 상품 (상품코드만 있으면 에이더) - n-gram TF-IDF 유사도 순
+    3. 나머지 상품 - n-gram TF-IDF 유사도 순
+
+    Args:
+        coupang_option_name: 쿠팡 옵션명
+        standard_products: 전체 스탠다드 상품 [{product_name, brand, ...}]
+        set_products: 전체 세트상품 [{set_name, brand, ...}]
+        top_k: 최대 후보 수
+
+    Returns:
+        (후보 스탠다드 상품, 후보 세트상품) - 각각 원래 목록 순서 유지
+    """
+    if len(standard_products) + len(set_products) <= top_k:
+        return standard_products, set_products
+
+    catalog = [(p["product_name"], p["brand"]) for p in standard_products] + \
+              [(s["set_name"], s["brand"]) for s in set_products]
+
+    codes = {code.upper() for code in PRODUCT_CODE_PATTERN.findall(coupang_option_name)}
+    brand = next((b for b in PRODUCT_BRANDS if b in coupang_option_name), None)
+    if brand is None and codes:
+        brand = "에이더"
+
+    ranked = [(0 if codes and any(code in name.upper() for code in codes) else
+               1 if brand and item_brand == brand else 2, position)
+              for position, (name, item_brand) in enumerate(catalog)]
+    similarity = dict(get_fuzzy_index([name for name, _ in catalog]).tfidf.search(coupang_option_name, len(catalog)))
+    ranked.sort(key=lambda item: (item[0], -similarity.get(item[1], 0.0), item[1]))
+
+    selected = {position for _, position in ranked[:top_k]}
+    split = len(standard_products)
+    return ([p for i, p in enumerate(standard_products) if i in selected],
+            [s for i, s in enumerate(set_products) if split + i in selected])
+
+
+def _snapshot_key(name) -> str:
+    """스냅샷 조회 키 (MySQL utf8mb4_unicode_ci 비교처럼 대소문자/앞뒤 공백 무시)"""
+    return str(name).strip().lower()
+
+
+class MappingSnapshot:
+    """
+    쿠팡 매핑 + 스탠다드 상품 원가 + 세트 구성품의 읽기 전용 스냅샷
+
+    get_mapping_with_set()과 같은 결과를 DB 조회 없이 dict 조회로 반환
+    (반환값은 매번 새로 만든 dict이므로 호출하는 쪽에서 수정해도 스냅샷은 바뀌지 않음)
+    """
+
+    __slots__ = ("watermark", "_mappings", "_cost_prices", "_set_items")
+
+    def __init__(self, watermark: Tuple, mappings: List[Dict], standard_products: List[Dict],
+                 set_items: List[Dict]):
+        """
+        Args:
+            watermark: 스냅샷을 만든 시점의 DB 워터마크
+            mappings: coupang_product_mapping 전체 행
+            standard_products: standard_products 전체 행 (product_name, cost_price)
+            set_items: 세트별 구성품 행 (set_name, standard_product_name, quantity) - 구성 순서대로,
+                       구성품이 없는 세트는 standard_product_name이 None인 행 1개
+        """
+        self.watermark = watermark
+
+        cost_prices = {}
+        for p in standard_products:
+            cost_prices.setdefault(_snapshot_key(p["product_name"]), p["cost_price"])
+
+        grouped = {}
+        for item in set_items:
+            items = grouped.setdefault(_snapshot_key(item["set_name"]), [])
+            if item["standard_product_name"] is None:
+                continue  # 구성품이 없는 세트
+            items.append((
+                item["standard_product_name"],
+                item["quantity"],
+                cost_prices.get(_snapshot_key(item["standard_product_name"]), 0),
+            ))
+
+        self._mappings = MappingProxyType({
+            _snapshot_key(m["coupang_option_name"]): (
+                m["standard_product_name"], m["quantity_multiplier"], m["brand"], m["is_set_product"] or 0
+            )
+            for m in mappings
+        })
+        self._cost_prices = MappingProxyType(cost_prices)
+        self._set_items = MappingProxyType({name: tuple(items) for name, items in grouped.items()})
+
+    def __len__(self) -> int:
+        return len(self._mappings)
+
+    def resolve(self, coupang_option_name: str) -> Optional[Dict]:
+        """
+        쿠팡 옵션명에 대한 매핑 (get_mapping_with_set()과 같은 형식)
+
+        Args:
+            coupang_option_name: 쿠팡 옵션명
+
+        Returns:
+            매핑 정보 또는 None
+        """
+        entry = self._mappings.get(_snapshot_key(coupang_option_name))
+        if entry is None:
+            return None
+
+        standard_product_name, quantity_multiplier, brand, is_set_product = entry
+        row = {
+            "standard_product_name": standard_product_name,
+            "quantity_multiplier": quantity_multiplier,
+            "brand": brand,
+            "is_set_product": is_set_product,
+            "cost_price": self._cost_prices.get(_snapshot_key(standard_product_name), 0),
+        }
+
+        # 세트상품인 경우 구성품 정보 추가
+        if is_set_product:
+            items = self._set_items.get(_snapshot_key(standard_product_name))
+            if items is not None:
+                row["items"] = [
+                    {"standard_product_name": name, "quantity": quantity, "cost_price": cost_price}
+                    for name, quantity, cost_price in items
+                ]
+                # 세트상품의 총 원가 계산
+                row["cost_price"] = sum(
+                    float(item.get("cost_price", 0)) * item.get("quantity", 1)
+                    for item in row["items"]
+                )
+            else:
+                row["items"] = []
+
+        return row
 
 
 class CoupangProductMappingDB:
     """쿠팡 상품 매핑 관리 클래스"""
 
+    # 프로세스 공용 매핑 스냅샷 {(host, database): MappingSnapshot}
+    _snapshots: Dict[Tuple[str, str], MappingSnapshot] = {}
+    _snapshot_lock = threading.Lock()
+
     def __init__(self, host: str = DB_HOST, user: str = DB_USER,
                  password: str = DB_PASSWORD, database: str = DB_NAME):
         """
@@ -58,178 +234,23 @@ class CoupangProductMappingDB:
         self.close()
 
     def connect(self):
-        """DB 연결 및 데이터베이스/테이블 자동 생성"""
+        """DB 연결 (연결 풀에서 빌림) 및 데이터베이스 생성/스키마 확인 (프로세스당 한 번)"""
         try:
-            # 먼저 DB 없이 연결하여 데이터베이스 생성
-            self.conn = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password
-            )
-            self.cursor = self.conn.cursor(dictionary=True)
-
             # 데이터베이스가 없으면 생성
-            self.cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
-            self.cursor.execute(f"USE {self.database}")
+            ensure_database(self.database, self.host, self.user, self.password)
 
-            # 테이블이 없으면 자동 생성
-            self._ensure_tables_exist()
+            self.conn = get_connection(self.database, self.host, self.user, self.password)
+            self.cursor = self.conn.cursor(dictionary=True)
 
-            print(f"✅ 쿠팡 상품 매핑 DB 연결: {self.database}")
+            # 스키마 버전 확인 (미적용 마이그레이션이 있으면 자동 적용)
+            if run_once(("schema", self.host, self.database), lambda: ensure_schema(self.conn, self.database)):
+                print(f"✅ 쿠팡 상품 매핑 DB 연결: {self.database}")
         except Error as e:
             print(f"❌ DB 연결 실패: {e}")
             raise
 
-    def _ensure_tables_exist(self):
-        """테이블 존재 확인 및 자동 생성"""
-        try:
-            # 1. 이지어드민 스탠다드 상품 목록 테이블
-            self.cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM information_schema.tables
-                WHERE table_schema = %s AND table_name = 'standard_products'
-            """, (self.database,))
-
-            result = self.cursor.fetchone()
-
-            if result['count'] == 0:
-                print(f"[INFO] standard_products 테이블 생성 중...")
-                create_table_sql = """
-                CREATE TABLE standard_products (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    product_name VARCHAR(500) NOT NULL UNIQUE COMMENT '이지어드민 스탠다드 상품명',
-                    brand VARCHAR(100) NOT NULL COMMENT '브랜드 (닥터시드/딸로/테르스/에이더)',
-                    cost_price DECIMAL(10, 2) DEFAULT 0 COMMENT '원가 (부가세 포함)',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    INDEX idx_product_name (product_name),
-                    INDEX idx_brand (brand)
-                ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
-                """
-                self.cursor.execute(create_table_sql)
-                print(f"✅ standard_products 테이블 생성 완료")
-            else:
-                # 기존 테이블이 있는 경우 cost_price 컬럼 추가 (없으면)
-                self.cursor.execute("""
-                    SELECT COUNT(*) as count
-                    FROM information_schema.columns
-                    WHERE table_schema = %s AND table_name = 'standard_products' AND column_name = 'cost_price'
-                """, (self.database,))
-
-                col_result = self.cursor.fetchone()
-                if col_result['count'] == 0:
-                    print(f"[INFO] standard_products 테이블에 cost_price 컬럼 추가 중...")
-                    self.cursor.execute("""
-                        ALTER TABLE standard_products
-                        ADD COLUMN cost_price DECIMAL(10, 2) DEFAULT 0 COMMENT '원가 (부가세 포함)'
-                    """)
-                    self.conn.commit()
-                    print(f"✅ cost_price 컬럼 추가 완료")
-
-            # 2. 쿠팡-이지어드민 매핑 테이블
-            self.cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM information_schema.tables
-                WHERE table_schema = %s AND table_name = 'coupang_product_mapping'
-            """, (self.database,))
-
-            result = self.cursor.fetchone()
-
-            if result['count'] == 0:
-                print(f"[INFO] coupang_product_mapping 테이블 생성 중...")
-                create_table_sql = """
-                CREATE TABLE coupang_product_mapping (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    coupang_option_name VARCHAR(500) NOT NULL UNIQUE COMMENT '쿠팡 옵션명',
-                    standard_product_name VARCHAR(500) NOT NULL COMMENT '이지어드민 스탠다드 상품명 또는 세트상품명',
-                    quantity_multiplier INT NOT NULL DEFAULT 1 COMMENT '수량 배수 (N개 묶음)',
-                    brand VARCHAR(100) NOT NULL COMMENT '브랜드',
-                    is_set_product BOOLEAN DEFAULT FALSE COMMENT '세트상품 여부',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    INDEX idx_coupang_option (coupang_option_name),
-                    INDEX idx_standard_product (standard_product_name),
-                    INDEX idx_brand (brand)
-                ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
-                """
-                self.cursor.execute(create_table_sql)
-                print(f"✅ coupang_product_mapping 테이블 생성 완료")
-            else:
-                # 기존 테이블에 is_set_product 컬럼 추가 (없으면)
-                self.cursor.execute("""
-                    SELECT COUNT(*) as count
-                    FROM information_schema.columns
-                    WHERE table_schema = %s AND table_name = 'coupang_product_mapping' AND column_name = 'is_set_product'
-                """, (self.database,))
-                col_result = self.cursor.fetchone()
-                if col_result['count'] == 0:
-                    print(f"[INFO] coupang_product_mapping 테이블에 is_set_product 컬럼 추가 중...")
-                    self.cursor.execute("""
-                        ALTER TABLE coupang_product_mapping
-                        ADD COLUMN is_set_product BOOLEAN DEFAULT FALSE COMMENT '세트상품 여부'
-                    """)
-                    self.conn.commit()
-                    print(f"✅ is_set_product 컬럼 추가 완료")
-
-            # 3. 세트상품 정의 테이블
-            self.cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM information_schema.tables
-                WHERE table_schema = %s AND table_name = 'set_products'
-            """, (self.database,))
-
-            result = self.cursor.fetchone()
-
-            if result['count'] == 0:
-                print(f"[INFO] set_products 테이블 생성 중...")
-                create_table_sql = """
-                CREATE TABLE set_products (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    set_name VARCHAR(500) NOT NULL UNIQUE COMMENT '세트상품명',
-                    brand VARCHAR(100) NOT NULL COMMENT '브랜드',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    INDEX idx_set_name (set_name),
-                    INDEX idx_brand (brand)
-                ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
-                """
-                self.cursor.execute(create_table_sql)
-                print(f"✅ set_products 테이블 생성 완료")
-
-            # 4. 세트상품 구성 아이템 테이블
-            self.cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM information_schema.tables
-                WHERE table_schema = %s AND table_name = 'set_product_items'
-            """, (self.database,))
-
-            result = self.cursor.fetchone()
-
-            if result['count'] == 0:
-                print(f"[INFO] set_product_items 테이블 생성 중...")
-                create_table_sql = """
-                CREATE TABLE set_product_items (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    set_id INT NOT NULL COMMENT '세트상품 ID',
-                    standard_product_name VARCHAR(500) NOT NULL COMMENT '구성품 상품명',
-                    quantity INT NOT NULL DEFAULT 1 COMMENT '구성 수량',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    INDEX idx_set_id (set_id),
-                    INDEX idx_product_name (standard_product_name),
-                    FOREIGN KEY (set_id) REFERENCES set_products(id) ON DELETE CASCADE
-                ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
-                """
-                self.cursor.execute(create_table_sql)
-                print(f"✅ set_product_items 테이블 생성 완료")
-
-            self.conn.commit()
-
-        except Error as e:
-            print(f"❌ 테이블 생성 실패: {e}")
-            raise
-
     def close(self):
-        """DB 연결 종료"""
+        """DB 연결 반환 (연결 풀)"""
         if self.cursor:
             self.cursor.close()
         if self.conn and self.conn.is_connected():
@@ -255,6 +276,7 @@ class CoupangProductMappingDB:
                 (product_name.strip(), brand.strip(), cost_price)
             )
             self.conn.commit()
+            self._invalidate_snapshot()
             print(f"✅ 스탠다드 상품 추가: '{product_name}' ({brand}, 원가: {cost_price:,.0f}원)")
             return True
         except Error as e:
@@ -325,6 +347,7 @@ class CoupangProductMappingDB:
                 (coupang_option_name.strip(), standard_product_name.strip(), quantity_multiplier, brand.strip(), is_set_product)
             )
             self.conn.commit()
+            self._invalidate_snapshot()
             set_marker = " [세트]" if is_set_product else ""
             print(f"✅ 매핑 추가: '{coupang_option_name}' → '{standard_product_name}'{set_marker} (x{quantity_multiplier}, {brand})")
             return True
@@ -403,6 +426,7 @@ class CoupangProductMappingDB:
                 (standard_product_name.strip(), quantity_multiplier, brand.strip(), coupang_option_name.strip())
             )
             self.conn.commit()
+            self._invalidate_snapshot()
 
             if self.cursor.rowcount > 0:
                 print(f"✅ 매핑 수정: '{coupang_option_name}' → '{standard_product_name}' (x{quantity_multiplier}, {brand})")
@@ -430,6 +454,7 @@ class CoupangProductMappingDB:
                 (coupang_option_name,)
             )
             self.conn.commit()
+            self._invalidate_snapshot()
 
             if self.cursor.rowcount > 0:
                 print(f"✅ 매핑 삭제: '{coupang_option_name}'")
@@ -460,6 +485,7 @@ class CoupangProductMappingDB:
                 (set_name.strip(), brand.strip())
             )
             self.conn.commit()
+            self._invalidate_snapshot()
             set_id = self.cursor.lastrowid
             print(f"✅ 세트상품 추가: '{set_name}' (ID: {set_id}, {brand})")
             return set_id
@@ -488,6 +514,7 @@ class CoupangProductMappingDB:
                 (set_id, standard_product_name.strip(), quantity)
             )
             self.conn.commit()
+            self._invalidate_snapshot()
             print(f"  ✅ 구성품 추가: '{standard_product_name}' x {quantity}")
             return True
         except Error as e:
@@ -508,19 +535,23 @@ class CoupangProductMappingDB:
             )
             set_products = self.cursor.fetchall()
 
-            # 각 세트상품의 구성품 가져오기
+            # 딕셔너리의 .items() 메서드와 충돌하지 않도록 'set_items' 사용
+            items_by_set = {}
             for set_product in set_products:
-                self.cursor.execute(
-                    """SELECT spi.standard_product_name, spi.quantity,
-                              COALESCE(sp.cost_price, 0) as cost_price
-                       FROM set_product_items spi
-                       LEFT JOIN standard_products sp ON spi.standard_product_name = sp.product_name
-                       WHERE spi.set_id = %s
-                       ORDER BY spi.id""",
-                    (set_product['id'],)
-                )
-                # 딕셔너리의 .items() 메서드와 충돌하지 않도록 'set_items' 사용
-                set_product['set_items'] = self.cursor.fetchall()
+                set_product['set_items'] = items_by_set[set_product['id']] = []
+
+            # 전체 구성품을 한 번에 가져와 세트별로 분배 (세트마다 쿼리하지 않음)
+            self.cursor.execute(
+                """SELECT spi.set_id, spi.standard_product_name, spi.quantity,
+                          COALESCE(sp.cost_price, 0) as cost_price
+                   FROM set_product_items spi
+                   LEFT JOIN standard_products sp ON spi.standard_product_name = sp.product_name
+                   ORDER BY spi.set_id, spi.id"""
+            )
+            for item in self.cursor.fetchall():
+                set_items = items_by_set.get(item.pop('set_id'))
+                if set_items is not None:
+                    set_items.append(item)
 
             return set_products
         except Error as e:
@@ -652,6 +683,7 @@ class CoupangProductMappingDB:
                 )
 
             self.conn.commit()
+            self._invalidate_snapshot()
             print(f"✅ 세트상품 수정: '{set_name}' ({len(items)}개 구성품)")
             return True
         except Error as e:
@@ -708,6 +740,7 @@ class CoupangProductMappingDB:
             )
 
             self.conn.commit()
+            self._invalidate_snapshot()
             print(f"✅ 세트상품 삭제: '{set_name}' (ID: {set_id})")
             return True
 
@@ -740,6 +773,7 @@ class CoupangProductMappingDB:
                  quantity_multiplier, brand.strip(), is_set_product)
             )
             self.conn.commit()
+            self._invalidate_snapshot()
             set_marker = " [세트]" if is_set_product else ""
             print(f"✅ 매핑 추가: '{coupang_option_name}' → '{standard_product_name}'{set_marker} (x{quantity_multiplier}, {brand})")
             return True
@@ -799,6 +833,95 @@ class CoupangProductMappingDB:
             print(f"❌ 매핑 조회 실패: {e}")
             return None
 
+    # ===== 매핑 스냅샷 =====
+
+    def _mapping_watermark(self) -> Tuple:
+        """매핑 관련 테이블의 변경 감지용 워터마크 (행 수 + 최종 수정 시각/ID)"""
+        self.cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM coupang_product_mapping) AS mapping_count,
+                (SELECT MAX(updated_at) FROM coupang_product_mapping) AS mapping_updated,
+                (SELECT COUNT(*) FROM standard_products) AS product_count,
+                (SELECT MAX(updated_at) FROM standard_products) AS product_updated,
+                (SELECT COUNT(*) FROM set_products) AS set_count,
+                (SELECT MAX(updated_at) FROM set_products) AS set_updated,
+                (SELECT COUNT(*) FROM set_product_items) AS item_count,
+                (SELECT MAX(id) FROM set_product_items) AS item_max_id
+        """)
+        return tuple(self.cursor.fetchone().values())
+
+    @classmethod
+    def _invalidate_snapshot(cls):
+        """이 프로세스에서 매핑/상품을 수정했을 때 스냅샷 폐기 (같은 초 안의 수정도 반영되도록)"""
+        with cls._snapshot_lock:
+            cls._snapshots.clear()
+
+    def load_mapping_snapshot(self) -> MappingSnapshot:
+        """
+        매핑 스냅샷 조회 (워터마크가 바뀌었을 때만 다시 적재)
+
+        적재 시 매핑/스탠다드 상품 원가/세트 구성품을 쿼리 3개로 한 번에 조회
+
+        Returns:
+            MappingSnapshot
+        """
+        key = (self.host, self.database)
+        # 풀에서 빌린 연결은 오래 유지되므로, 읽기 트랜잭션을 끝내 다른 세션의 변경이 보이게 함
+        self.conn.commit()
+        watermark = self._mapping_watermark()
+
+        with self._snapshot_lock:
+            snapshot = self._snapshots.get(key)
+        if snapshot is not None and snapshot.watermark == watermark:
+            return snapshot
+
+        self.cursor.execute(
+            """SELECT coupang_option_name, standard_product_name, quantity_multiplier, brand,
+                      COALESCE(is_set_product, FALSE) as is_set_product
+               FROM coupang_product_mapping
+               ORDER BY id"""
+        )
+        mappings = self.cursor.fetchall()
+
+        self.cursor.execute(
+            "SELECT product_name, COALESCE(cost_price, 0) as cost_price FROM standard_products ORDER BY id"
+        )
+        standard_products = self.cursor.fetchall()
+
+        self.cursor.execute(
+            """SELECT s.set_name, spi.standard_product_name, spi.quantity
+               FROM set_products s
+               LEFT JOIN set_product_items spi ON spi.set_id = s.id
+               ORDER BY s.id, spi.id"""
+        )
+        set_items = self.cursor.fetchall()
+
+        snapshot = MappingSnapshot(watermark, mappings, standard_products, set_items)
+        with self._snapshot_lock:
+            self._snapshots[key] = snapshot
+        print(f"[INFO] 쿠팡 매핑 스냅샷 적재: 매핑 {len(mappings)}건, 상품 {len(standard_products)}건, "
+              f"세트 구성품 행 {len(set_items)}건")
+        return snapshot
+
+    def get_mappings_with_set(self, option_names: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        여러 쿠팡 옵션명의 매핑을 스냅샷에서 한 번에 조회
+
+        스냅샷 적재에 실패하면 옵션별 get_mapping_with_set()으로 조회
+
+        Args:
+            option_names: 쿠팡 옵션명 리스트
+
+        Returns:
+            {옵션명: get_mapping_with_set()과 같은 형식의 매핑 또는 None}
+        """
+        try:
+            snapshot = self.load_mapping_snapshot()
+        except Error as e:
+            print(f"[WARN] 매핑 스냅샷 적재 실패 (개별 조회로 진행): {e}")
+            return {name: self.get_mapping_with_set(name) for name in option_names}
+        return {name: snapshot.resolve(name) for name in option_names}
+
     # ===== 데이터 정리 =====
 
     def fix_misclassified_set_products(self) -> int:
@@ -846,6 +969,7 @@ class CoupangProductMappingDB:
                 fixed_count += 1
 
             self.conn.commit()
+            self._invalidate_snapshot()
             print("-" * 80)
             print(f"✅ {fixed_count}건의 매핑을 세트상품으로 수정했습니다.")
             return fixed_count
@@ -857,13 +981,145 @@ class CoupangProductMappingDB:
 
     # ===== GPT 자동 매칭 =====
 
-    def match_product_with_gpt(self, coupang_option_name: str) -> Optional[Dict]:
+    def _load_gpt_catalog(self) -> Tuple[List[Dict], List[Dict]]:
+        """GPT 매칭용 전체 상품 목록 (스탠다드 상품, 세트상품)"""
+        return self.get_all_standard_products(), self.get_all_set_products()
+
+    @staticmethod
+    def _format_candidate_list(standard_products: List[Dict], set_products: List[Dict]) -> str:
+        """프롬프트용 후보 상품 목록 문자열"""
+        product_list = "\n".join([
+            f"- {p['product_name']} (브랜드: {p['brand']}, 타입: 개별상품)"
+            for p in standard_products
+        ])
+
+        set_list = "\n".join([
+            f"- {s['set_name']} (브랜드: {s['brand']}, 타입: 세트상품)"
+            for s in set_products
+        ])
+
+        return product_list + "\n" + set_list if set_list else product_list
+
+    @staticmethod
+    def _find_similar(name: str, items: List[Dict], key: str) -> Tuple[Optional[Dict], float]:
+        """
+        items 중 name과 가장 유사한 항목 (SequenceMatcher 유사도 기준)
+
+        Args:
+            name: GPT가 반환한 상품명
+            items: 상품 목록
+            key: 상품명 필드 ("product_name" 또는 "set_name")
+
+        Returns:
+            (가장 유사한 항목 또는 None, 유사도)
+        """
+        if not items:
+            return None, 0.0
+        best = get_fuzzy_index([item[key] for item in items]).best_match(name)
+        if best is None:
+            return None, 0.0
+        return items[best[0]], best[1]
+
+    @staticmethod
+    def _validate_gpt_match(result: Optional[Dict], standard_products: List[Dict],
+                            set_products: List[Dict]) -> Optional[Dict]:
+        """
+        GPT 응답 검증: DB에 실제 존재하는 상품명으로 보정
+
+        Args:
+            result: GPT 응답 (json)
+            standard_products: 전체 스탠다드 상품
+            set_products: 전체 세트상품
+
+        Returns:
+            검증/보정된 결과 또는 None
+        """
+        # null 응답 처리
+        if result is None or result.get("standard_product_name") is None:
+            return None
+
+        # 상품명 딕셔너리 생성 (검증용)
+        product_name_set = {}
+        set_name_set = {}
+
+        for p in standard_products:
+            product_name_set[p['product_name'].strip().lower()] = p['product_name']
+
+        for s in set_products:
+            set_name_set[s['set_name'].strip().lower()] = s['set_name']
+
+        gpt_product_name = result.get("standard_product_name", "").strip()
+        is_set = result.get("is_set_product", False)
+
+        # 세트상품인 경우
+        if is_set:
+            if gpt_product_name.lower() in set_name_set:
+                # 정확히 일치하는 세트상품명 찾음
+                correct_name = set_name_set[gpt_product_name.lower()]
+                result["standard_product_name"] = correct_name
+                result["is_set_product"] = True
+                print(f"  ✅ GPT 응답 검증 통과 [세트]: {correct_name}")
+                return result
+            else:
+                print(f"  ⚠️  GPT가 반환한 세트상품명이 DB에 없음: '{gpt_product_name}'")
+                # 유사한 세트상품 검색 (카탈로그별 인덱스 재사용)
+                best_match, best_similarity = CoupangProductMappingDB._find_similar(
+                    gpt_product_name, set_products, "set_name"
+                )
+
+                # 유사도가 0.8 이상이면 자동 보정
+                if best_match and best_similarity >= 0.8:
+                    print(f"  ✅ 유사 세트상품 발견 (유사도: {best_similarity:.0%}): {best_match['set_name']}")
+                    result["standard_product_name"] = best_match['set_name']
+                    result["is_set_product"] = True
+                    return result
+                else:
+                    print(f"  ❌ 유사한 세트상품을 찾을 수 없음 (최고 유사도: {best_similarity:.0%})")
+                    return None
+
+        # 개별상품인 경우
+        else:
+            if gpt_product_name.lower() in product_name_set:
+                # 정확히 일치하는 상품명 찾음
+                correct_name = product_name_set[gpt_product_name.lower()]
+                result["standard_product_name"] = correct_name
+                result["is_set_product"] = False
+                print(f"  ✅ GPT 응답 검증 통과: {correct_name}")
+                return result
+
+            # DB에 없는 경우: 유사도 매칭으로 가장 비슷한 상품 찾기
+            print(f"  ⚠️  GPT가 반환한 상품명이 DB에 없음: '{gpt_product_name}'")
+            print(f"  🔍 유사한 상품 검색 중...")
+
+            best_match, best_similarity = CoupangProductMappingDB._find_similar(
+                gpt_product_name, standard_products, "product_name"
+            )
+
+            # 비슷한 상품이 전혀 없으면 DB에 없는 이름을 매칭으로 반환하지 않음 (수동 매핑 필요)
+            if best_match is None:
+                print(f"  ❌ 유사한 상품을 찾을 수 없음 - 수동 확인 필요 (원본: {gpt_product_name})")
+                return None
+
+            # 유사도가 0.8 이상이면 자동 보정
+            if best_similarity >= 0.8:
+                print(f"  ✅ 유사 상품 발견 (유사도: {best_similarity:.0%}): {best_match['product_name']}")
+            result["standard_product_name"] = best_match["product_name"]
+            result["brand"] = best_match["brand"]
+            # 신뢰도를 유사도에 비례해서 조정
+            original_confidence = result.get("confidence", 0.0)
+            result["confidence"] = original_confidence * best_similarity
+            result["reason"] = f"GPT 응답 자동 보정 (유사도: {best_similarity:.0%}). {result.get('reason', '')}"
+            return result
+
+    def match_product_with_gpt(self, coupang_option_name: str,
+                               catalog: Optional[Tuple[List[Dict], List[Dict]]] = None) -> Optional[Dict]:
         """
         GPT를 사용하여 쿠팡 옵션명을 스탠다드 상품 또는 세트상품과 매칭
         GPT 응답을 검증하여 DB에 실제 존재하는 상품명만 반환
 
         Args:
             coupang_option_name: 쿠팡 옵션명
+            catalog: (스탠다드 상품, 세트상품) 미리 조회한 목록 (없으면 DB에서 조회)
 
         Returns:
             {
@@ -880,54 +1136,29 @@ class CoupangProductMappingDB:
             return None
 
         try:
-            # 모든 스탠다드 상품 목록 가져오기
-            standard_products = self.get_all_standard_products()
-
-            # 모든 세트상품 목록 가져오기
-            set_products = self.get_all_set_products()
+            # 모든 스탠다드 상품 / 세트상품 목록 가져오기
+            standard_products, set_products = catalog or self._load_gpt_catalog()
 
             if not standard_products and not set_products:
                 print("⚠️  상품 목록이 비어있습니다.")
                 return None
 
-            # 상품명 딕셔너리 생성 (검증용)
-            product_name_set = {}
-            set_name_set = {}
-
-            for p in standard_products:
-                product_name_set[p['product_name'].strip().lower()] = p['product_name']
-
-            for s in set_products:
-                set_name_set[s['set_name'].strip().lower()] = s['set_name']
-
-            # GPT에게 매칭 요청 (개별 상품 + 세트상품)
-            product_list = "\n".join([
-                f"- {p['product_name']} (브랜드: {p['brand']}, 타입: 개별상품)"
-                for p in standard_products
-            ])
-
-            set_list = "\n".join([
-                f"- {s['set_name']} (브랜드: {s['brand']}, 타입: 세트상품)"
-                for s in set_products
-            ])
-
-            all_products_list = product_list + "\n" + set_list if set_list else product_list
+            # GPT에게 매칭 요청 (개별 상품 + 세트상품) - 전체 목록 대신 상위 후보만 전송
+            candidate_products, candidate_sets = shortlist_products(
+                coupang_option_name, standard_products, set_products
+            )
+            all_products_list = self._format_candidate_list(candidate_products, candidate_sets)
 
             prompt = f"""
 다음은 쿠팡 로켓그로스에서 판매된 상품의 옵션명입니다:
 "{coupang_option_name}"
 
-아래는 이지어드민의 상품 목록입니다 (개별상품 + 세트상품):
+아래는 이지어드민의 상품 후보 목록입니다 (개별상품 + 세트상품):
 {all_products_list}
 
 이 쿠팡 옵션명이 어떤 상품에 해당하는지 분석하고, 다음 정보를 JSON 형식으로 반환해주세요:
 
-1. standard_product_name: 매칭되는 상품명 (개별상품 또는 세트상품명)
-2. quantity_multiplier: 수량 배수 (예: "3개입"이면 3, "5+1"이면 6, "1개"면 1)
-3. brand: 브랜드명 (닥터시드/딸로/테르스/에이더 중 하나) 혹은 시작이 ADDWS01 처럼 영문5자리 숫자2자리로 이루어진경우 에이더입니다.
-4. is_set_product: 세트상품 여부 (true/false)
-5. confidence: 매칭 신뢰도 (0.0 ~ 1.0)
-6. reason: 매칭 이유 설명
+{PRODUCT_MATCH_FIELDS}
 
 응답 형식:
 {{
@@ -939,125 +1170,198 @@ class CoupangProductMappingDB:
   "reason": "설명"
 }}
 
-예시:
-- 개별상품: standard_product_name은 "ADWRB01 손목 보호대 T1", is_set_product: false
-- 세트상품: standard_product_name은 "닥터시드 건강 3종 세트", is_set_product: true
-
-매칭이 불확실하면 confidence를 낮게 설정하세요.
-매칭할 수 없으면 null을 반환하세요.
+{PRODUCT_MATCH_EXAMPLES}
 """
 
-            response = openai.chat.completions.create(
+            # 같은 옵션명 + 같은 상품 목록이면 캐시된 응답 사용
+            # (후보 목록은 옵션명과 전체 목록으로 정해지므로 캐시 키는 전체 목록 기준 - 옵션마다 해시가 달라지면
+            #  캐시 정리 시 다른 옵션 항목이 모두 삭제됨)
+            result = cached_chat_completion_json(
+                openai,
+                kind="coupang_product",
+                input_name=coupang_option_name,
+                candidates=[self._format_candidate_list(standard_products, set_products)],
                 model="gpt-4o-mini",
                 messages=[
-                    {"role": "system", "content": "당신은 상품명 매칭 전문가입니다. 쿠팡 옵션명을 분석하여 정확한 상품명(개별상품 또는 세트상품), 수량 배수, 브랜드를 찾아주세요."},
+                    {"role": "system", "content": PRODUCT_MATCH_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.1,
                 response_format={"type": "json_object"}
             )
 
-            result_text = response.choices[0].message.content.strip()
+            # ===== GPT 응답 검증: DB에 실제 존재하는지 확인 =====
+            return self._validate_gpt_match(result, standard_products, set_products)
 
-            import json
-            result = json.loads(result_text)
+        except Exception as e:
+            print(f"❌ GPT 매칭 실패: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
 
-            # null 응답 처리
-            if result is None or result.get("standard_product_name") is None:
-                return None
+    def match_products_with_gpt(self, option_names: List[str],
+                                batch_size: int = GPT_BATCH_SIZE) -> Dict[str, Optional[Dict]]:
+        """
+        여러 쿠팡 옵션명을 GPT로 일괄 매칭
 
-            gpt_product_name = result.get("standard_product_name", "").strip()
-            is_set = result.get("is_set_product", False)
+        - 상품 목록은 한 번만 조회
+        - batch_size개씩 한 요청에 묶어 JSON 배열로 응답 받기 (요청끼리는 동시 호출)
+        - 옵션별 응답은 GPT 캐시에 개별 저장 (상품 목록이 바뀌면 무효화)
+        - 배치 응답에서 빠진 옵션은 match_product_with_gpt()로 개별 재시도
 
-            # ===== GPT 응답 검증: DB에 실제 존재하는지 확인 =====
+        Args:
+            option_names: 쿠팡 옵션명 리스트
+            batch_size: 요청 하나에 묶을 옵션 수
 
-            # 세트상품인 경우
-            if is_set:
-                if gpt_product_name.lower() in set_name_set:
-                    # 정확히 일치하는 세트상품명 찾음
-                    correct_name = set_name_set[gpt_product_name.lower()]
-                    result["standard_product_name"] = correct_name
-                    result["is_set_product"] = True
-                    print(f"  ✅ GPT 응답 검증 통과 [세트]: {correct_name}")
-                    return result
-                else:
-                    print(f"  ⚠️  GPT가 반환한 세트상품명이 DB에 없음: '{gpt_product_name}'")
-                    # 유사한 세트상품 검색
-                    from difflib import SequenceMatcher
-                    best_match = None
-                    best_similarity = 0.0
-
-                    for db_set in set_products:
-                        db_name = db_set['set_name']
-                        similarity = SequenceMatcher(None, gpt_product_name.lower(), db_name.lower()).ratio()
-
-                        if similarity > best_similarity:
-                            best_similarity = similarity
-                            best_match = db_set
-
-                    # 유사도가 0.8 이상이면 자동 보정
-                    if best_match and best_similarity >= 0.8:
-                        print(f"  ✅ 유사 세트상품 발견 (유사도: {best_similarity:.0%}): {best_match['set_name']}")
-                        result["standard_product_name"] = best_match['set_name']
-                        result["is_set_product"] = True
-                        return result
-                    else:
-                        print(f"  ❌ 유사한 세트상품을 찾을 수 없음 (최고 유사도: {best_similarity:.0%})")
-                        return None
-
-            # 개별상품인 경우
+        Returns:
+            {옵션명: match_product_with_gpt()와 같은 형식의 결과 또는 None} (입력 순서 유지)
+        """
+        option_names = list(dict.fromkeys(name for name in option_names if name))
+        if not option_names:
+            return {}
+
+        if not OPENAI_API_KEY:
+            print("⚠️  OPENAI_API_KEY가 설정되지 않았습니다.")
+            return {name: None for name in option_names}
+
+        try:
+            standard_products, set_products = self._load_gpt_catalog()
+        except Exception as e:
+            print(f"❌ 상품 목록 조회 실패: {e}")
+            return {name: None for name in option_names}
+
+        if not standard_products and not set_products:
+            print("⚠️  상품 목록이 비어있습니다.")
+            return {name: None for name in option_names}
+
+        catalog = (standard_products, set_products)
+        cache = get_gpt_cache()
+        catalog_hash = candidates_hash([self._format_candidate_list(standard_products, set_products)], "gpt-4o-mini")
+
+        # 1. 캐시에 있는 옵션은 GPT 호출 생략
+        raw_results = {}
+        for name in option_names:
+            try:
+                cached = cache.get("coupang_product_batch", name, catalog_hash) if cache else None
+            except Exception as e:
+                print(f"[WARN] GPT 캐시 조회 실패: {e}")
+                cached = None
+            if cached is not None:
+                raw_results[name] = json.loads(cached)
+
+        remaining = [name for name in option_names if name not in raw_results]
+        batches = [tuple(remaining[i:i + batch_size]) for i in range(0, len(remaining), max(1, batch_size))]
+        if batches:
+            print(f"  🤖 GPT 일괄 매칭: {len(remaining)}건 → 요청 {len(batches)}회 "
+                  f"(캐시 {len(raw_results)}건)")
+
+        # 2. 배치 요청 (동시 호출)
+        def match_batch(batch: Tuple[str, ...]) -> Dict[str, Dict]:
+            try:
+                return self._request_batch_match(list(batch), standard_products, set_products)
+            except Exception as e:
+                print(f"❌ GPT 일괄 매칭 실패 ({len(batch)}건): {e}")
+                return {}
+
+        for batch_results in run_concurrently(match_batch, batches).values():
+            for name, item in batch_results.items():
+                raw_results[name] = item
+                if cache:
+                    try:
+                        cache.set("coupang_product_batch", name, catalog_hash,
+                                  json.dumps(item, ensure_ascii=False))
+                    except Exception as e:
+                        print(f"[WARN] GPT 캐시 저장 실패: {e}")
+
+        # 3. DB 기준 검증 (응답에서 빠진 옵션은 개별 재시도)
+        results = {}
+        for name in option_names:
+            if name in raw_results:
+                try:
+                    results[name] = self._validate_gpt_match(raw_results[name], standard_products, set_products)
+                except Exception as e:
+                    print(f"❌ GPT 매칭 검증 실패 [{name}]: {e}")
+                    results[name] = None
             else:
-                if gpt_product_name.lower() in product_name_set:
-                    # 정확히 일치하는 상품명 찾음
-                    correct_name = product_name_set[gpt_product_name.lower()]
-                    result["standard_product_name"] = correct_name
-                    result["is_set_product"] = False
-                    print(f"  ✅ GPT 응답 검증 통과: {correct_name}")
-                    return result
+                print(f"  🔁 [{name}] 일괄 응답에 없음 - 개별 매칭 재시도")
+                results[name] = self.match_product_with_gpt(name, catalog=catalog)
+        return results
 
-                # DB에 없는 경우: 유사도 매칭으로 가장 비슷한 상품 찾기
-                print(f"  ⚠️  GPT가 반환한 상품명이 DB에 없음: '{gpt_product_name}'")
-                print(f"  🔍 유사한 상품 검색 중...")
+    def _request_batch_match(self, option_names: List[str], standard_products: List[Dict],
+                             set_products: List[Dict]) -> Dict[str, Dict]:
+        """
+        옵션 여러 개를 한 번의 GPT 요청으로 매칭 (검증 전 원본 응답)
 
-                from difflib import SequenceMatcher
+        Returns:
+            {옵션명: GPT 응답 항목} (응답에 없는 옵션은 제외)
+        """
+        # 옵션별 상위 후보의 합집합만 전송 (원래 목록 순서 유지)
+        product_names, set_names = set(), set()
+        for name in option_names:
+            candidate_products, candidate_sets = shortlist_products(name, standard_products, set_products)
+            product_names.update(p["product_name"] for p in candidate_products)
+            set_names.update(s["set_name"] for s in candidate_sets)
+        all_products_list = self._format_candidate_list(
+            [p for p in standard_products if p["product_name"] in product_names],
+            [s for s in set_products if s["set_name"] in set_names],
+        )
 
-                best_match = None
-                best_similarity = 0.0
+        option_list = "\n".join(f'{i}. "{name}"' for i, name in enumerate(option_names, 1))
 
-                for db_product in standard_products:
-                    db_name = db_product['product_name']
-                    similarity = SequenceMatcher(None, gpt_product_name.lower(), db_name.lower()).ratio()
+        prompt = f"""
+다음은 쿠팡 로켓그로스에서 판매된 상품의 옵션명 {len(option_names)}개입니다:
+{option_list}
 
-                    if similarity > best_similarity:
-                        best_similarity = similarity
-                        best_match = db_product
+아래는 이지어드민의 상품 후보 목록입니다 (개별상품 + 세트상품):
+{all_products_list}
 
-                # 유사도가 0.8 이상이면 자동 보정
-                if best_match and best_similarity >= 0.8:
-                    print(f"  ✅ 유사 상품 발견 (유사도: {best_similarity:.0%}): {best_match['product_name']}")
-                result["standard_product_name"] = best_match["product_name"]
-                result["brand"] = best_match["brand"]
-                # 신뢰도를 유사도에 비례해서 조정
-                original_confidence = result.get("confidence", 0.0)
-                result["confidence"] = original_confidence * best_similarity
-                result["reason"] = f"GPT 응답 자동 보정 (유사도: {best_similarity:.0%}). {result.get('reason', '')}"
-                return result
+각 쿠팡 옵션명이 어떤 상품에 해당하는지 분석하고, 옵션마다 다음 정보를 JSON 형식으로 반환해주세요:
 
-            # 유사도가 낮으면 신뢰도 0으로 설정하고 수동 매핑 필요
-            if best_match:
-                print(f"  ⚠️  가장 유사한 상품: {best_match['product_name']} (유사도: {best_similarity:.0%})")
-                result["standard_product_name"] = best_match["product_name"]
-                result["brand"] = best_match["brand"]
+0. index: 위 옵션 번호
+{PRODUCT_MATCH_FIELDS}
 
-            result["confidence"] = 0.0
-            result["reason"] = f"GPT 응답이 DB에 없어 검증 실패. 수동 확인 필요. (원본: {gpt_product_name})"
-            return result
+응답 형식:
+{{
+  "results": [
+    {{
+      "index": 1,
+      "standard_product_name": "상품명 (매칭할 수 없으면 null)",
+      "quantity_multiplier": 숫자,
+      "brand": "브랜드명",
+      "is_set_product": true 또는 false,
+      "confidence": 0.0~1.0,
+      "reason": "설명"
+    }}
+  ]
+}}
 
-        except Exception as e:
-            print(f"❌ GPT 매칭 실패: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+{PRODUCT_MATCH_EXAMPLES}
+"""
+
+        response = chat_completion_with_backoff(
+            openai,
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": PRODUCT_MATCH_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.1,
+            response_format={"type": "json_object"}
+        )
+
+        items = json.loads(response.choices[0].message.content.strip()).get("results") or []
+
+        results = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                index = int(item.pop("index"))
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 1 <= index <= len(option_names):
+                results[option_names[index - 1]] = item
+        return results
 
 
 # ===== 편의 함수 =====
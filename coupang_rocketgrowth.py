@@ -5,7 +5,6 @@ sales.sales_report_coupang_2p 테이블에서 판매 데이터를 조회하여
 이카운트 형식으로 변환 및 업로드
 """
 
-import mysql.connector
 from mysql.connector import Error
 import os
 import pandas as pd
@@ -15,6 +14,7 @@ from dotenv import load_dotenv
 import yaml
 
 from coupang_product_mapping import CoupangProductMappingDB
+from db_pool import get_connection
 
 # Load environment variables
 load_dotenv()
@@ -24,6 +24,7 @@ DB_HOST = os.environ.get("DB_HOST", "localhost")
 DB_USER = os.environ.get("DB_USER", "root")
 DB_PASSWORD = os.environ.get("DB_PASSWORD", "")
 SALES_DB_NAME = "sales"  # 쿠팡 판매 데이터 DB
+FETCH_CHUNK_SIZE = 5000  # 기간 조회 시 서버 커서에서 한 번에 읽을 행 수
 
 # ===== 설정 =====
 RATES_YAML = "rates.yml"
@@ -31,29 +32,31 @@ FIXED_WAREHOUSE_CODE = "200"
 SELLER_NAME = "로켓그로스"  # 거래처명, 판매채널, 판매유형 고정
 
 
-def fetch_coupang_sales_data(target_date: str) -> pd.DataFrame:
+def fetch_coupang_sales_data(target_date: str, end_date: Optional[str] = None) -> pd.DataFrame:
     """
     쿠팡 로켓그로스 판매 데이터 조회
 
+    end_date를 주면 Date BETWEEN 쿼리 한 번으로 기간 전체를 조회
+    (서버 커서에서 FETCH_CHUNK_SIZE 행씩 읽어 DataFrame으로 변환)
+
     Args:
-        target_date: 조회할 날짜 (YYYY-MM-DD 형식)
+        target_date: 조회할 날짜 또는 시작 날짜 (YYYY-MM-DD 형식)
+        end_date: 종료 날짜 (YYYY-MM-DD 형식, 생략 시 target_date 하루)
 
     Returns:
-        DataFrame with sales data
+        DataFrame with sales data (날짜, 상품 ID 순)
     """
+    end_date = end_date or target_date
+    period = target_date if end_date == target_date else f"{target_date} ~ {end_date}"
+
     try:
         # DB 연결
-        conn = mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=SALES_DB_NAME
-        )
-        cursor = conn.cursor(dictionary=True)
+        conn = get_connection(SALES_DB_NAME, DB_HOST, DB_USER, DB_PASSWORD)
+        cursor = conn.cursor(dictionary=True, buffered=False)
 
         print(f"✅ 쿠팡 판매 DB 연결: {SALES_DB_NAME}")
 
-        # 날짜 조회 (환불 포함)
+        # 기간 조회 (환불 포함)
         query = """
         SELECT
             Date,
@@ -63,21 +66,27 @@ def fetch_coupang_sales_data(target_date: str) -> pd.DataFrame:
             Qty_sales_total_at_sales_report_coupang_2p,
             Sales_total_amount_at_sales_report_coupang_2p
         FROM sales_report_coupang_2p
-        WHERE Date = %s
-        ORDER BY ID_product_coupang_2p_at_sales_report_coupang_2p
+        WHERE Date BETWEEN %s AND %s
+        ORDER BY Date, ID_product_coupang_2p_at_sales_report_coupang_2p
         """
 
-        cursor.execute(query, (target_date,))
-        rows = cursor.fetchall()
-
-        cursor.close()
-        conn.close()
-
-        if not rows:
-            print(f"⚠️  {target_date}에 대한 판매 데이터가 없습니다.")
+        chunks = []
+        try:
+            cursor.execute(query, (target_date, end_date))
+            while True:
+                rows = cursor.fetchmany(FETCH_CHUNK_SIZE)
+                if not rows:
+                    break
+                chunks.append(pd.DataFrame(rows))
+        finally:
+            cursor.close()
+            conn.close()
+
+        if not chunks:
+            print(f"⚠️  {period}에 대한 판매 데이터가 없습니다.")
             return pd.DataFrame()
 
-        df = pd.DataFrame(rows)
+        df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
         print(f"✅ {len(df)}건의 판매 데이터 조회 완료")
 
         return df
@@ -123,10 +132,14 @@ def validate_and_map_products(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict
                     unique_options[option_name] = []
                 unique_options[option_name].append(idx)
 
+        # DB에서 매핑 조회 (세트상품 지원) 후, 매핑 없는 옵션은 GPT로 일괄 매칭
+        mappings = db.get_mappings_with_set(list(unique_options))
+        unmapped_options = [option_name for option_name, mapping in mappings.items() if not mapping]
+        gpt_results = db.match_products_with_gpt(unmapped_options) if unmapped_options else {}
+
         # 각 고유 옵션에 대해 매핑 확인
         for option_name, indices in unique_options.items():
-            # DB에서 매핑 조회 (세트상품 지원)
-            mapping = db.get_mapping_with_set(option_name)
+            mapping = mappings[option_name]
 
             if mapping:
                 # 매핑 존재
@@ -149,10 +162,10 @@ def validate_and_map_products(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict
                     if is_set and mapping.get("items"):
                         df.at[idx, "set_items"] = mapping["items"]
             else:
-                # 매핑 없음 - GPT 자동 매칭 시도
-                print(f"  🤖 [{option_name}] GPT 자동 매칭 시도 중...")
+                # 매핑 없음 - GPT 자동 매칭 결과 적용
+                print(f"  🤖 [{option_name}] GPT 자동 매칭 결과 확인 중...")
 
-                gpt_result = db.match_product_with_gpt(option_name)
+                gpt_result = gpt_results.get(option_name)
 
                 if gpt_result and gpt_result.get("confidence", 0) >= 0.7:
                     # 신뢰도 높은 경우 자동 저장
@@ -216,10 +229,64 @@ def validate_and_map_products(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict
     return df, pending_mappings
 
 
+def _build_set_composition(set_items: pd.Series) -> Tuple[List[int], pd.DataFrame]:
+    """
+    세트상품 구성표 생성 (같은 구성은 한 번만 계산)
+
+    구성품별 매출 배분 비중 = 구성품 원가 × 구성 수량 / 세트 총 원가
+    (총 원가가 0 이하이면 구성품 수로 균등 배분)
+
+    Args:
+        set_items: 세트상품 행별 구성품 리스트
+
+    Returns:
+        (행별 구성 키 목록, 구성표 DataFrame [_set_key, _item_order, 품목명, _item_qty, _item_cost, _amount_ratio])
+    """
+    key_by_signature = {}
+    row_keys = []
+    composition = []
+
+    for items in set_items:
+        signature = tuple(
+            (item["standard_product_name"], item.get("quantity", 1), item.get("cost_price", 0))
+            for item in items
+        )
+        set_key = key_by_signature.get(signature)
+        if set_key is None:
+            set_key = key_by_signature[signature] = len(key_by_signature)
+
+            total_cost = sum(float(item.get("cost_price", 0)) * item.get("quantity", 1)
+                             for item in items)
+            for order, item in enumerate(items):
+                item_cost = float(item.get("cost_price", 0))
+                item_qty = item.get("quantity", 1)
+                composition.append({
+                    "_set_key": set_key,
+                    "_item_order": order,
+                    "품목명": item["standard_product_name"],
+                    "_item_qty": item_qty,
+                    "_item_cost": item_cost,
+                    "_amount_ratio": item_cost * item_qty / total_cost if total_cost > 0 else 1 / len(items),
+                })
+        row_keys.append(set_key)
+
+    return row_keys, pd.DataFrame(composition)
+
+
+def _truncate(values: pd.Series) -> pd.Series:
+    """int()와 같은 0 방향 절사 (환불 등 음수 금액 포함)"""
+    return values.astype("float64").astype("int64")
+
+
 def convert_to_ecount_format(df: pd.DataFrame, target_date: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     쿠팡 판매 데이터를 이카운트 형식으로 변환 (세트상품 지원)
 
+    행 단위 반복 대신 컬럼 연산으로 계산:
+    - 일반 상품: 금액/수량 컬럼을 그대로 사용
+    - 세트상품: 세트 구성표와 병합해 구성품 행으로 확장 (원가 비중으로 매출 배분)
+    - 원래 행 순서(세트는 구성품 순서대로 그 자리에 확장)와 int() 절사 규칙은 기존과 동일
+
     Args:
         df: 매핑된 쿠팡 판매 데이터
         target_date: 판매일자 (YYYY-MM-DD)
@@ -231,7 +298,7 @@ def convert_to_ecount_format(df: pd.DataFrame, target_date: str) -> Tuple[pd.Dat
         return pd.DataFrame(), pd.DataFrame()
 
     # 매핑되지 않은 데이터 필터링
-    df_mapped = df[df["standard_product_name"] != ""].copy()
+    df_mapped = df[df["standard_product_name"] != ""].reset_index(drop=True)
 
     if df_mapped.empty:
         print("⚠️  매핑된 상품이 없습니다.")
@@ -245,195 +312,122 @@ def convert_to_ecount_format(df: pd.DataFrame, target_date: str) -> Tuple[pd.Dat
     except:
         date_obj = date.today()
 
-    # 판매 데이터 생성 (세트상품 확장 포함)
-    sales_list = []
-    for _, row in df_mapped.iterrows():
-        brand = row["brand"]
-        project = f"{brand}_국내"
-
-        # 매출액 (부가세 포함)
-        total_amount = int(row.get("Sales_total_amount_at_sales_report_coupang_2p", 0) or 0)
-
-        # 세트상품인 경우 구성품별로 분할
-        is_set = row.get("is_set_product", False)
-        set_items = row.get("set_items")
-
-        if is_set and set_items:
-            # 세트상품: 구성품별로 행 생성
-            # 총 원가를 기준으로 각 구성품의 매출 비중 계산
-            total_cost = sum(float(item.get("cost_price", 0)) * item.get("quantity", 1)
-                            for item in set_items)
-
-            qty_multiplier = row["quantity_multiplier"]
-
-            for item in set_items:
-                item_cost = float(item.get("cost_price", 0))
-                item_qty = item.get("quantity", 1)
-                item_total_cost = item_cost * item_qty
-
-                # 매출 비중에 따른 금액 배분
-                if total_cost > 0:
-                    amount_ratio = item_total_cost / total_cost
-                else:
-                    amount_ratio = 1 / len(set_items)
-
-                item_amount = int(total_amount * amount_ratio)
-                supply_amt = int(item_amount / 1.1)
-                vat_amt = item_amount - supply_amt
-
-                # 실제 수량 = 구성품 수량 × 주문 수량 × 수량배수
-                actual_qty = item_qty * qty_multiplier
-
-                sales_list.append({
-                    "일자": date_obj,
-                    "순번": "",
-                    "브랜드": project,
-                    "판매채널": SELLER_NAME,
-                    "거래처코드": "",
-                    "거래처명": SELLER_NAME,
-                    "출하창고": FIXED_WAREHOUSE_CODE,
-                    "통화": "",
-                    "환율": "",
-                    "주문번호": "",
-                    "상품코드": "",
-                    "품목명": item["standard_product_name"],
-                    "옵션": "",
-                    "규격": "",
-                    "수량": actual_qty,
-                    "단가(vat포함)": int(item_amount / actual_qty) if actual_qty > 0 else 0,
-                    "단가": "",
-                    "외화금액": "",
-                    "공급가액": supply_amt,
-                    "부가세": vat_amt,
-                    "송장번호": "",
-                    "수령자주소": "",
-                    "수령자이름": "",
-                    "수령자전화": "",
-                    "수령자휴대폰": "",
-                    "배송메모": "",
-                    "주문상세번호": "",
-                    "생산전표생성": "",
-                    "판매처": SELLER_NAME
-                })
-        else:
-            # 일반 상품: 기존 로직
-            supply_amt = int(total_amount / 1.1)
-            vat_amt = total_amount - supply_amt
-
-            sales_list.append({
-                "일자": date_obj,
-                "순번": "",
-                "브랜드": project,
-                "판매채널": SELLER_NAME,
-                "거래처코드": "",
-                "거래처명": SELLER_NAME,
-                "출하창고": FIXED_WAREHOUSE_CODE,
-                "통화": "",
-                "환율": "",
-                "주문번호": "",
-                "상품코드": "",
-                "품목명": row["standard_product_name"],
-                "옵션": "",
-                "규격": "",
-                "수량": row["actual_quantity"],
-                "단가(vat포함)": int(total_amount / row["actual_quantity"]) if row["actual_quantity"] > 0 else 0,
-                "단가": "",
-                "외화금액": "",
-                "공급가액": supply_amt,
-                "부가세": vat_amt,
-                "송장번호": "",
-                "수령자주소": "",
-                "수령자이름": "",
-                "수령자전화": "",
-                "수령자휴대폰": "",
-                "배송메모": "",
-                "주문상세번호": "",
-                "생산전표생성": "",
-                "판매처": SELLER_NAME
-            })
-
-    sales_df = pd.DataFrame(sales_list)
-
-    # 매입 데이터 생성 (원가 기준, 세트상품 확장 포함)
-    purchase_list = []
-    for _, row in df_mapped.iterrows():
-        brand = row["brand"]
-        project = f"{brand}_국내"
-
-        # 세트상품인 경우 구성품별로 분할
-        is_set = row.get("is_set_product", False)
-        set_items = row.get("set_items")
-
-        if is_set and set_items:
-            # 세트상품: 구성품별로 행 생성
-            qty_multiplier = row["quantity_multiplier"]
-
-            for item in set_items:
-                item_cost = float(item.get("cost_price", 0))
-                item_qty = item.get("quantity", 1)
-
-                # 실제 수량 = 구성품 수량 × 주문 수량 × 수량배수
-                actual_qty = item_qty * qty_multiplier
-
-                # 총 원가 = 단가 × 수량
-                total_cost = int(item_cost * actual_qty)
-                supply_amt = int(total_cost / 1.1)
-                vat_amt = total_cost - supply_amt
-
-                purchase_list.append({
-                    "일자": date_obj,
-                    "순번": "",
-                    "브랜드": project,
-                    "판매채널": SELLER_NAME,
-                    "거래처코드": "",
-                    "거래처명": SELLER_NAME,
-                    "입고창고": FIXED_WAREHOUSE_CODE,
-                    "통화": "",
-                    "환율": "",
-                    "품목코드": "",
-                    "품목명": item["standard_product_name"],
-                    "규격명": "",
-                    "수량": actual_qty,
-                    "단가": int(item_cost),
-                    "외화금액": "",
-                    "공급가액": supply_amt,
-                    "부가세": vat_amt,
-                    "적요": f"{project} {SELLER_NAME}",
-                    "판매처": SELLER_NAME
-                })
-        else:
-            # 일반 상품: 기존 로직
-            cost_price = float(row.get("cost_price", 0))
-            actual_qty = row["actual_quantity"]
-
-            # 총 원가 = 단가 × 수량
-            total_cost = int(cost_price * actual_qty)
-            supply_amt = int(total_cost / 1.1)
-            vat_amt = total_cost - supply_amt
-
-            purchase_list.append({
-                "일자": date_obj,
-                "순번": "",
-                "브랜드": project,
-                "판매채널": SELLER_NAME,
-                "거래처코드": "",
-                "거래처명": SELLER_NAME,
-                "입고창고": FIXED_WAREHOUSE_CODE,
-                "통화": "",
-                "환율": "",
-                "품목코드": "",
-                "품목명": row["standard_product_name"],
-                "규격명": "",
-                "수량": actual_qty,
-                "단가": int(cost_price),
-                "외화금액": "",
-                "공급가액": supply_amt,
-                "부가세": vat_amt,
-                "적요": f"{project} {SELLER_NAME}",
-                "판매처": SELLER_NAME
-            })
-
-    purchase_df = pd.DataFrame(purchase_list)
+    def column(name: str, default) -> pd.Series:
+        if name in df_mapped.columns:
+            return df_mapped[name]
+        return pd.Series(default, index=df_mapped.index)
+
+    # 매출액 (부가세 포함), 원가 단가
+    total_amount = _truncate(
+        pd.to_numeric(column("Sales_total_amount_at_sales_report_coupang_2p", 0), errors="coerce").fillna(0)
+    )
+    cost_price = column("cost_price", 0).astype("float64")
+    project = df_mapped["brand"].astype(str) + "_국내"
+
+    # 세트상품 여부 (구성품이 있는 세트만 확장)
+    set_mask = column("is_set_product", False).map(bool) & column("set_items", None).map(
+        lambda items: isinstance(items, (list, tuple)) and len(items) > 0
+    )
+
+    # 품목 행: 행 위치(_pos), 구성품 순서(_item_order), 배분 매출액(_amount), 원가 단가(_unit_cost)
+    parts = []
+
+    if (~set_mask).any():
+        plain = ~set_mask
+        parts.append(pd.DataFrame({
+            "_pos": df_mapped.index[plain],
+            "_item_order": 0,
+            "브랜드": project[plain].to_numpy(),
+            "품목명": df_mapped.loc[plain, "standard_product_name"].to_numpy(),
+            "수량": df_mapped.loc[plain, "actual_quantity"].to_numpy(),
+            "_amount": total_amount[plain].to_numpy(),
+            "_unit_cost": cost_price[plain].to_numpy(),
+        }))
+
+    if set_mask.any():
+        set_keys, composition = _build_set_composition(df_mapped.loc[set_mask, "set_items"])
+        set_rows = pd.DataFrame({
+            "_pos": df_mapped.index[set_mask],
+            "_set_key": set_keys,
+            "브랜드": project[set_mask].to_numpy(),
+            "_multiplier": df_mapped.loc[set_mask, "quantity_multiplier"].to_numpy(),
+            "_total_amount": total_amount[set_mask].to_numpy(),
+        }).merge(composition, on="_set_key", how="inner")
+
+        # 실제 수량 = 구성품 수량 × 수량배수, 매출은 원가 비중으로 배분
+        set_rows["수량"] = set_rows["_item_qty"] * set_rows["_multiplier"]
+        set_rows["_amount"] = _truncate(set_rows["_total_amount"] * set_rows["_amount_ratio"])
+        set_rows["_unit_cost"] = set_rows["_item_cost"]
+        parts.append(set_rows[["_pos", "_item_order", "브랜드", "품목명", "수량", "_amount", "_unit_cost"]])
+
+    lines = (pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0])
+    lines = lines.sort_values(["_pos", "_item_order"]).reset_index(drop=True)
+
+    quantity = lines["수량"]
+    amount = lines["_amount"]
+    has_quantity = quantity > 0
+
+    # 판매: 공급가액 = 매출액 / 1.1 (절사), 부가세 = 나머지
+    sales_supply = _truncate(amount / 1.1)
+    sales_unit_price = _truncate(amount / quantity.where(has_quantity, 1)).where(has_quantity, 0)
+
+    # 매입: 총 원가 = 단가 × 수량
+    purchase_total = _truncate(lines["_unit_cost"] * quantity)
+    purchase_supply = _truncate(purchase_total / 1.1)
+
+    sales_df = pd.DataFrame({
+        "일자": date_obj,
+        "순번": "",
+        "브랜드": lines["브랜드"],
+        "판매채널": SELLER_NAME,
+        "거래처코드": "",
+        "거래처명": SELLER_NAME,
+        "출하창고": FIXED_WAREHOUSE_CODE,
+        "통화": "",
+        "환율": "",
+        "주문번호": "",
+        "상품코드": "",
+        "품목명": lines["품목명"],
+        "옵션": "",
+        "규격": "",
+        "수량": quantity,
+        "단가(vat포함)": sales_unit_price,
+        "단가": "",
+        "외화금액": "",
+        "공급가액": sales_supply,
+        "부가세": amount - sales_supply,
+        "송장번호": "",
+        "수령자주소": "",
+        "수령자이름": "",
+        "수령자전화": "",
+        "수령자휴대폰": "",
+        "배송메모": "",
+        "주문상세번호": "",
+        "생산전표생성": "",
+        "판매처": SELLER_NAME
+    }, index=lines.index)
+
+    purchase_df = pd.DataFrame({
+        "일자": date_obj,
+        "순번": "",
+        "브랜드": lines["브랜드"],
+        "판매채널": SELLER_NAME,
+        "거래처코드": "",
+        "거래처명": SELLER_NAME,
+        "입고창고": FIXED_WAREHOUSE_CODE,
+        "통화": "",
+        "환율": "",
+        "품목코드": "",
+        "품목명": lines["품목명"],
+        "규격명": "",
+        "수량": quantity,
+        "단가": _truncate(lines["_unit_cost"]),
+        "외화금액": "",
+        "공급가액": purchase_supply,
+        "부가세": purchase_total - purchase_supply,
+        "적요": lines["브랜드"] + f" {SELLER_NAME}",
+        "판매처": SELLER_NAME
+    }, index=lines.index)
 
     print(f"✅ 판매: {len(sales_df)}건, 매입: {len(purchase_df)}건 변환 완료")
 
@@ -695,46 +689,31 @@ def save_to_excel(sales_df: pd.DataFrame, purchase_df: pd.DataFrame,
     print(f"   전표: 매출 {len(sales_voucher_df)}건, 원가매입 {len(cost_voucher_df)}건, 운반비/수수료 {len(fee_voucher_df)}건 저장 완료")
 
 
-def process_coupang_rocketgrowth(target_date: str, max_retries: int = 5) -> Dict[str, Any]:
+def _empty_output(result: Dict[str, Any]) -> Dict[str, Any]:
+    """처리 실패/데이터 없음 시 반환값"""
+    return {
+        "sales": pd.DataFrame(),
+        "purchase": pd.DataFrame(),
+        "voucher": pd.DataFrame(),
+        "result": result
+    }
+
+
+def validate_with_retries(df: pd.DataFrame, result: Dict[str, Any], max_retries: int = 5) -> Optional[pd.DataFrame]:
     """
-    쿠팡 로켓그로스 판매 데이터 처리 메인 함수
+    상품 매핑 검증 (매핑 누락 시 웹 에디터로 매핑 받은 뒤 재검증)
 
     Args:
-        target_date: 판매일자 (YYYY-MM-DD)
+        df: 조회한 쿠팡 판매 데이터 (하루 또는 기간 전체)
+        result: 처리 결과 (result["validation"]에 검증 결과 기록)
         max_retries: 최대 재시도 횟수 (웹 에디터 매핑 후 재검증)
 
     Returns:
-        처리 결과
+        매핑된 DataFrame 또는 None (검증 실패)
     """
-    print("=" * 80)
-    print(f"쿠팡 로켓그로스 판매 데이터 처리: {target_date}")
-    print("=" * 80)
-
-    result = {
-        "fetch": None,
-        "validation": None,
-        "conversion": None
-    }
-
-    # ===== 데이터 조회 및 매핑 재시도 루프 =====
     for attempt in range(1, max_retries + 1):
         try:
-            if attempt == 1:
-                print(f"\n[1단계] {target_date} 판매 데이터 조회 중...")
-                df = fetch_coupang_sales_data(target_date)
-
-                if df.empty:
-                    print("❌ 조회된 데이터가 없습니다.")
-                    result["fetch"] = {"success": False, "error": "No data"}
-                    return {
-                        "sales": pd.DataFrame(),
-                        "purchase": pd.DataFrame(),
-                        "voucher": pd.DataFrame(),
-                        "result": result
-                    }
-
-                result["fetch"] = {"success": True, "count": len(df)}
-            else:
+            if attempt > 1:
                 print(f"\n[1단계-재시도 {attempt}/{max_retries}] 매핑 후 재검증 중...")
 
             # 2. 상품 매핑 검증
@@ -813,23 +792,13 @@ def process_coupang_rocketgrowth(target_date: str, max_retries: int = 5) -> Dict
                 except KeyboardInterrupt:
                     print("\n⚠️  사용자가 중단했습니다.")
                     result["validation"] = {"success": False, "pending_count": len(pending_mappings)}
-                    return {
-                        "sales": pd.DataFrame(),
-                        "purchase": pd.DataFrame(),
-                        "voucher": pd.DataFrame(),
-                        "result": result
-                    }
+                    return None
                 except Exception as e:
                     print(f"\n⚠️  웹 에디터 실행 실패: {e}")
                     print("   수동으로 coupang_product_mapping.py를 사용하여 매핑을 추가하세요.")
                     print("   매핑 완료 후 프로그램을 다시 실행하세요.")
                     result["validation"] = {"success": False, "pending_count": len(pending_mappings)}
-                    return {
-                        "sales": pd.DataFrame(),
-                        "purchase": pd.DataFrame(),
-                        "voucher": pd.DataFrame(),
-                        "result": result
-                    }
+                    return None
             else:
                 # 모든 매핑이 완료됨 - 루프 탈출하고 변환 진행
                 print("\n✅ 모든 상품 검증 완료!")
@@ -840,34 +809,85 @@ def process_coupang_rocketgrowth(target_date: str, max_retries: int = 5) -> Dict
             import traceback
             traceback.print_exc()
             result["validation"] = {"success": False, "error": str(e)}
-            return {
-                "sales": pd.DataFrame(),
-                "purchase": pd.DataFrame(),
-                "voucher": pd.DataFrame(),
-                "result": result
-            }
+            return None
     else:
         # 최대 재시도 횟수 초과
         print(f"\n❌ 최대 재시도 횟수({max_retries}회)를 초과했습니다.")
         print("   매핑을 완료한 후 프로그램을 다시 실행하세요.")
         result["validation"] = {"success": False, "error": "Max retries exceeded"}
-        return {
-            "sales": pd.DataFrame(),
-            "purchase": pd.DataFrame(),
-            "voucher": pd.DataFrame(),
-            "result": result
-        }
+        return None
 
     result["validation"] = {"success": True}
+    return df_mapped
 
-    # 3. 이카운트 형식 변환
-    print(f"\n[3단계] 이카운트 형식 변환 중...")
+
+def convert_day(df_mapped: pd.DataFrame, target_date: str) -> Dict[str, pd.DataFrame]:
+    """
+    매핑된 하루치 데이터를 이카운트 형식 + 전표로 변환
+
+    Args:
+        df_mapped: 매핑된 쿠팡 판매 데이터 (해당 날짜분)
+        target_date: 판매일자 (YYYY-MM-DD)
+
+    Returns:
+        {"sales", "purchase", "sales_voucher", "cost_voucher", "fee_voucher"} DataFrame
+    """
     sales_df, purchase_df = convert_to_ecount_format(df_mapped, target_date)
 
-    # 전표 생성
-    sales_voucher_df = build_sales_voucher(sales_df)
-    cost_voucher_df = build_cost_voucher(purchase_df)
-    fee_voucher_df = build_voucher_from_sales(sales_df)
+    return {
+        "sales": sales_df,
+        "purchase": purchase_df,
+        "sales_voucher": build_sales_voucher(sales_df),
+        "cost_voucher": build_cost_voucher(purchase_df),
+        "fee_voucher": build_voucher_from_sales(sales_df),
+    }
+
+
+def process_coupang_rocketgrowth(target_date: str, max_retries: int = 5) -> Dict[str, Any]:
+    """
+    쿠팡 로켓그로스 판매 데이터 처리 메인 함수
+
+    Args:
+        target_date: 판매일자 (YYYY-MM-DD)
+        max_retries: 최대 재시도 횟수 (웹 에디터 매핑 후 재검증)
+
+    Returns:
+        처리 결과
+    """
+    print("=" * 80)
+    print(f"쿠팡 로켓그로스 판매 데이터 처리: {target_date}")
+    print("=" * 80)
+
+    result = {
+        "fetch": None,
+        "validation": None,
+        "conversion": None
+    }
+
+    # 1. 데이터 조회
+    print(f"\n[1단계] {target_date} 판매 데이터 조회 중...")
+    df = fetch_coupang_sales_data(target_date)
+
+    if df.empty:
+        print("❌ 조회된 데이터가 없습니다.")
+        result["fetch"] = {"success": False, "error": "No data"}
+        return _empty_output(result)
+
+    result["fetch"] = {"success": True, "count": len(df)}
+
+    # 2. 상품 매핑 검증 (재시도 루프)
+    df_mapped = validate_with_retries(df, result, max_retries)
+    if df_mapped is None:
+        return _empty_output(result)
+
+    # 3. 이카운트 형식 변환 + 전표 생성
+    print(f"\n[3단계] 이카운트 형식 변환 중...")
+    output = convert_day(df_mapped, target_date)
+    sales_df = output["sales"]
+    purchase_df = output["purchase"]
+    sales_voucher_df = output["sales_voucher"]
+    cost_voucher_df = output["cost_voucher"]
+    fee_voucher_df = output["fee_voucher"]
 
     result["conversion"] = {
         "success": True,
@@ -900,6 +920,9 @@ def process_coupang_date_range(start_date: str, end_date: str, max_retries: int
     """
     쿠팡 로켓그로스 판매 데이터 날짜 범위 처리
 
+    기간 전체를 Date BETWEEN 쿼리 한 번으로 조회하고 매핑 검증도 한 번만 수행한 뒤,
+    날짜별 변환/전표 생성은 메모리에서 처리
+
     Args:
         start_date: 시작 날짜 (YYYY-MM-DD)
         end_date: 종료 날짜 (YYYY-MM-DD)
@@ -953,39 +976,46 @@ def process_coupang_date_range(start_date: str, end_date: str, max_retries: int
     dates_processed = []
     dates_failed = []
 
-    # 날짜별로 순차 처리
+    # 기간 전체를 쿼리 한 번으로 조회하고 매핑 검증도 한 번만 수행
+    print(f"\n[1단계] {start_date} ~ {end_date} 판매 데이터 조회 중...")
+    df = fetch_coupang_sales_data(start_date, end_date)
+
+    df_by_date = {}
+    if df.empty:
+        print("❌ 조회된 데이터가 없습니다.")
+    else:
+        validation_result = {"fetch": {"success": True, "count": len(df)}, "validation": None}
+        df_mapped = validate_with_retries(df, validation_result, max_retries)
+
+        if df_mapped is None:
+            print("❌ 상품 매핑 검증 실패 - 기간 전체를 처리하지 않습니다.")
+        else:
+            date_keys = pd.to_datetime(df_mapped["Date"]).dt.strftime("%Y-%m-%d")
+            df_by_date = {key: group for key, group in df_mapped.groupby(date_keys, sort=False)}
+
+    # 날짜별 변환 (메모리에서)
+    print(f"\n[3단계] 이카운트 형식 변환 중...")
     for idx, target_date in enumerate(dates, 1):
-        print("\n" + "=" * 80)
-        print(f"[{idx}/{len(dates)}] {target_date} 처리 중...")
-        print("=" * 80)
+        print("\n" + "-" * 80)
+        print(f"[{idx}/{len(dates)}] {target_date} 변환 중...")
+
+        day_df = df_by_date.get(target_date)
+        if day_df is None:
+            dates_failed.append(target_date)
+            print(f"⚠️  {target_date} 처리 실패 또는 데이터 없음")
+            continue
 
         try:
-            result = process_coupang_rocketgrowth(target_date, max_retries)
-
-            # 성공한 경우 데이터 수집
-            if result["result"].get("conversion", {}).get("success", False):
-                sales_df = result["sales"]
-                purchase_df = result["purchase"]
-                sales_voucher_df = result["sales_voucher"]
-                cost_voucher_df = result["cost_voucher"]
-                fee_voucher_df = result["fee_voucher"]
-
-                if not sales_df.empty:
-                    all_sales.append(sales_df)
-                if not purchase_df.empty:
-                    all_purchase.append(purchase_df)
-                if not sales_voucher_df.empty:
-                    all_sales_voucher.append(sales_voucher_df)
-                if not cost_voucher_df.empty:
-                    all_cost_voucher.append(cost_voucher_df)
-                if not fee_voucher_df.empty:
-                    all_fee_voucher.append(fee_voucher_df)
-
-                dates_processed.append(target_date)
-                print(f"✅ {target_date} 처리 완료")
-            else:
-                dates_failed.append(target_date)
-                print(f"⚠️  {target_date} 처리 실패 또는 데이터 없음")
+            output = convert_day(day_df, target_date)
+
+            for collected, key in ((all_sales, "sales"), (all_purchase, "purchase"),
+                                   (all_sales_voucher, "sales_voucher"), (all_cost_voucher, "cost_voucher"),
+                                   (all_fee_voucher, "fee_voucher")):
+                if not output[key].empty:
+                    collected.append(output[key])
+
+            dates_processed.append(target_date)
+            print(f"✅ {target_date} 처리 완료")
 
         except Exception as e:
             dates_failed.append(target_date)
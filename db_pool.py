@@ -0,0 +1,104 @@
+"""
+MySQL 연결 풀 (프로세스 공용)
+
+- (호스트, 사용자, DB)별로 풀을 하나만 만들고, with 블록마다 연결을 빌려 씀 (close() 시 풀에 반환)
+- DB 생성/테이블 확인 같은 초기화는 프로세스당 한 번만 실행
+"""
+
+import os
+import re
+import threading
+from typing import Callable, Dict, Tuple
+
+import mysql.connector
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# ===== 설정 =====
+DB_HOST = os.environ.get("DB_HOST", "localhost")
+DB_USER = os.environ.get("DB_USER", "root")
+DB_PASSWORD = os.environ.get("DB_PASSWORD", "")
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))  # DB별 풀 크기
+
+_pools: Dict[Tuple[str, str, str], pooling.MySQLConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+_bootstrapped = set()
+_bootstrap_lock = threading.Lock()
+
+
+def run_once(key: Tuple, func: Callable[[], None]) -> bool:
+    """
+    key별로 프로세스당 한 번만 func 실행 (실패하면 다음 호출에서 다시 시도)
+
+    Args:
+        key: 초기화 구분 키 (예: ("seller_mapping", host, database))
+        func: 초기화 함수
+
+    Returns:
+        이번 호출에서 실행했는지 여부
+    """
+    with _bootstrap_lock:
+        if key in _bootstrapped:
+            return False
+        func()
+        _bootstrapped.add(key)
+        return True
+
+
+def ensure_database(database: str, host: str = DB_HOST, user: str = DB_USER,
+                    password: str = DB_PASSWORD):
+    """데이터베이스가 없으면 생성 (프로세스당 한 번)"""
+    def create():
+        conn = mysql.connector.connect(host=host, user=user, password=password)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {database} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+            cursor.close()
+        finally:
+            conn.close()
+
+    run_once(("database", host, database), create)
+
+
+def get_connection(database: str, host: str = DB_HOST, user: str = DB_USER,
+                   password: str = DB_PASSWORD):
+    """
+    풀에서 연결 빌리기
+
+    풀이 모두 사용 중이면 풀 밖의 임시 연결을 반환 (close() 시 바로 종료)
+
+    Args:
+        database: 데이터베이스 이름
+        host: MySQL 호스트
+        user: MySQL 사용자
+        password: MySQL 비밀번호
+
+    Returns:
+        MySQL 연결 (close()로 반환)
+    """
+    key = (host, user, database)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool_name = re.sub(r"\W", "_", f"{database}_{len(_pools)}")[:60]
+            pool = pooling.MySQLConnectionPool(
+                pool_name=pool_name,
+                pool_size=DB_POOL_SIZE,
+                pool_reset_session=True,
+                host=host,
+                user=user,
+                password=password,
+                database=database,
+            )
+            _pools[key] = pool
+
+    try:
+        return pool.get_connection()
+    except PoolError:
+        print(f"[WARN] DB 연결 풀이 모두 사용 중입니다 ({database}) - 임시 연결 사용")
+        return mysql.connector.connect(host=host, user=user, password=password, database=database)
@@ -0,0 +1,421 @@
+"""
+이카운트 API 클라이언트
+
+- requests.Session + HTTPAdapter 연결 풀로 TCP/TLS 연결 재사용 (배치마다 새 연결을 맺지 않음)
+- 요청 본문 gzip 압축 (ECOUNT_GZIP_REQUESTS=1, 서버가 거부하면 자동으로 비압축 전송)
+- 호출별 소요 시간/전송 바이트 기록 (엔드포인트별 요약 출력)
+- 응답 오류 검사(HTTP 상태, JSON, Status/Error)를 한 곳에서 처리
+- 세션 관리: SESSION_ID를 만료 시각과 함께 디스크에 캐시(소유자만 읽기/쓰기)해 실행 간 재사용,
+  세션 만료 오류가 나면 다시 로그인 후 한 번 재시도
+"""
+
+import os
+import json
+import gzip
+import time
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from ecount_upload import ECOUNT_UPLOAD_WORKERS, EcountAPIError
+
+# Load environment variables
+load_dotenv()
+
+# ===== 설정 =====
+ECOUNT_HTTP_POOL_SIZE = int(os.environ.get("ECOUNT_HTTP_POOL_SIZE", str(max(4, ECOUNT_UPLOAD_WORKERS))))  # 호스트당 유지할 연결 수
+ECOUNT_GZIP_REQUESTS = os.environ.get("ECOUNT_GZIP_REQUESTS", "0") == "1"   # 요청 본문 gzip 압축 여부
+ECOUNT_API_BASE_URL = os.environ.get("ECOUNT_API_BASE_URL", "")            # API 주소 직접 지정 (로컬 스텁 서버 검증용)
+GZIP_MIN_BYTES = 1024                                                      # 이보다 작은 본문은 압축하지 않음
+ECOUNT_SESSION_CACHE_PATH = os.environ.get("ECOUNT_SESSION_CACHE_PATH", "./.cache/ecount_session.json")  # 세션 캐시 파일
+ECOUNT_SESSION_TTL_MINUTES = float(os.environ.get("ECOUNT_SESSION_TTL_MINUTES", "30"))  # 마지막 사용 후 세션 유효 시간 (0이면 캐시 안 함)
+SESSION_SAVE_INTERVAL = 60.0                                               # 사용 시각을 파일에 반영하는 최소 간격 (초)
+
+# gzip 본문을 서버가 받아들이지 못할 때 돌아오는 HTTP 상태
+GZIP_REJECTED_STATUS = {400, 411, 415}
+
+# 세션 만료 판단 기준 (HTTP/API 상태, 오류 코드 - 메시지 문구로는 판단하지 않음)
+SESSION_EXPIRED_STATUS = {401}
+SESSION_EXPIRED_CODES = {"401"}
+# 요청 자체가 거부된 오류로 보지 않는 상태 (요청 제한/서버 오류)
+NON_AUTH_STATUS = {429}
+
+
+class EcountClient:
+    """
+    이카운트 OAPI 호출 클라이언트 (연결 풀 공유, 스레드 간 공유 가능)
+    """
+
+    def __init__(self, zone: str = "AD", test: bool = False, pool_size: int = ECOUNT_HTTP_POOL_SIZE,
+                 gzip_requests: bool = ECOUNT_GZIP_REQUESTS, base_url: str = ECOUNT_API_BASE_URL):
+        """
+        Args:
+            zone: Zone 정보 (기본: AD)
+            test: 테스트 서버 사용 여부 (sboapi / oapi)
+            pool_size: 유지할 연결 수 (동시 업로드 수 이상 권장)
+            gzip_requests: 요청 본문 gzip 압축 여부
+            base_url: API 주소 직접 지정 (비우면 zone/test로 결정)
+        """
+        sub = "sboapi" if test else "oapi"
+        self.base_url = (base_url or f"https://{sub}{zone}.ecount.com/OAPI/V2").rstrip("/")
+        self.zone = zone
+        self.gzip_requests = gzip_requests
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+        })
+
+        self.timings: List[Tuple[str, float, int]] = []  # [(엔드포인트, 소요 초, 전송 바이트)]
+        self._timings_lock = threading.Lock()
+
+    def _encode(self, payload: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+        """요청 본문 직렬화 (설정 시 gzip 압축)"""
+        body = json.dumps(payload).encode("utf-8")
+        if self.gzip_requests and len(body) >= GZIP_MIN_BYTES:
+            return gzip.compress(body), {"Content-Encoding": "gzip"}
+        return body, {}
+
+    def post(self, endpoint: str, payload: Dict[str, Any], session_id: Optional[str] = None,
+             timeout: int = 30) -> dict:
+        """
+        API 호출 + 응답 오류 검사
+
+        Args:
+            endpoint: API 엔드포인트 (예: "OAPILogin", "Sale/SaveSale")
+            payload: 요청 본문
+            session_id: 로그인 후 받은 세션 ID (로그인 API는 None)
+            timeout: 타임아웃 (초)
+
+        Returns:
+            API 응답 JSON (오류 시 EcountAPIError 발생)
+        """
+        url = f"{self.base_url}/{endpoint}"
+        params = {"SESSION_ID": session_id} if session_id else None
+
+        body, headers = self._encode(payload)
+        started = time.perf_counter()
+        resp = self.session.post(url, params=params, data=body, headers=headers, timeout=timeout)
+
+        # 서버가 gzip 본문을 거부하면 이 클라이언트는 이후 비압축으로 전송
+        if headers and resp.status_code in GZIP_REJECTED_STATUS:
+            print(f"[WARN] 이카운트 서버가 gzip 요청을 거부했습니다 (HTTP {resp.status_code}) - 비압축으로 재전송")
+            self.gzip_requests = False
+            body, headers = self._encode(payload)
+            resp = self.session.post(url, params=params, data=body, headers=headers, timeout=timeout)
+
+        elapsed = time.perf_counter() - started
+        with self._timings_lock:
+            self.timings.append((endpoint, elapsed, len(body)))
+
+        # HTTP 레벨 에러 체크
+        if resp.status_code != 200:
+            raise EcountAPIError(f"[HTTP {resp.status_code}] {resp.text}", status=resp.status_code)
+
+        # JSON 파싱
+        try:
+            result = resp.json()
+        except json.JSONDecodeError:
+            raise RuntimeError("응답이 JSON 형식이 아닙니다:\n" + resp.text)
+
+        # API 레벨 에러 체크 (Status / Error 규칙)
+        status = str(result.get("Status"))
+        error = result.get("Error")
+
+        if status != "200" or error:
+            code = None if not error else error.get("Code")
+            msg = None if not error else error.get("Message")
+            detail = None if not error else error.get("MessageDetail")
+            raise EcountAPIError(f"[API Error] Status={status}, Code={code}, Message={msg}, Detail={detail}",
+                                 status=int(status) if status.isdigit() else None, code=code,
+                                 api_message=f"{msg or ''} {detail or ''}".strip())
+
+        return result
+
+    def login(self, com_code: str, user_id: str, api_cert_key: str,
+              lan_type: str = "ko-KR", timeout: int = 15) -> dict:
+        """
+        로그인 API 호출
+
+        Returns:
+            전체 응답 JSON (session_id는 result['Data']['Datas']['SESSION_ID'])
+        """
+        payload = {
+            "COM_CODE": com_code,
+            "USER_ID": user_id,
+            "API_CERT_KEY": api_cert_key,
+            "LAN_TYPE": lan_type,
+            "ZONE": self.zone,  # 명세상 본문에도 ZONE 전달
+        }
+        return self.post("OAPILogin", payload, timeout=timeout)
+
+    def save_sale(self, session_id: str, sale_list: List[Dict[str, Any]], timeout: int = 30) -> dict:
+        """판매 입력 (Sale/SaveSale)"""
+        return self.post("Sale/SaveSale", {"SaleList": sale_list}, session_id=session_id, timeout=timeout)
+
+    def save_purchase(self, session_id: str, purchase_list: List[Dict[str, Any]], timeout: int = 30) -> dict:
+        """구매 입력 (Purchases/SavePurchases)"""
+        return self.post("Purchases/SavePurchases", {"PurchasesList": purchase_list},
+                         session_id=session_id, timeout=timeout)
+
+    def timing_summary(self, reset: bool = False) -> Dict[str, Dict[str, float]]:
+        """
+        엔드포인트별 호출 통계
+
+        Args:
+            reset: 조회 후 기록 초기화 여부
+
+        Returns:
+            {엔드포인트: {"calls", "total_seconds", "avg_seconds", "max_seconds", "bytes"}}
+        """
+        with self._timings_lock:
+            timings = list(self.timings)
+            if reset:
+                self.timings.clear()
+
+        summary: Dict[str, Dict[str, float]] = {}
+        for endpoint, elapsed, sent in timings:
+            stats = summary.setdefault(endpoint, {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0, "bytes": 0})
+            stats["calls"] += 1
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+            stats["bytes"] += sent
+        for stats in summary.values():
+            stats["avg_seconds"] = stats["total_seconds"] / stats["calls"]
+        return summary
+
+    def print_timing_summary(self, reset: bool = True):
+        """엔드포인트별 호출 통계 출력"""
+        for endpoint, stats in self.timing_summary(reset=reset).items():
+            print(f"  ⏱️  {endpoint}: {stats['calls']}회, 평균 {stats['avg_seconds']:.2f}초 "
+                  f"(최대 {stats['max_seconds']:.2f}초), 전송 {stats['bytes'] / 1024:,.0f}KB")
+
+
+_clients: Dict[Tuple[str, bool], EcountClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_ecount_client(zone: str = "AD", test: bool = False) -> EcountClient:
+    """
+    (zone, 테스트 서버 여부)별 공용 클라이언트 (프로세스 내 연결 재사용)
+
+    Args:
+        zone: Zone 정보
+        test: 테스트 서버 사용 여부
+
+    Returns:
+        EcountClient
+    """
+    key = (zone, test)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = EcountClient(zone=zone, test=test)
+        return client
+
+
+def is_session_expired_error(e: Exception) -> bool:
+    """세션 만료로 인한 API 오류인지 여부 (만료 상태/오류 코드로만 판단)"""
+    if not isinstance(e, EcountAPIError):
+        return False
+    return e.status in SESSION_EXPIRED_STATUS or str(e.code) in SESSION_EXPIRED_CODES
+
+
+def is_auth_rejection_error(e: Exception) -> bool:
+    """
+    인증 문제일 수 있는 요청 거부 오류인지 여부 (HTTP/API 4xx, 요청 제한 제외)
+
+    디스크 캐시에서 꺼낸 세션의 첫 호출에만 사용 (만료 오류 형식이 예상과 달라도 오래된 세션을 버리기 위해)
+    """
+    if not isinstance(e, EcountAPIError) or e.status in NON_AUTH_STATUS:
+        return False
+    return e.status is None or 400 <= e.status < 500
+
+
+class EcountSession:
+    """
+    이카운트 로그인 세션 관리 (스레드 간 공유 가능)
+
+    - 메모리 → 디스크 캐시 → 로그인 순으로 SESSION_ID 확보
+    - 캐시 파일은 (회사코드, 사용자, zone, 테스트 서버)별로 구분, 권한 0600 (API 인증키는 저장하지 않음)
+    - call(): 세션 만료 오류면 다시 로그인해 한 번만 재시도
+      (디스크 캐시 세션의 첫 호출은 인증 관련 거부 오류 전체를 만료로 보고 캐시를 버린 뒤 새로 로그인)
+    """
+
+    def __init__(self, client: EcountClient, com_code: str, user_id: str, api_cert_key: str,
+                 lan_type: str = "ko-KR", test: bool = False,
+                 cache_path: str = ECOUNT_SESSION_CACHE_PATH,
+                 ttl_minutes: float = ECOUNT_SESSION_TTL_MINUTES):
+        """
+        Args:
+            client: EcountClient
+            com_code: 회사코드
+            user_id: 사용자 ID
+            api_cert_key: API 인증키
+            lan_type: 언어
+            test: 테스트 서버 사용 여부 (캐시 구분용)
+            cache_path: 세션 캐시 파일 경로
+            ttl_minutes: 마지막 사용 후 세션 유효 시간 (0이면 디스크 캐시 사용 안 함)
+        """
+        self.client = client
+        self.com_code = com_code
+        self.user_id = user_id
+        self.api_cert_key = api_cert_key
+        self.lan_type = lan_type
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_minutes * 60
+        self.cache_key = f"{com_code}:{user_id}:{client.zone}:{'test' if test else 'live'}"
+
+        self.session_id: Optional[str] = None
+        self.expires_at = 0.0
+        self.saved_at = 0.0
+        self.from_cache = False
+        self.verified = False  # 현재 세션으로 API 호출이 성공한 적 있는지 (디스크 캐시 세션 검증용)
+        self._lock = threading.Lock()
+
+    # ----- 디스크 캐시 -----
+
+    def _read_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_cache(self):
+        if self.ttl_seconds <= 0:
+            return
+        entries = self._read_cache()
+        now = time.time()
+        entries = {key: entry for key, entry in entries.items() if entry.get("expires_at", 0) > now}
+        if self.session_id:
+            entries[self.cache_key] = {"session_id": self.session_id, "expires_at": self.expires_at}
+        else:
+            entries.pop(self.cache_key, None)
+
+        try:
+            directory = os.path.dirname(self.cache_path) or "."
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            temp_path = f"{self.cache_path}.tmp"
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, self.cache_path)
+            self.saved_at = now
+        except OSError as e:
+            print(f"[WARN] 이카운트 세션 캐시 저장 실패: {e}")
+
+    # ----- 세션 -----
+
+    def login(self) -> dict:
+        """
+        로그인하고 세션 저장
+
+        Returns:
+            로그인 API 전체 응답
+        """
+        with self._lock:
+            return self._login()
+
+    def _login(self) -> dict:
+        result = self.client.login(self.com_code, self.user_id, self.api_cert_key, lan_type=self.lan_type)
+        data = result.get("Data", {}) or {}
+        datas = data.get("Datas", {}) or {}
+        session_id = datas.get("SESSION_ID")
+        if not session_id:
+            raise RuntimeError("SESSION_ID를 찾을 수 없습니다.")
+
+        self._store(session_id)
+        return result
+
+    def _store(self, session_id: str):
+        self.session_id = session_id
+        self.expires_at = time.time() + self.ttl_seconds
+        self.from_cache = False
+        self.verified = True  # 방금 로그인해 받은 세션
+        self._write_cache()
+
+    def remember(self, session_id: str):
+        """직접 로그인해 받은 SESSION_ID 저장 (로그인 테스트 등)"""
+        with self._lock:
+            self._store(session_id)
+
+    def get_session_id(self) -> str:
+        """
+        유효한 SESSION_ID (메모리/디스크 캐시에 없거나 만료됐으면 로그인)
+
+        Returns:
+            SESSION_ID
+        """
+        with self._lock:
+            now = time.time()
+            if self.session_id and (self.ttl_seconds <= 0 or self.expires_at > now):
+                return self.session_id
+
+            if self.ttl_seconds > 0:
+                entry = self._read_cache().get(self.cache_key)
+                if entry and entry.get("session_id") and entry.get("expires_at", 0) > now:
+                    self.session_id = entry["session_id"]
+                    self.expires_at = entry["expires_at"]
+                    self.saved_at = now
+                    self.from_cache = True
+                    self.verified = False
+                    return self.session_id
+
+            self._login()
+            return self.session_id
+
+    def invalidate(self, session_id: str):
+        """만료된 세션 폐기 (다른 스레드가 이미 새로 로그인했으면 유지)"""
+        with self._lock:
+            if self.session_id == session_id:
+                self.session_id = None
+                self.expires_at = 0.0
+                self._write_cache()
+
+    def _touch(self, session_id: str):
+        """사용 시각 갱신 (파일에는 SESSION_SAVE_INTERVAL마다 반영)"""
+        with self._lock:
+            if self.session_id != session_id:
+                return
+            self.verified = True
+            now = time.time()
+            self.expires_at = now + self.ttl_seconds
+            if now - self.saved_at >= SESSION_SAVE_INTERVAL:
+                self._write_cache()
+
+    def call(self, func: Callable[[str], dict]) -> dict:
+        """
+        세션이 필요한 API 호출 (세션 만료 시 다시 로그인해 한 번 재시도)
+
+        Args:
+            func: SESSION_ID를 받아 API를 호출하는 함수
+
+        Returns:
+            API 응답
+        """
+        session_id = self.get_session_id()
+        unverified_cache = self.from_cache and not self.verified
+        try:
+            result = func(session_id)
+        except EcountAPIError as e:
+            if is_session_expired_error(e):
+                print(f"  🔑 이카운트 세션 만료 - 다시 로그인 후 재시도합니다: {e}")
+            elif unverified_cache and is_auth_rejection_error(e):
+                print(f"  🔑 저장된 세션으로 호출 실패 - 세션 캐시를 버리고 다시 로그인 후 재시도합니다: {e}")
+            else:
+                raise
+            self.invalidate(session_id)
+            session_id = self.get_session_id()
+            result = func(session_id)
+
+        self._touch(session_id)
+        return result
@@ -0,0 +1,189 @@
+"""
+이카운트 배치 업로드 엔진 (판매/구매 공용)
+
+- 300건 배치를 스레드 풀로 동시에 전송 (동시 실행 수 ECOUNT_UPLOAD_WORKERS)
+- 토큰 버킷으로 초당 요청 수 제한 (이카운트 API 호출 제한 준수)
+- 서버에 요청이 닿지 않은 게 확실한 오류(연결 실패, HTTP 429/503)만 배치별로 지터 포함 지수 백오프 재시도
+- 결과는 배치 번호 순서대로 출력/집계 (실패 배치 번호, 전표번호 순서가 순차 업로드와 동일)
+
+전송 함수(send)만 바꾸면 로컬 스텁 서버로도 그대로 검증 가능
+"""
+
+import os
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from urllib3.exceptions import NewConnectionError
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# ===== 설정 =====
+ECOUNT_UPLOAD_WORKERS = int(os.environ.get("ECOUNT_UPLOAD_WORKERS", "4"))    # 동시 업로드 배치 수
+ECOUNT_RATE_LIMIT = float(os.environ.get("ECOUNT_RATE_LIMIT", "1.0"))       # 초당 최대 요청 수
+ECOUNT_UPLOAD_RETRIES = int(os.environ.get("ECOUNT_UPLOAD_RETRIES", "2"))   # 배치별 재시도 횟수
+UPLOAD_BACKOFF_BASE = 2.0                                                   # 첫 재시도 대기 (초)
+UPLOAD_BACKOFF_MAX = 30.0                                                   # 최대 재시도 대기 (초)
+
+# 재시도해도 되는 HTTP/API 상태 (요청 제한, 서비스 불가 - 저장 전에 거절된 요청)
+# 500/502/504는 백엔드가 이미 저장한 뒤 돌아올 수 있어 재시도하지 않음
+RETRYABLE_STATUS = {429, 503}
+
+
+class EcountAPIError(RuntimeError):
+    """이카운트 API 오류 (HTTP 상태 또는 응답 Status/Error.Code/Message 포함)"""
+
+    def __init__(self, message: str, status: Optional[int] = None, code: Optional[str] = None,
+                 api_message: str = ""):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.api_message = api_message  # 응답 Error.Message/MessageDetail (HTTP 오류는 빈 문자열)
+
+
+def is_retryable_upload_error(e: Exception) -> bool:
+    """
+    재시도해도 안전한 오류인지 여부 (요청이 서버에 닿지 않은 게 확실한 경우만)
+
+    - 재시도: 연결 시간 초과(ConnectTimeout), 연결 거부/DNS 실패(NewConnectionError), HTTP 429/503
+    - 재시도 안 함: 응답 대기 중 타임아웃(ReadTimeout), 전송 후 연결 끊김(Connection aborted 등), 500/502/504
+      → 서버에서 이미 저장됐을 수 있으므로 실패 배치로 기록 (전표 중복 방지, fix_upload_from_batch로 확인 후 재업로드)
+    """
+    if isinstance(e, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(e, requests.exceptions.ConnectionError):
+        # requests는 urllib3 MaxRetryError를 감싸고, 그 reason이 실제 원인
+        reason = e.args[0] if e.args else None
+        reason = getattr(reason, "reason", reason)
+        return isinstance(reason, NewConnectionError)
+    return isinstance(e, EcountAPIError) and e.status in RETRYABLE_STATUS
+
+
+class TokenBucket:
+    """
+    토큰 버킷 요청 제한기 (스레드 안전)
+
+    초당 rate개씩 토큰이 채워지고, 요청마다 토큰 1개 사용 (없으면 채워질 때까지 대기)
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Args:
+            rate: 초당 허용 요청 수 (0 이하면 제한 없음)
+            capacity: 한 번에 몰아서 보낼 수 있는 최대 요청 수
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개 사용 (필요하면 대기)"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def _send_with_retries(send: Callable[[Any], dict], batch: Any, batch_num: int,
+                       bucket: TokenBucket, max_retries: int) -> dict:
+    """배치 하나 전송 (요청 제한 + 일시적 오류 재시도)"""
+    for attempt in range(max_retries + 1):
+        bucket.acquire()
+        try:
+            return send(batch)
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable_upload_error(e):
+                raise
+            backoff = min(UPLOAD_BACKOFF_MAX, UPLOAD_BACKOFF_BASE * (2 ** attempt))
+            delay = backoff * random.uniform(0.5, 1.0)
+            print(f"     ⏳ 배치 {batch_num} 일시 오류 - {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries}): {e}")
+            time.sleep(delay)
+
+
+def upload_batches(send: Callable[[Any], dict], batches: List[Any], start_batch: int = 1,
+                   workers: int = ECOUNT_UPLOAD_WORKERS, rate: float = ECOUNT_RATE_LIMIT,
+                   max_retries: int = ECOUNT_UPLOAD_RETRIES) -> Dict[str, Any]:
+    """
+    배치 목록을 동시에 업로드하고 결과를 배치 순서대로 집계
+
+    Args:
+        send: 배치 하나를 전송하고 API 응답(dict)을 반환하는 함수 (예: save_sale)
+        batches: 전체 배치 목록
+        start_batch: 업로드를 시작할 배치 번호 (1부터, 앞 배치는 건너뜀)
+        workers: 동시 업로드 수
+        rate: 초당 최대 요청 수
+        max_retries: 배치별 재시도 횟수
+
+    Returns:
+        {"success", "success_count", "fail_count", "slip_nos", "batch_count", "failed_batches", "error_details"}
+    """
+    total_batches = len(batches)
+    targets = list(range(start_batch, total_batches + 1))
+    bucket = TokenBucket(rate, capacity=1)
+
+    summary = {
+        "success": True,
+        "success_count": 0,
+        "fail_count": 0,
+        "slip_nos": [],
+        "batch_count": total_batches,
+        "failed_batches": [],
+        "error_details": []
+    }
+    if not targets:
+        return summary
+
+    def task(batch_num: int) -> dict:
+        return _send_with_retries(send, batches[batch_num - 1], batch_num, bucket, max_retries)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(targets)))) as executor:
+        futures = [(batch_num, executor.submit(task, batch_num)) for batch_num in targets]
+
+        # 완료 순서와 관계없이 배치 번호 순서대로 결과 처리
+        for batch_num, future in futures:
+            batch_size = len(batches[batch_num - 1])
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"     ❌ 배치 {batch_num}/{total_batches} 업로드 실패 ({batch_size}건): {e}")
+                summary["failed_batches"].append(batch_num)
+                summary["error_details"].append({"batch": batch_num, "error": str(e)})
+                continue
+
+            result_data = result.get("Data", {}) or {}
+            success_cnt = result_data.get("SuccessCnt", 0)
+            fail_cnt = result_data.get("FailCnt", 0)
+
+            summary["success_count"] += success_cnt
+            summary["fail_count"] += fail_cnt
+            summary["slip_nos"].extend(result_data.get("SlipNos", []) or [])
+
+            if fail_cnt > 0:
+                summary["failed_batches"].append(batch_num)
+                print(f"     ⚠️  배치 {batch_num}/{total_batches}: 성공 {success_cnt}건, 실패 {fail_cnt}건")
+
+                # 실패 상세
+                for detail in result_data.get("ResultDetails", []) or []:
+                    if not detail.get("IsSuccess", False):
+                        print(f"         오류: {detail.get('TotalError', '')}")
+                        summary["error_details"].append({"batch": batch_num, "error": detail.get("TotalError", "")})
+            else:
+                print(f"     ✅ 배치 {batch_num}/{total_batches}: 성공 {success_cnt}건")
+
+    summary["success"] = not summary["failed_batches"]
+    return summary
@@ -15,16 +15,19 @@
 import os
 import re
 import math
-import tempfile
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_EXCEPTION
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import yaml
-import mysql.connector
 from mysql.connector import Error
 from dotenv import load_dotenv
 
+from db_pool import get_connection
+
 # 환경변수 로드
 load_dotenv()
 
@@ -49,9 +52,32 @@ ZERO_SALES_PARTNERS = [
 # ===== 설정 =====
 DATA_DIR = "./data"
 RATES_YAML = "rates.yml"
+PARSED_CACHE_DIR = "./.cache/parsed"           # 파싱된 엑셀 스냅샷 저장 위치
+PARSED_CACHE_MAX_BYTES = 512 * 1024 * 1024     # 스냅샷 캐시 최대 크기 (초과 시 오래 안 쓴 것부터 삭제)
+PARSED_CACHE_VERSION = "2"                     # 읽기 규칙(usecols 등)이 바뀌면 올려서 기존 캐시 무효화
+EZADMIN_PARSE_WORKERS = int(os.environ.get("EZADMIN_PARSE_WORKERS", "1"))  # 파일 변환 프로세스 수 (2 이상이면 병렬)
 BRAND_KEYWORDS = ["딸로", "닥터시드", "테르스", "에이더"]
 FIXED_WAREHOUSE_CODE = "200"
 
+# process_file()에서 사용하는 핵심 컬럼 (없으면 빈 컬럼으로 보강)
+REQUIRED_COLS = [
+    "주문일", "발주일", "판매처", "코드10", "판매처 상품명",
+    "주문상세번호", "상품코드", "상품명", "옵션명",
+    "주문수량", "판매가", "상품원가",
+    "송장번호", "수령자주소", "수령자이름", "수령자전화", "수령자휴대폰", "배송메모"
+]
+
+# 브랜드 키워드 단일 정규식: ^ 고정 + 대안별 .*? 이므로 BRAND_KEYWORDS 순서대로 우선 매칭
+# (상품명 안의 위치가 아니라 리스트 순서가 우선 — 기존 for 루프와 동일)
+BRAND_KEYWORD_PATTERN = re.compile(
+    "^(?:" + "|".join(f".*?({re.escape(kw)})" for kw in BRAND_KEYWORDS if kw) + ")",
+    re.DOTALL,
+)
+# 에이더 패턴: 5자리 알파벳 + 2자리 숫자로 시작
+AIDER_PATTERN = re.compile(r'^[A-Za-z]{5}\d{2}')
+# 합계 행 패턴: 공백을 모두 제거했을 때 "합계" 또는 "총합계"
+TOTAL_ROW_PATTERN = re.compile(r"\s*(?:총\s*)?합\s*계\s*")
+
 
 # ===== 유틸 =====
 def to_str(x: object) -> str:
@@ -67,24 +93,105 @@ def to_int_series(series: pd.Series) -> pd.Series:
     return pd.to_numeric(cleaned, errors="coerce").fillna(0).astype(int)
 
 
-def convert_xls_to_xlsx(xls_path: str) -> str:
-    """ .xls → .xlsx 임시 변환 (xlrd 필요) """
-    try:
-        df = pd.read_excel(xls_path, dtype=str, engine="xlrd")
-    except Exception as e:
-        raise RuntimeError(f".xls 읽기 실패: xlrd 설치 필요하거나 파일 손상 가능 — {e}")
-    tmp_path = Path(tempfile.gettempdir()) / (Path(xls_path).stem + ".xlsx")
-    df.to_excel(tmp_path, index=False)
-    return str(tmp_path)
+def is_used_column(name: object) -> bool:
+    """process_file()이 실제로 사용하는 컬럼인지 여부 (헤더 공백 정규화 후 비교)"""
+    col = " ".join(to_str(name).split())
+    return col in REQUIRED_COLS or col == "CS" or col.startswith("주문상세번호")
 
 
-def read_excel_auto(path: str) -> pd.DataFrame:
-    """확장자에 따라 안전하게 읽기"""
+def read_excel_auto(path: str, usecols=None) -> pd.DataFrame:
+    """
+    확장자에 따라 안전하게 읽기
+
+    - .xls는 xlrd로 바로 DataFrame 변환 (임시 .xlsx 변환 없음)
+    - usecols: pd.read_excel의 usecols (예: is_used_column)
+    """
     ext = Path(path).suffix.lower()
     if ext == ".xls":
-        xlsx_path = convert_xls_to_xlsx(path)
-        return pd.read_excel(xlsx_path, dtype=str)
-    return pd.read_excel(path, dtype=str)
+        try:
+            return pd.read_excel(path, dtype=str, engine="xlrd", usecols=usecols)
+        except Exception as e:
+            raise RuntimeError(f".xls 읽기 실패: xlrd 설치 필요하거나 파일 손상 가능 — {e}")
+    return pd.read_excel(path, dtype=str, usecols=usecols)
+
+
+def file_content_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용의 SHA-256 해시"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def evict_parsed_cache(cache_dir: str = PARSED_CACHE_DIR, max_bytes: int = PARSED_CACHE_MAX_BYTES) -> int:
+    """
+    스냅샷 캐시 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 스냅샷부터 삭제 (LRU)
+
+    Returns:
+        삭제한 스냅샷 수
+    """
+    entries = []
+    for snapshot in Path(cache_dir).glob("*.pkl"):
+        try:
+            st = snapshot.stat()
+        except FileNotFoundError:
+            continue  # 다른 프로세스가 이미 삭제
+        entries.append((st.st_mtime, st.st_size, snapshot))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, snapshot in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        try:
+            snapshot.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+    return removed
+
+
+def read_excel_cached(path: str, usecols=None, cache_dir: str = PARSED_CACHE_DIR,
+                      max_bytes: int = PARSED_CACHE_MAX_BYTES) -> pd.DataFrame:
+    """
+    read_excel_auto() + 파싱 결과 스냅샷 캐시
+
+    - 키: 파일 경로, 크기, 수정시각, 내용 해시, usecols, PARSED_CACHE_VERSION
+    - 적중 시 엑셀 파싱 없이 스냅샷(pickle)을 바로 로드 (None/NaN, dtype 그대로 보존)
+    - 스냅샷 사용 시 수정시각을 갱신하고, 전체 크기가 max_bytes를 넘으면 LRU로 정리
+    - 캐시 오류는 경고만 출력하고 원본 엑셀을 읽음
+    """
+    st = os.stat(path)
+    usecols_key = getattr(usecols, "__name__", repr(usecols))
+    key_src = "|".join([
+        os.path.abspath(path), str(st.st_size), str(st.st_mtime_ns),
+        file_content_hash(path), usecols_key, PARSED_CACHE_VERSION,
+    ])
+    snapshot = Path(cache_dir) / (hashlib.sha256(key_src.encode("utf-8")).hexdigest() + ".pkl")
+
+    if snapshot.exists():
+        try:
+            df = pd.read_pickle(snapshot)
+            os.utime(snapshot)  # LRU: 최근 사용 표시
+            print(f"  ℹ️  파싱 캐시 사용: {Path(path).name}")
+            return df
+        except Exception as e:
+            print(f"[WARN] 파싱 캐시 읽기 실패, 원본을 다시 읽습니다: {e}")
+
+    df = read_excel_auto(path, usecols=usecols)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = snapshot.with_suffix(f".{os.getpid()}.tmp")
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, snapshot)
+        evict_parsed_cache(cache_dir, max_bytes)
+    except Exception as e:
+        print(f"[WARN] 파싱 캐시 저장 실패: {e}")
+
+    return df
 
 
 def extract_brand(seller_name: str, product_name: str) -> str:
@@ -102,21 +209,88 @@ def extract_brand(seller_name: str, product_name: str) -> str:
 
     if brand == "브라이즈":
         # 1. 먼저 일반 키워드로 매칭 시도
-        for kw in BRAND_KEYWORDS:
-            if kw and kw in product_name:
-                brand = kw
-                break
+        m = BRAND_KEYWORD_PATTERN.match(product_name)
+        if m:
+            brand = next(g for g in m.groups() if g)
 
         # 2. 키워드 매칭 실패 시 에이더 정규식 패턴 체크
-        if brand == "브라이즈":
-            # 에이더 패턴: 5자리 알파벳 + 2자리 숫자로 시작
-            aider_pattern = re.compile(r'^[A-Za-z]{5}\d{2}')
-            if aider_pattern.match(product_name):
-                brand = "에이더"
+        elif AIDER_PATTERN.match(product_name):
+            brand = "에이더"
 
     return brand if brand else "브랜드미상"
 
 
+def extract_projects(df: pd.DataFrame) -> pd.Series:
+    """
+    프로젝트("{브랜드}_{국내|해외}") 컬럼 계산 (컬럼 단위 처리)
+
+    - extract_brand()와 동일한 규칙을 고유한 (판매처, 판매처 상품명) 조합에만 적용한 뒤
+      원래 행으로 다시 펼침
+    """
+    keys = pd.DataFrame({
+        "판매처": df["판매처"].map(to_str),
+        "판매처 상품명": df["판매처 상품명"].map(to_str),
+    }, index=df.index)
+    uniq = keys.drop_duplicates().reset_index(drop=True)
+
+    seller = uniq["판매처"].str.strip()
+    product = uniq["판매처 상품명"].str.strip()
+    brand = seller.str.split(" ", n=1).str[0].str.split("(", n=1).str[0]
+
+    # 브라이즈 판매처: 키워드 → 에이더 패턴 순으로 상품명에서 브랜드 추출
+    is_brize = brand == "브라이즈"
+    if is_brize.any():
+        kw = product[is_brize].str.extract(BRAND_KEYWORD_PATTERN).fillna("").agg("".join, axis=1)
+        aider = product[is_brize].str.match(AIDER_PATTERN)
+        brize_brand = kw.where(kw != "", aider.map({True: "에이더", False: "브라이즈"}))
+        brand = brand.where(~is_brize, brize_brand)
+
+    brand = brand.where(brand != "", "브랜드미상")
+    dom_over = uniq["판매처"].str.contains("해외", regex=False).map({True: "해외", False: "국내"})
+    uniq["프로젝트"] = brand + "_" + dom_over
+
+    projects = keys.merge(uniq, on=["판매처", "판매처 상품명"], how="left")["프로젝트"]
+    projects.index = df.index
+    return projects
+
+
+def extract_partner_names(df: pd.DataFrame) -> pd.Series:
+    """
+    판매처 이름 추출 및 정규화 (컬럼 단위 처리)
+
+    - 수동발주 케이스: 코드10 값을 그대로 사용 (DB normalization 제외)
+      → validate_and_correct_sellers()에서 전담 처리
+    - 판매처에 괄호가 있으면: 첫 번째 '(' 다음부터 ')' 전까지의 문자열
+    - 기타 케이스: 판매처 그대로
+    - 수동발주가 아닌 케이스만 DB normalization 적용
+    """
+    seller = df["판매처"].map(to_str)
+    code10 = df["코드10"].map(to_str)
+
+    # 수동발주 여부 플래그
+    is_manual = seller.str.contains("수동발주", regex=False)
+
+    # 괄호 안 문자열 추출: seller.split("(")[1].split(")")[0] 와 동일
+    has_paren = seller.str.contains("(", regex=False) & seller.str.contains(")", regex=False)
+    in_paren = seller.str.extract(r"^[^(]*\(([^()]*)", expand=False)
+
+    names = seller.where(~has_paren, in_paren)
+    names = names.where(~is_manual, code10)  # 코드10 값 그대로 (검증은 나중에)
+
+    # DB 정규화 (수동발주가 아닌 케이스만)
+    if SELLER_MAPPING_AVAILABLE:
+        try:
+            # 고유 이름만 한 번에 정규화한 뒤 컬럼에 다시 매핑
+            unique_names = names.loc[~is_manual].unique().tolist()
+            with SellerMappingDB() as db:
+                normalized = dict(zip(unique_names, db.normalize_many(unique_names)))
+            names.loc[~is_manual] = names.loc[~is_manual].map(normalized)
+        except Exception:
+            pass  # 에러 발생 시 원본 그대로 사용
+
+    return names
+
+
 def safe_filename(name: str, maxlen: int = 80) -> str:
     """파일명에 쓰기 안전한 문자열로 변환"""
     s = to_str(name).strip()
@@ -138,11 +312,11 @@ def sync_rates_from_db(yaml_path: str = RATES_YAML) -> bool:
     """
     try:
         # DB 연결
-        conn = mysql.connector.connect(
+        conn = get_connection(
+            "marketplace_rates",
             host=os.environ.get("DB_HOST", "localhost"),
             user=os.environ.get("DB_USER", "root"),
-            password=os.environ.get("DB_PASSWORD", ""),
-            database="marketplace_rates"
+            password=os.environ.get("DB_PASSWORD", "")
         )
         cursor = conn.cursor(dictionary=True)
 
@@ -260,7 +434,7 @@ def validate_and_correct_sellers(df: pd.DataFrame, pending_mappings: List[Dict]
     with SellerMappingDB() as db:
         all_standard_names = set(db.get_all_standard_names())
 
-        # GPT 호출 결과 캐시 (중복 호출 방지)
+        # 이번 실행의 GPT 교정 결과 (실행 간에는 gpt_utils의 SQLite 캐시로 재호출 방지)
         gpt_cache = {}
 
         # 1단계: 고유한 판매처명 수집 및 분류
@@ -297,16 +471,16 @@ def validate_and_correct_sellers(df: pd.DataFrame, pending_mappings: List[Dict]
                         if "판매채널" in df.columns:
                             df.at[idx, "판매채널"] = standard_name
 
-        # 3단계: 고유 판매처에 대해서만 GPT 호출 (중복 제거)
+        # 3단계: 고유 판매처에 대해서만 GPT 호출 (중복 제거, 동시 호출)
         print(f"\n[GPT 교정] 고유 판매처 {len(unique_sellers)}건 검증 중...")
+        if unique_sellers:
+            gpt_cache.update(db.find_similar_many_with_gpt(list(unique_sellers), threshold=0.7))
 
+        # 결과는 판매처 등장 순서대로 적용
         for seller_name, indices in unique_sellers.items():
-            # 첫 번째 인덱스만 로그에 표시
-            first_idx = indices[0]
-            print(f"  🤖 {seller_name} ({len(indices)}건) - GPT 교정 시도 중...")
+            print(f"  🤖 {seller_name} ({len(indices)}건) - GPT 교정 결과")
 
-            gpt_result = db.find_similar_with_gpt(seller_name, threshold=0.7)
-            gpt_cache[seller_name] = gpt_result
+            gpt_result = gpt_cache[seller_name]
 
             if gpt_result:
                 if gpt_result.get("requires_manual"):
@@ -384,21 +558,36 @@ def validate_and_correct_sellers(df: pd.DataFrame, pending_mappings: List[Dict]
     return df, pending_mappings
 
 
-def process_file(file_path: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+def process_file(file_path: str, use_cache: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     이지어드민 엑셀 파일을 읽어서 판매/매입 DataFrame으로 변환
 
+    Args:
+        file_path: 엑셀 파일 경로
+        use_cache: 파싱 결과 스냅샷 캐시 사용 여부 (재시도/재실행 시 엑셀 파싱 생략)
+
     Returns:
         (sales_df, purchase_df): 판매 및 매입 DataFrame
     """
     try:
-        df = read_excel_auto(file_path)
+        # 합계 라벨은 번호/No 같은 미사용 컬럼에 있을 수 있으므로 전체 컬럼을 읽음
+        if use_cache:
+            df = read_excel_cached(file_path)
+        else:
+            df = read_excel_auto(file_path)
+
+        # 0) 합계/총합계 행 제거 (공백을 무시하고 셀 전체가 합계/총합계인 경우)
+        #    모든 컬럼 대상, '계'가 들어간 셀만 후보로 골라 정규식 검사
+        total_mask = pd.Series(False, index=df.index)
+        for col in df.select_dtypes(include="object").columns:
+            candidates = df[col].str.contains("계", regex=False, na=False)
+            if candidates.any():
+                hits = df.loc[candidates, col].str.fullmatch(TOTAL_ROW_PATTERN)
+                total_mask[hits[hits].index] = True
+        df = df[~total_mask]
 
-        # 0) 합계/총합계 행 제거
-        total_mask = df.astype(str).apply(
-            lambda col: col.str.replace(r"\s+", "", regex=True).str.fullmatch(r"(합계|총합계)"),
-        ).any(axis=1)
-        df = df[~total_mask].copy()
+        # 합계 행 제거 후 변환에 쓰는 컬럼만 남김
+        df = df.loc[:, [is_used_column(c) for c in df.columns]].copy()
 
         # 1) 컬럼명 정규화
         df.columns = (
@@ -409,18 +598,20 @@ def process_file(file_path: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
         )
 
         # 2) 필요한 핵심 컬럼 보강
-        required_cols = [
-            "주문일", "발주일", "판매처", "코드10", "판매처 상품명",
-            "주문상세번호", "상품코드", "상품명", "옵션명",
-            "주문수량", "판매가", "상품원가",
-            "송장번호", "수령자주소", "수령자이름", "수령자전화", "수령자휴대폰", "배송메모"
-        ]
-        for col in required_cols:
+        for col in REQUIRED_COLS:
             if col not in df.columns:
                 df[col] = None
 
-        # 3) 셀 값 정리
-        df = df.apply(lambda col: col.map(lambda x: None if (isinstance(x, str) and x.strip() == "") else x))
+        # 3) 셀 값 정리: 공백뿐인 문자열 → None
+        #    변환에 실제로 쓰는 컬럼만 대상 (나머지 컬럼은 결과에 포함되지 않음)
+        for col in [c for c in df.columns if is_used_column(c)]:
+            if df[col].dtype != object:
+                continue
+            blank_mask = df[col].str.strip().eq("")
+            if blank_mask.any():
+                df.loc[blank_mask, col] = None
+            if df[col].isna().all():
+                df[col] = df[col].astype("float64")  # 전부 빈 컬럼은 NaN 컬럼으로 (기존 apply 결과와 동일)
 
         # 4) 판매처에 '로켓그로스' 또는 '전용수동발주 에이더' 포함 시 제외
         df = df[~df["판매처"].map(to_str).str.contains("로켓그로스", na=False)].copy()
@@ -504,67 +695,9 @@ def process_file(file_path: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
         df["판매No."] = ""
         df["거래처코드"] = ""
 
-        # 판매처 이름 추출 및 정규화 (DB 연결은 한 번만)
-        def extract_partner_names(df_input):
-            """
-            판매처 이름 추출 및 정규화
-
-            - 수동발주 케이스: 코드10 값을 그대로 사용 (DB normalization 제외)
-              → validate_and_correct_sellers()에서 전담 처리
-            - 기타 케이스: 추출 후 DB normalization 적용
-            """
-            names = []
-            is_manual_orders = []  # 수동발주 여부 플래그
-
-            for _, row in df_input.iterrows():
-                seller = to_str(row.get("판매처"))
-                code2 = to_str(row.get("코드10"))
-
-                # 수동발주 여부 확인
-                is_manual = "수동발주" in seller
-                is_manual_orders.append(is_manual)
-
-                # 기존 로직
-                if is_manual:
-                    result = code2  # 코드10 값 그대로 (검증은 나중에)
-                elif "(" in seller and ")" in seller:
-                    try:
-                        result = seller.split("(")[1].split(")")[0]
-                    except Exception:
-                        result = seller
-                else:
-                    result = seller
-
-                names.append(result)
-
-            # DB 정규화 (수동발주가 아닌 케이스만)
-            if SELLER_MAPPING_AVAILABLE:
-                try:
-                    with SellerMappingDB() as db:
-                        normalized_names = []
-                        for i, name in enumerate(names):
-                            if is_manual_orders[i]:
-                                # 수동발주는 validate_and_correct_sellers에서 처리
-                                normalized_names.append(name)
-                            else:
-                                # 수동발주가 아닌 경우만 DB normalization
-                                normalized_names.append(db.normalize_name(name))
-                        names = normalized_names
-                except Exception:
-                    pass  # 에러 발생 시 원본 그대로 사용
-
-            return names
-
         df["거래처명"] = extract_partner_names(df)
 
-        def _project(row):
-            seller = to_str(row.get("판매처"))
-            prod_name = to_str(row.get("판매처 상품명"))
-            brand = extract_brand(seller, prod_name)
-            dom_over = "해외" if "해외" in seller else "국내"
-            return f"{brand}_{dom_over}"
-
-        df["프로젝트"] = df.apply(_project, axis=1)
+        df["프로젝트"] = extract_projects(df)
         df["판매유형"] = df["거래처명"]
 
         # 7) 주문번호 추출
@@ -690,6 +823,35 @@ def process_file(file_path: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
         return pd.DataFrame(), pd.DataFrame()
 
 
+def process_files_parallel(file_paths: List[str], workers: int) -> List[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    여러 파일을 프로세스 풀로 동시에 process_file() 처리
+
+    - 결과는 file_paths 순서 그대로 반환 (병합 순서 고정)
+    - ValueError(코드10 빈 값 등)가 발생하면 남은 작업을 취소하고 즉시 전파
+    - spawn 방식으로 프로세스 생성 (부모의 MySQL 연결 풀 소켓을 자식이 물려받지 않음)
+
+    Args:
+        file_paths: 처리할 파일 경로 리스트
+        workers: 프로세스 수
+
+    Returns:
+        [(sales_df, purchase_df), ...]
+    """
+    print(f"[INFO] 병렬 처리: {len(file_paths)}개 파일, {workers}개 프로세스")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = [executor.submit(process_file, path) for path in file_paths]
+        done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+
+        # 오류가 있으면 파일 순서상 첫 번째 오류를 전파
+        for future in futures:
+            if future in done and future.exception() is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise future.exception()
+
+        return [future.result() for future in futures]
+
+
 # ===== 매출전표 생성 =====
 def build_sales_voucher(sales_df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -929,7 +1091,8 @@ def split_by_project(sales_df: pd.DataFrame, purchase_df: pd.DataFrame,
 # ===== 메인 처리 함수 (DataFrame 반환) =====
 def process_ezadmin_to_ecount(data_dir: str = DATA_DIR,
                                rates_yaml: str = RATES_YAML,
-                               validate_sellers: bool = True) -> Tuple[Dict[str, any], List[Dict]]:
+                               validate_sellers: bool = True,
+                               workers: Optional[int] = None) -> Tuple[Dict[str, any], List[Dict]]:
     """
     이지어드민 데이터를 이카운트 양식으로 변환
 
@@ -937,6 +1100,7 @@ def process_ezadmin_to_ecount(data_dir: str = DATA_DIR,
         data_dir: 이지어드민 엑셀 파일들이 있는 디렉토리
         rates_yaml: 요율 설정 YAML 파일 경로
         validate_sellers: 판매처 검증 여부 (수동발주 케이스)
+        workers: 파일 변환 프로세스 수 (2 이상이면 파일 단위 병렬 처리, None이면 EZADMIN_PARSE_WORKERS)
 
     Returns:
         (
@@ -957,13 +1121,21 @@ def process_ezadmin_to_ecount(data_dir: str = DATA_DIR,
     rate_book = load_rate_book_from_yaml(rates_yaml)
 
     sales_all, purchase_all = [], []
-    candidates = [f for f in os.listdir(data_dir) if f.lower().endswith((".xlsx", ".xls"))]
+    candidates = sorted(f for f in os.listdir(data_dir) if f.lower().endswith((".xlsx", ".xls")))
     print("[INFO] 대상 파일:", candidates if candidates else "(없음)")
 
-    for file in candidates:
-        file_path = os.path.join(data_dir, file)
-        print(f"[INFO] 처리 시작: {file_path}")
-        sales_df, purchase_df = process_file(file_path)
+    file_paths = [os.path.join(data_dir, file) for file in candidates]
+    if workers is None:
+        workers = EZADMIN_PARSE_WORKERS
+    parallel = workers > 1 and len(file_paths) > 1
+    parallel_results = process_files_parallel(file_paths, workers) if parallel else None
+
+    for i, file_path in enumerate(file_paths):
+        if parallel:
+            sales_df, purchase_df = parallel_results[i]
+        else:
+            print(f"[INFO] 처리 시작: {file_path}")
+            sales_df, purchase_df = process_file(file_path)
         if not sales_df.empty:
             print(f"[INFO] 판매 OK: {len(sales_df)}건")
             sales_all.append(sales_df)
@@ -990,6 +1162,16 @@ def process_ezadmin_to_ecount(data_dir: str = DATA_DIR,
         if not purchase_merged.empty:
             purchase_merged, pending_mappings = validate_and_correct_sellers(purchase_merged, pending_mappings)
 
+    return build_conversion_result(sales_merged, purchase_merged, rate_book), pending_mappings
+
+
+# ===== 전표 생성 + 결과 구성 =====
+def build_conversion_result(sales_merged: pd.DataFrame, purchase_merged: pd.DataFrame,
+                            rate_book: dict) -> Dict[str, any]:
+    """
+    병합된 판매/매입 DataFrame으로 전표와 프로젝트별 분리 결과를 만들어
+    process_ezadmin_to_ecount()의 결과 딕셔너리 형태로 반환
+    """
     # 전표 생성
     sales_voucher_df = build_sales_voucher(sales_merged) if not sales_merged.empty else pd.DataFrame()
     cost_voucher_df = build_cost_voucher(purchase_merged) if not purchase_merged.empty else pd.DataFrame()
@@ -1018,7 +1200,76 @@ def process_ezadmin_to_ecount(data_dir: str = DATA_DIR,
         "fee_voucher": fee_voucher_df,
         "voucher": fee_voucher_df,  # 하위 호환성을 위해 유지
         "by_project": by_project
-    }, pending_mappings
+    }
+
+
+def revalidate_pending_sellers(result: Dict[str, any], pending_mappings: List[Dict],
+                               rates_yaml: str = RATES_YAML) -> Tuple[Dict[str, any], List[Dict]]:
+    """
+    웹 에디터에서 매핑을 저장한 뒤 정제 불가 행만 다시 검증 (전체 재변환 없음)
+
+    - pending_mappings의 판매처 이름만 갱신된 seller_mapping 테이블로 다시 조회
+    - 매칭되면 판매/매입 DataFrame에서 같은 거래처명을 가진 수동발주 행의 거래처명, 판매채널(판매유형)을 교체
+      (row_index는 판매/매입 각각의 인덱스라 두 DataFrame에 공통으로 쓸 수 없으므로 이름 기준으로 적용)
+    - 전표는 수정된 DataFrame으로 다시 생성
+
+    Args:
+        result: process_ezadmin_to_ecount()의 결과 딕셔너리
+        pending_mappings: 이전 검증에서 남은 정제 불가 목록
+        rates_yaml: 요율 설정 YAML 파일 경로
+
+    Returns:
+        (갱신된 결과 딕셔너리, 여전히 정제 불가인 데이터 리스트)
+    """
+    if not pending_mappings or not SELLER_MAPPING_AVAILABLE:
+        return result, pending_mappings
+
+    sales_df = result["sales"]
+    purchase_df = result["purchase"]
+
+    print(f"\n[재검증] 정제 불가 {len(pending_mappings)}건만 다시 확인 중...")
+
+    with SellerMappingDB() as db:
+        all_standard_names = set(db.get_all_standard_names())
+        alias_map = db.get_alias_map()
+
+    still_pending = []
+    resolved = {}  # {원본 이름: 표준 이름}
+    for p in pending_mappings:
+        seller_name = p["original"]
+        if seller_name in all_standard_names:
+            standard_name = seller_name
+        else:
+            standard_name = alias_map.get(seller_name.strip().lower())
+
+        if not standard_name:
+            still_pending.append(p)
+            continue
+
+        resolved[seller_name] = standard_name
+
+    # 정제 불가 행은 거래처명이 원본 이름 그대로 남아 있으므로 (수동발주, 거래처명)으로 찾아 교체
+    for df in (sales_df, purchase_df):
+        if not resolved or df.empty or "거래처명" not in df.columns:
+            continue
+        is_manual = df["판매처"].map(to_str).str.contains("수동발주", regex=False) if "판매처" in df.columns else False
+        standard_names = df["거래처명"].map(to_str).str.strip().map(resolved)
+        mask = is_manual & standard_names.notna()
+        for col in ("거래처명", "판매유형", "판매채널"):
+            if col in df.columns:
+                df.loc[mask, col] = standard_names[mask]
+
+    for seller_name, standard_name in resolved.items():
+        print(f"  ✅ {seller_name} → {standard_name} - DB 매칭")
+
+    if still_pending:
+        unique_pending = len(set(p["original"] for p in still_pending))
+        print(f"\n⚠️  수동 매핑 필요: {unique_pending}개 고유 판매처 (총 {len(still_pending)}건)")
+    else:
+        print(f"\n✅ 모든 데이터 검증 완료")
+
+    rate_book = load_rate_book_from_yaml(rates_yaml)
+    return build_conversion_result(sales_df, purchase_df, rate_book), still_pending
 
 
 # ===== 파일 저장 함수 (선택적) =====
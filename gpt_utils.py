@@ -0,0 +1,256 @@
+"""
+OpenAI GPT 호출 공통 유틸
+
+- 요청 제한(429)/일시적 서버 오류 시 지수 백오프 재시도
+- 여러 건을 스레드 풀로 동시에 호출 (동시 실행 수 제한, 결과는 입력 순서 유지)
+- GPT 응답을 SQLite 파일에 캐시 (입력 이름 + 후보 목록 해시 키, TTL 적용)
+"""
+
+import os
+import json
+import time
+import random
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# ===== 설정 =====
+GPT_MAX_WORKERS = int(os.environ.get("GPT_MAX_WORKERS", "4"))        # 동시 GPT 호출 수
+GPT_MAX_RETRIES = int(os.environ.get("GPT_MAX_RETRIES", "5"))        # 요청 제한 시 재시도 횟수
+GPT_BACKOFF_BASE = 1.0                                               # 첫 재시도 대기 (초)
+GPT_BACKOFF_MAX = 30.0                                               # 최대 재시도 대기 (초)
+GPT_CACHE_PATH = os.environ.get("GPT_CACHE_PATH", "./.cache/gpt_cache.sqlite3")  # GPT 응답 캐시 파일
+GPT_CACHE_TTL_DAYS = float(os.environ.get("GPT_CACHE_TTL_DAYS", "30"))         # 캐시 유효 기간 (0이면 캐시 사용 안 함)
+
+# 재시도 대상 예외 (openai 1.x 예외 클래스 이름)
+RETRYABLE_ERRORS = {"RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError"}
+
+
+def is_retryable_error(e: Exception) -> bool:
+    """요청 제한/일시적 오류인지 여부"""
+    status = getattr(e, "status_code", None)
+    return type(e).__name__ in RETRYABLE_ERRORS or status == 429 or (status is not None and status >= 500)
+
+
+def retry_after_seconds(e: Exception) -> float:
+    """응답 헤더의 Retry-After 값 (없으면 0)"""
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def chat_completion_with_backoff(client, max_retries: int = GPT_MAX_RETRIES, **kwargs):
+    """
+    client.chat.completions.create() 호출 + 요청 제한 시 지수 백오프 재시도
+
+    클라이언트는 max_retries=0으로 만들어야 함 (SDK 재시도가 겹치면 대기 시간이 누적됨)
+
+    Args:
+        client: OpenAI 클라이언트 (또는 openai 모듈)
+        max_retries: 최대 재시도 횟수
+        **kwargs: chat.completions.create() 인자
+
+    Returns:
+        API 응답 (재시도 불가 오류나 재시도 초과 시 예외 발생)
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return client.chat.completions.create(**kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable_error(e):
+                raise
+            backoff = min(GPT_BACKOFF_MAX, GPT_BACKOFF_BASE * (2 ** attempt))
+            delay = max(retry_after_seconds(e), backoff * random.uniform(0.5, 1.0))
+            print(f"  ⏳ GPT 요청 제한/일시 오류 - {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+
+
+def run_concurrently(func: Callable[[Any], Any], items: List[Any],
+                     max_workers: int = GPT_MAX_WORKERS) -> Dict[Any, Any]:
+    """
+    items 각각에 func을 스레드 풀로 동시에 적용
+
+    Args:
+        func: 항목 하나를 받아 결과를 반환하는 함수
+        items: 입력 리스트 (해시 가능한 값, 중복은 한 번만 호출)
+        max_workers: 동시 실행 수
+
+    Returns:
+        {항목: 결과} (입력 순서 유지)
+    """
+    unique_items = list(dict.fromkeys(items))
+    if not unique_items:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_items)))) as executor:
+        futures = {item: executor.submit(func, item) for item in unique_items}
+        return {item: future.result() for item, future in futures.items()}
+
+
+# ===== GPT 응답 캐시 =====
+
+def candidates_hash(candidates: List[str], model: str = "") -> str:
+    """
+    후보 목록(표준 이름/상품 목록) 해시
+
+    목록이나 모델이 바뀌면 해시가 달라져 이전 캐시는 더 이상 조회되지 않음
+
+    Args:
+        candidates: 프롬프트에 들어가는 후보 목록 (순서 포함)
+        model: GPT 모델명
+
+    Returns:
+        SHA-256 hex 문자열
+    """
+    digest = hashlib.sha256(model.encode("utf-8"))
+    for candidate in candidates:
+        digest.update(b"\0")
+        digest.update(str(candidate).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class GPTResultCache:
+    """
+    GPT 응답 영구 캐시 (SQLite 파일)
+
+    - 키: (종류, 입력 이름, 후보 목록 해시)
+    - 값: GPT 응답 원문 (JSON 문자열) → 임계값/검증은 호출하는 쪽에서 매번 적용
+    - TTL이 지난 항목과 후보 목록이 바뀐 항목은 해당 종류를 처음 조회할 때 삭제
+    - 여러 스레드에서 공유 (연결 하나 + 락)
+    """
+
+    def __init__(self, path: str = GPT_CACHE_PATH, ttl_days: float = GPT_CACHE_TTL_DAYS):
+        """
+        Args:
+            path: SQLite 파일 경로
+            ttl_days: 캐시 유효 기간 (일)
+        """
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self._lock = threading.Lock()
+        self._pruned = set()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS gpt_cache (
+                kind TEXT NOT NULL,
+                input_name TEXT NOT NULL,
+                candidates_hash TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (kind, input_name, candidates_hash)
+            )
+        """)
+        self.conn.commit()
+
+    def _prune(self, kind: str, cand_hash: str):
+        """만료된 항목 + 후보 목록이 바뀐 항목 삭제 (종류/해시별 프로세스당 1회, 락 안에서 호출)"""
+        if (kind, cand_hash) in self._pruned:
+            return
+        self.conn.execute(
+            "DELETE FROM gpt_cache WHERE kind = ? AND (candidates_hash != ? OR created_at < ?)",
+            (kind, cand_hash, time.time() - self.ttl_seconds)
+        )
+        self.conn.commit()
+        self._pruned.add((kind, cand_hash))
+
+    def get(self, kind: str, input_name: str, cand_hash: str) -> Optional[str]:
+        """
+        캐시된 GPT 응답 조회
+
+        Returns:
+            응답 원문 또는 None (없거나 만료)
+        """
+        with self._lock:
+            self._prune(kind, cand_hash)
+            row = self.conn.execute(
+                """SELECT response FROM gpt_cache
+                   WHERE kind = ? AND input_name = ? AND candidates_hash = ? AND created_at >= ?""",
+                (kind, input_name, cand_hash, time.time() - self.ttl_seconds)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, kind: str, input_name: str, cand_hash: str, response: str):
+        """GPT 응답 저장 (같은 키는 덮어씀)"""
+        with self._lock:
+            self.conn.execute(
+                """INSERT OR REPLACE INTO gpt_cache (kind, input_name, candidates_hash, response, created_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (kind, input_name, cand_hash, response, time.time())
+            )
+            self.conn.commit()
+
+
+_gpt_cache: Optional[GPTResultCache] = None
+_gpt_cache_lock = threading.Lock()
+
+
+def get_gpt_cache() -> Optional[GPTResultCache]:
+    """
+    프로세스 공용 GPT 캐시 (처음 호출 시 생성)
+
+    Returns:
+        GPTResultCache 또는 None (TTL 0 또는 캐시 파일을 열 수 없는 경우)
+    """
+    global _gpt_cache
+    if GPT_CACHE_TTL_DAYS <= 0:
+        return None
+    with _gpt_cache_lock:
+        if _gpt_cache is None:
+            try:
+                _gpt_cache = GPTResultCache()
+            except (sqlite3.Error, OSError) as e:
+                print(f"[WARN] GPT 캐시를 열 수 없습니다 (캐시 없이 진행): {e}")
+                return None
+        return _gpt_cache
+
+
+def cached_chat_completion_json(client, kind: str, input_name: str,
+                                candidates: List[str], **kwargs) -> Any:
+    """
+    JSON 응답 GPT 호출 + 영구 캐시
+
+    같은 입력 이름과 같은 후보 목록으로 이미 받은 응답이 있으면 GPT를 호출하지 않음
+
+    Args:
+        client: OpenAI 클라이언트 (또는 openai 모듈)
+        kind: 캐시 구분 (예: "seller", "coupang_product")
+        input_name: 매칭할 입력 이름
+        candidates: 프롬프트에 들어가는 후보 목록
+        **kwargs: chat.completions.create() 인자
+
+    Returns:
+        json.loads()된 응답 (GPT가 null을 반환하면 None)
+    """
+    cache = get_gpt_cache()
+    cand_hash = candidates_hash(candidates, kwargs.get("model", ""))
+
+    if cache is not None:
+        try:
+            cached = cache.get(kind, input_name, cand_hash)
+            if cached is not None:
+                return json.loads(cached)
+        except (sqlite3.Error, ValueError) as e:
+            print(f"[WARN] GPT 캐시 조회 실패: {e}")
+
+    response = chat_completion_with_backoff(client, **kwargs)
+    response_text = response.choices[0].message.content.strip()
+    result = json.loads(response_text)  # 파싱 가능한 응답만 캐시
+
+    if cache is not None:
+        try:
+            cache.set(kind, input_name, cand_hash, response_text)
+        except sqlite3.Error as e:
+            print(f"[WARN] GPT 캐시 저장 실패: {e}")
+
+    return result
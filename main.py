@@ -1,11 +1,14 @@
 import os
-import requests
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
 from datetime import datetime, date
+from itertools import repeat
 from dotenv import load_dotenv
 
+from ecount_client import EcountSession, get_ecount_client
+from ecount_upload import ECOUNT_RATE_LIMIT, ECOUNT_UPLOAD_WORKERS, upload_batches
+
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
@@ -137,14 +140,6 @@ def save_failure_log(failure_info: Dict[str, Any]) -> str:
     return filepath
 
 
-def build_login_url(zone: str, test: bool = False) -> str:
-    """
-    zone = "AD" 고정. test=True면 sboapi{ZONE}, 아니면 oapi{ZONE}.
-    """
-    sub = "sboapi" if test else "oapi"
-    return f"https://{sub}{zone}.ecount.com/OAPI/V2/OAPILogin"
-
-
 def login_ecount(com_code: str, user_id: str, api_cert_key: str,
                  lan_type: str = "ko-KR", zone: str = "AD", test: bool = False,
                  timeout: int = 15) -> dict:
@@ -153,61 +148,31 @@ def login_ecount(com_code: str, user_id: str, api_cert_key: str,
     성공 시 전체 JSON을 반환하며, session_id는 result['Data']['Datas']['SESSION_ID']에 존재.
     실패 시 상세 에러를 포함한 예외를 발생.
     """
-    url = build_login_url(zone, test)
-
-    headers = {
-        "Content-Type": "application/json"
-        # 로그인 API는 본문에 USER_ID / API_CERT_KEY를 포함하므로 별도 Authorization 헤더 불필요
-    }
-
-    payload = {
-        "COM_CODE": com_code,
-        "USER_ID": user_id,
-        "API_CERT_KEY": api_cert_key,
-        "LAN_TYPE": lan_type,
-        "ZONE": zone,  # 명세상 본문에도 ZONE 전달
-    }
-
-    resp = requests.post(url, headers=headers, json=payload, timeout=timeout)
-
-    # HTTP 레벨 에러 체크
-    if resp.status_code != 200:
-        raise RuntimeError(f"[HTTP {resp.status_code}] {resp.text}")
+    # 로그인 API는 본문에 USER_ID / API_CERT_KEY를 포함하므로 별도 Authorization 헤더 불필요
+    client = get_ecount_client(zone, test)
+    return client.login(com_code, user_id, api_cert_key, lan_type=lan_type, timeout=timeout)
 
-    # JSON 파싱
-    try:
-        result = resp.json()
-    except json.JSONDecodeError:
-        raise RuntimeError("응답이 JSON 형식이 아닙니다:\n" + resp.text)
-
-    # API 레벨 에러 체크 (Status / Error 규칙)
-    status = str(result.get("Status"))
-    error = result.get("Error")
-
-    if status != "200" or error:
-        code = None if not error else error.get("Code")
-        msg = None if not error else error.get("Message")
-        detail = None if not error else error.get("MessageDetail")
-        raise RuntimeError(f"[API Error] Status={status}, Code={code}, Message={msg}, Detail={detail}")
 
-    return result
+_ecount_session = None
 
 
-def build_api_url(endpoint: str, session_id: str, zone: str = "AD", test: bool = False) -> str:
+def get_ecount_session() -> EcountSession:
     """
-    이카운트 API URL 생성
+    설정값(.env) 기준 공용 이카운트 세션
 
-    Args:
-        endpoint: API 엔드포인트 (예: "Sale/SaveSale", "Purchases/SavePurchases")
-        session_id: 로그인 후 받은 세션 ID
-        zone: Zone 정보 (기본: AD)
-        test: 테스트 서버 사용 여부
-
-    Returns:
-        완전한 API URL
+    SESSION_ID는 만료 시각과 함께 디스크에 캐시되어 다음 실행에서도 재사용 (만료/무효 시 자동 재로그인)
     """
-    sub = "sboapi" if test else "oapi"
-    return f"https://{sub}{zone}.ecount.com/OAPI/V2/{endpoint}?SESSION_ID={session_id}"
+    global _ecount_session
+    if _ecount_session is None:
+        _ecount_session = EcountSession(
+            get_ecount_client(ZONE, USE_TEST_SERVER),
+            com_code=COM_CODE,
+            user_id=USER_ID,
+            api_cert_key=API_CERT_KEY,
+            lan_type=LAN_TYPE,
+            test=USE_TEST_SERVER
+        )
+    return _ecount_session
 
 
 def safe_str(value: Any) -> str:
@@ -293,13 +258,156 @@ def safe_date(value: Any) -> str:
         return ""  # 8자리 미만이면 빈 문자열 반환
 
 
+def safe_str_column(series: pd.Series) -> pd.Series:
+    """컬럼 전체를 safe_str과 같은 규칙으로 한 번에 변환 (결측값 → "", 나머지 → str())"""
+    return series.astype(object).where(series.notna(), "").astype(str)
+
+
+def safe_date_column(series: pd.Series) -> pd.Series:
+    """
+    컬럼 전체를 safe_date와 같은 규칙으로 변환 (YYYYMMDD)
+
+    - datetime 컬럼은 strftime 한 번으로 변환
+    - 그 외에는 고유값마다 safe_date를 한 번씩만 호출 (경고도 고유값당 한 번)
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime("%Y%m%d").fillna("")
+
+    codes, uniques = pd.factorize(series)
+    formatted = [safe_date(value) for value in uniques.tolist()] + [""]  # 마지막 = 결측값 (code -1)
+    return pd.Series(formatted, dtype=object).take(codes).set_axis(series.index)
+
+
+# 판매 BulkDatas 필드 (API 필드, 원본 컬럼) - 순서 그대로 전송, 원본 컬럼 None = 항상 빈 값
+SALE_BULK_FIELDS = [
+    ("IO_DATE", "일자"),
+    ("UPLOAD_SER_NO", "전표묶음순번"),  # 날짜+브랜드+판매채널별 그룹 순번
+    ("CUST", None),  # 거래처코드 (없음)
+    ("CUST_DES", "거래처명"),
+    ("EMP_CD", None),  # 담당자
+    ("WH_CD", "출하창고"),
+    ("IO_TYPE", None),  # 거래유형
+    ("EXCHANGE_TYPE", None),  # 외화종류
+    ("EXCHANGE_RATE", None),  # 환율
+    ("SITE", "판매채널"),  # 부서
+    ("PJT_CD", "브랜드"),  # 프로젝트
+    ("DOC_NO", None),  # 판매No.
+    ("TTL_CTT", None),  # 제목
+    ("U_MEMO1", None),
+    ("U_MEMO2", None),
+    ("U_MEMO3", None),
+    ("U_MEMO4", None),
+    ("U_MEMO5", None),
+    ("ADD_TXT_01", "수령자주소"),  # 추가문자형식1
+    ("ADD_TXT_02", "배송메모"),  # 추가문자형식2
+    ("ADD_TXT_03", "주문번호"),  # 추가문자형식3
+    ("ADD_TXT_04", "옵션"),  # 추가문자형식4
+    ("ADD_TXT_05", "주문상세번호"),  # 추가문자형식5
+    ("ADD_TXT_06", None),
+    ("ADD_TXT_07", None),
+    ("ADD_TXT_08", None),
+    ("ADD_TXT_09", None),
+    ("ADD_TXT_10", None),
+    ("U_TXT1", None),  # 장문형식1
+    ("PROD_CD", "상품코드"),  # 품목코드
+    ("PROD_DES", "품목명"),
+    ("SIZE_DES", "규격"),
+    ("UQTY", None),  # 추가수량
+    ("QTY", "수량"),
+    ("PRICE", "단가"),
+    ("USER_PRICE_VAT", "단가(vat포함)"),
+    ("SUPPLY_AMT", "공급가액"),
+    ("SUPPLY_AMT_F", None),  # 외화금액
+    ("VAT_AMT", "부가세"),
+    ("REMARKS", "송장번호"),  # 적요
+    ("ITEM_CD", None),  # 관리항목
+    ("P_REMARKS1", "수령자이름"),  # 적요1
+    ("P_REMARKS2", "수령자전화"),  # 적요2
+    ("P_REMARKS3", "수령자휴대폰"),  # 적요3
+    ("P_AMT1", None),
+    ("P_AMT2", None),
+]
+
+# 구매 BulkDatas 필드 (API 필드, 원본 컬럼)
+PURCHASE_BULK_FIELDS = [
+    ("ORD_DATE", None),  # 발주일자
+    ("ORD_NO", None),  # 발주번호
+    ("IO_DATE", "일자"),
+    ("UPLOAD_SER_NO", "전표묶음순번"),  # 날짜+브랜드+판매채널별 그룹 순번
+    ("CUST", None),  # 거래처코드
+    ("CUST_DES", "거래처명"),
+    ("EMP_CD", None),  # 담당자
+    ("WH_CD", "입고창고"),
+    ("IO_TYPE", None),  # 거래유형
+    ("EXCHANGE_TYPE", None),  # 외화종류
+    ("EXCHANGE_RATE", None),  # 환율
+    ("SITE", "판매채널"),  # 부서
+    ("PJT_CD", "브랜드"),  # 프로젝트
+    ("DOC_NO", None),  # 구매No.
+    ("U_MEMO1", None),
+    ("U_MEMO2", None),
+    ("U_MEMO3", None),
+    ("U_MEMO4", None),
+    ("U_MEMO5", None),
+    ("U_TXT1", None),  # 장문형식1
+    ("TTL_CTT", None),  # 제목
+    ("PROD_CD", "품목코드"),
+    ("PROD_DES", "품목명"),
+    ("SIZE_DES", "규격명"),
+    ("UQTY", None),  # 추가수량
+    ("QTY", "수량"),
+    ("PRICE", "단가"),
+    ("USER_PRICE_VAT", None),
+    ("SUPPLY_AMT", "공급가액"),
+    ("SUPPLY_AMT_F", None),  # 외화금액
+    ("VAT_AMT", "부가세"),
+    ("REMARKS", "적요"),
+    ("ITEM_CD", None),  # 관리항목
+    ("P_AMT1", None),
+    ("P_AMT2", None),
+    ("P_REMARKS1", None),
+    ("P_REMARKS2", None),
+    ("P_REMARKS3", None),
+    ("CUST_AMT", None),  # 부대비용
+]
+
+# 날짜(YYYYMMDD)로 변환하는 API 필드
+DATE_BULK_FIELDS = {"IO_DATE"}
+
+
+def build_bulk_datas(df: pd.DataFrame, fields: List[tuple]) -> List[Dict[str, Any]]:
+    """
+    DataFrame을 컬럼 단위로 변환해 BulkDatas 목록 생성 (행마다 safe_str/safe_date 호출하지 않음)
+
+    Args:
+        df: 전표묶음순번이 할당된 판매/구매 DataFrame
+        fields: (API 필드, 원본 컬럼) 목록 (SALE_BULK_FIELDS / PURCHASE_BULK_FIELDS)
+
+    Returns:
+        [{"BulkDatas": {...}}, ...] (행 순서, 필드 순서 유지)
+    """
+    keys = [field for field, _ in fields]
+    values = []
+    for field, source in fields:
+        if source is None or source not in df.columns:
+            # 원본 컬럼이 없거나 None인 필드는 빈 값 고정
+            values.append(repeat(""))
+        elif field in DATE_BULK_FIELDS:
+            values.append(safe_date_column(df[source]).tolist())
+        else:
+            values.append(safe_str_column(df[source]).tolist())
+
+    # 이미 모두 문자열이므로 to_dict 없이 필드 순서대로 바로 조립
+    return [{"BulkDatas": dict(zip(keys, row))} for row in zip(*values)]
+
+
 def convert_sales_df_to_ecount(sales_df: pd.DataFrame) -> List[Dict[str, Any]]:
     """
     판매 DataFrame을 이카운트 API 형식으로 변환
 
     전표 묶음 순번: 같은 일자 + 브랜드(프로젝트) + 판매채널(부서)을 가진 행들을 하나의 전표로 묶음
 
-    필드 매핑:
+    필드 매핑: SALE_BULK_FIELDS 참고
     - IO_DATE: 일자
     - UPLOAD_SER_NO: 순번 (자동 할당: 일자 + 브랜드 + 판매채널 기준)
     - PJT_CD: 브랜드 (프로젝트)
@@ -328,63 +436,10 @@ def convert_sales_df_to_ecount(sales_df: pd.DataFrame) -> List[Dict[str, Any]]:
     # 전표 묶음 순번 할당: 날짜 + 브랜드 + 판매채널 기준으로 그룹화
     # 각 배치마다 1부터 시작하므로 같은 그룹은 같은 전표로 묶임
     sales_df = sales_df.copy()
-    sales_df["전표묶음순번"] = sales_df.groupby(["일자", "브랜드", "판매채널"]).ngroup() + 1
-
-    sale_list = []
-
-    for _, row in sales_df.iterrows():
-        bulk_data = {
-            "IO_DATE": safe_date(row.get("일자")),
-            "UPLOAD_SER_NO": str(int(row.get("전표묶음순번"))),  # 날짜+브랜드+판매채널별 그룹 순번
-            "CUST": "",  # 거래처코드 (없음)
-            "CUST_DES": safe_str(row.get("거래처명")),
-            "EMP_CD": "",  # 담당자
-            "WH_CD": safe_str(row.get("출하창고")),
-            "IO_TYPE": "",  # 거래유형
-            "EXCHANGE_TYPE": "",  # 외화종류
-            "EXCHANGE_RATE": "",  # 환율
-            "SITE": safe_str(row.get("판매채널")),  # 부서
-            "PJT_CD": safe_str(row.get("브랜드")),  # 프로젝트
-            "DOC_NO": "",  # 판매No.
-            "TTL_CTT": "",  # 제목
-            "U_MEMO1": "",
-            "U_MEMO2": "",
-            "U_MEMO3": "",
-            "U_MEMO4": "",
-            "U_MEMO5": "",
-            "ADD_TXT_01": safe_str(row.get("수령자주소")),  # 추가문자형식1
-            "ADD_TXT_02": safe_str(row.get("배송메모")),  # 추가문자형식2
-            "ADD_TXT_03": safe_str(row.get("주문번호")),  # 추가문자형식3
-            "ADD_TXT_04": safe_str(row.get("옵션")),  # 추가문자형식4
-            "ADD_TXT_05": safe_str(row.get("주문상세번호")),  # 추가문자형식5
-            "ADD_TXT_06": "",
-            "ADD_TXT_07": "",
-            "ADD_TXT_08": "",
-            "ADD_TXT_09": "",
-            "ADD_TXT_10": "",
-            "U_TXT1": "",  # 장문형식1
-            "PROD_CD": safe_str(row.get("상품코드")),  # 품목코드
-            "PROD_DES": safe_str(row.get("품목명")),
-            "SIZE_DES": safe_str(row.get("규격")),
-            "UQTY": "",  # 추가수량
-            "QTY": safe_str(row.get("수량")),
-            "PRICE": safe_str(row.get("단가")),
-            "USER_PRICE_VAT": safe_str(row.get("단가(vat포함)")),
-            "SUPPLY_AMT": safe_str(row.get("공급가액")),
-            "SUPPLY_AMT_F": "",  # 외화금액
-            "VAT_AMT": safe_str(row.get("부가세")),
-            "REMARKS": safe_str(row.get("송장번호")),  # 적요
-            "ITEM_CD": "",  # 관리항목
-            "P_REMARKS1": safe_str(row.get("수령자이름")),  # 적요1
-            "P_REMARKS2": safe_str(row.get("수령자전화")),  # 적요2
-            "P_REMARKS3": safe_str(row.get("수령자휴대폰")),  # 적요3
-            "P_AMT1": "",
-            "P_AMT2": "",
-        }
+    # 일자/브랜드/판매채널이 비어 있는 행은 순번이 없으므로 오류 (기존 동작과 동일)
+    sales_df["전표묶음순번"] = (sales_df.groupby(["일자", "브랜드", "판매채널"]).ngroup() + 1).astype(int)
 
-        sale_list.append({"BulkDatas": bulk_data})
-
-    return sale_list
+    return build_bulk_datas(sales_df, SALE_BULK_FIELDS)
 
 
 def convert_purchase_df_to_ecount(purchase_df: pd.DataFrame) -> List[Dict[str, Any]]:
@@ -393,7 +448,7 @@ def convert_purchase_df_to_ecount(purchase_df: pd.DataFrame) -> List[Dict[str, A
 
     전표 묶음 순번: 같은 일자 + 브랜드(프로젝트) + 판매채널(부서)을 가진 행들을 하나의 전표로 묶음
 
-    필드 매핑:
+    필드 매핑: PURCHASE_BULK_FIELDS 참고
     - IO_DATE: 일자
     - UPLOAD_SER_NO: 순번 (자동 할당: 일자 + 브랜드 + 판매채널 기준)
     - PJT_CD: 브랜드 (프로젝트)
@@ -413,66 +468,25 @@ def convert_purchase_df_to_ecount(purchase_df: pd.DataFrame) -> List[Dict[str, A
     # 전표 묶음 순번 할당: 날짜 + 브랜드 + 판매채널 기준으로 그룹화
     # 각 배치마다 1부터 시작하므로 같은 그룹은 같은 전표로 묶임
     purchase_df = purchase_df.copy()
-    purchase_df["전표묶음순번"] = purchase_df.groupby(["일자", "브랜드", "판매채널"]).ngroup() + 1
-
-    purchase_list = []
-
-    for _, row in purchase_df.iterrows():
-        bulk_data = {
-            "ORD_DATE": "",  # 발주일자
-            "ORD_NO": "",  # 발주번호
-            "IO_DATE": safe_date(row.get("일자")),
-            "UPLOAD_SER_NO": str(int(row.get("전표묶음순번"))),  # 날짜+브랜드+판매채널별 그룹 순번
-            "CUST": "",  # 거래처코드
-            "CUST_DES": safe_str(row.get("거래처명")),
-            "EMP_CD": "",  # 담당자
-            "WH_CD": safe_str(row.get("입고창고")),
-            "IO_TYPE": "",  # 거래유형
-            "EXCHANGE_TYPE": "",  # 외화종류
-            "EXCHANGE_RATE": "",  # 환율
-            "SITE": safe_str(row.get("판매채널")),  # 부서
-            "PJT_CD": safe_str(row.get("브랜드")),  # 프로젝트
-            "DOC_NO": "",  # 구매No.
-            "U_MEMO1": "",
-            "U_MEMO2": "",
-            "U_MEMO3": "",
-            "U_MEMO4": "",
-            "U_MEMO5": "",
-            "U_TXT1": "",  # 장문형식1
-            "TTL_CTT": "",  # 제목
-            "PROD_CD": safe_str(row.get("품목코드")),
-            "PROD_DES": safe_str(row.get("품목명")),
-            "SIZE_DES": safe_str(row.get("규격명")),
-            "UQTY": "",  # 추가수량
-            "QTY": safe_str(row.get("수량")),
-            "PRICE": safe_str(row.get("단가")),
-            "USER_PRICE_VAT": "",
-            "SUPPLY_AMT": safe_str(row.get("공급가액")),
-            "SUPPLY_AMT_F": "",  # 외화금액
-            "VAT_AMT": safe_str(row.get("부가세")),
-            "REMARKS": safe_str(row.get("적요")),
-            "ITEM_CD": "",  # 관리항목
-            "P_AMT1": "",
-            "P_AMT2": "",
-            "P_REMARKS1": "",
-            "P_REMARKS2": "",
-            "P_REMARKS3": "",
-            "CUST_AMT": "",  # 부대비용
-        }
+    # 일자/브랜드/판매채널이 비어 있는 행은 순번이 없으므로 오류 (기존 동작과 동일)
+    purchase_df["전표묶음순번"] = (purchase_df.groupby(["일자", "브랜드", "판매채널"]).ngroup() + 1).astype(int)
 
-        purchase_list.append({"BulkDatas": bulk_data})
+    return build_bulk_datas(purchase_df, PURCHASE_BULK_FIELDS)
 
-    return purchase_list
+
+# 전표 그룹 기준 (같은 그룹 = 같은 UPLOAD_SER_NO = 하나의 전표)
+VOUCHER_GROUP_COLUMNS = ["일자", "브랜드", "판매채널"]
 
 
 def split_dataframe_into_batches(df: pd.DataFrame, batch_size: int = 300) -> List[pd.DataFrame]:
     """
-    DataFrame을 batch_size 건수씩 단순 분할
+    DataFrame을 전표 그룹(날짜+브랜드+판매채널)을 찢지 않도록 batch_size 이하 배치로 분할
 
-    - 날짜+브랜드+판매채널 그룹을 찢을 수 있음
-    - 각 배치는 최대 300건 (마지막 배치는 300건 미만 가능)
-    - UPLOAD_SER_NO는 각 배치 내에서 날짜+브랜드+판매채널별로 1부터 부여
-    - 같은 그룹이 여러 배치에 나뉘어도 각 배치에서 독립적으로 순번 할당
+    - 그룹이 batch_size 이하면 항상 한 배치에 통째로 포함 (전표가 둘로 나뉘지 않음)
+    - batch_size보다 큰 그룹만 batch_size 단위 조각으로 분할 (어쩔 수 없이 여러 전표)
+    - 그룹(조각)을 큰 것부터 들어갈 수 있는 첫 배치에 채움 (First Fit Decreasing) → 배치 수 최소화
+    - 배치 순서/구성은 입력이 같으면 항상 동일 (fix_upload_from_batch의 배치 번호 재현)
+    - 배치 내 행 순서는 원본 순서 유지, UPLOAD_SER_NO는 각 배치 내에서 1부터 부여
 
     Args:
         df: 판매 또는 구매 DataFrame
@@ -484,13 +498,37 @@ def split_dataframe_into_batches(df: pd.DataFrame, batch_size: int = 300) -> Lis
     if df.empty:
         return []
 
-    # 단순히 batch_size 건수씩 분할
-    batches = []
-    for i in range(0, len(df), batch_size):
-        batch = df.iloc[i:i+batch_size].copy()
-        batches.append(batch)
+    group_columns = [col for col in VOUCHER_GROUP_COLUMNS if col in df.columns]
+    if not group_columns:
+        # 그룹 기준 컬럼이 없으면 단순 분할
+        return [df.iloc[i:i + batch_size].copy() for i in range(0, len(df), batch_size)]
+
+    # 그룹별 행 위치 (처음 등장한 순서), 큰 그룹은 batch_size 조각으로 분할
+    group_ids = df.groupby(group_columns, sort=False, dropna=False).ngroup()
+    pieces = []
+    for _, positions in pd.Series(range(len(df))).groupby(group_ids.to_numpy(), sort=False):
+        rows = positions.tolist()
+        for i in range(0, len(rows), batch_size):
+            pieces.append(rows[i:i + batch_size])
+
+    # First Fit Decreasing (정렬은 안정 정렬이라 같은 크기는 등장 순서 유지)
+    pieces.sort(key=len, reverse=True)
+    bins = []       # 배치별 행 위치 목록
+    remaining = []  # 배치별 남은 자리
+    for rows in pieces:
+        for idx, space in enumerate(remaining):
+            if space >= len(rows):
+                bins[idx].extend(rows)
+                remaining[idx] -= len(rows)
+                break
+        else:
+            bins.append(list(rows))
+            remaining.append(batch_size - len(rows))
 
-    return batches
+    # 원본에서 먼저 나오는 행을 가진 배치가 앞 번호 (날짜순에 가깝게)
+    bins = [sorted(rows) for rows in bins]
+    bins.sort(key=lambda rows: rows[0])
+    return [df.iloc[rows].copy() for rows in bins]
 
 
 def save_sale(session_id: str, sales_df: pd.DataFrame,
@@ -508,37 +546,11 @@ def save_sale(session_id: str, sales_df: pd.DataFrame,
     Returns:
         API 응답 결과
     """
-    url = build_api_url("Sale/SaveSale", session_id, zone, test)
-
     # DataFrame을 이카운트 형식으로 변환
     sale_list = convert_sales_df_to_ecount(sales_df)
 
-    payload = {"SaleList": sale_list}
-    headers = {"Content-Type": "application/json"}
-
-    resp = requests.post(url, headers=headers, json=payload, timeout=timeout)
-
-    # HTTP 레벨 에러 체크
-    if resp.status_code != 200:
-        raise RuntimeError(f"[HTTP {resp.status_code}] {resp.text}")
-
-    # JSON 파싱
-    try:
-        result = resp.json()
-    except json.JSONDecodeError:
-        raise RuntimeError("응답이 JSON 형식이 아닙니다:\n" + resp.text)
-
-    # API 레벨 에러 체크
-    status = str(result.get("Status"))
-    error = result.get("Error")
-
-    if status != "200" or error:
-        code = None if not error else error.get("Code")
-        msg = None if not error else error.get("Message")
-        detail = None if not error else error.get("MessageDetail")
-        raise RuntimeError(f"[API Error] Status={status}, Code={code}, Message={msg}, Detail={detail}")
-
-    return result
+    client = get_ecount_client(zone, test)
+    return client.save_sale(session_id, sale_list, timeout=timeout)
 
 
 def save_purchase(session_id: str, purchase_df: pd.DataFrame,
@@ -556,37 +568,40 @@ def save_purchase(session_id: str, purchase_df: pd.DataFrame,
     Returns:
         API 응답 결과
     """
-    url = build_api_url("Purchases/SavePurchases", session_id, zone, test)
-
     # DataFrame을 이카운트 형식으로 변환
     purchase_list = convert_purchase_df_to_ecount(purchase_df)
 
-    payload = {"PurchasesList": purchase_list}
-    headers = {"Content-Type": "application/json"}
+    client = get_ecount_client(zone, test)
+    return client.save_purchase(session_id, purchase_list, timeout=timeout)
 
-    resp = requests.post(url, headers=headers, json=payload, timeout=timeout)
 
-    # HTTP 레벨 에러 체크
-    if resp.status_code != 200:
-        raise RuntimeError(f"[HTTP {resp.status_code}] {resp.text}")
+def upload_batches_to_ecount(session: EcountSession, batches: List[pd.DataFrame], data_type: str,
+                             start_batch: int = 1) -> dict:
+    """
+    배치 목록을 이카운트 API로 동시 업로드 (요청 제한/재시도는 ecount_upload 엔진이 처리)
 
-    # JSON 파싱
-    try:
-        result = resp.json()
-    except json.JSONDecodeError:
-        raise RuntimeError("응답이 JSON 형식이 아닙니다:\n" + resp.text)
+    세션이 만료되면 다시 로그인해 해당 배치를 한 번 재시도
 
-    # API 레벨 에러 체크
-    status = str(result.get("Status"))
-    error = result.get("Error")
+    Args:
+        session: 이카운트 세션 (get_ecount_session())
+        batches: split_dataframe_into_batches()로 나눈 배치 목록
+        data_type: "sales" 또는 "purchase"
+        start_batch: 업로드를 시작할 배치 번호 (1부터)
 
-    if status != "200" or error:
-        code = None if not error else error.get("Code")
-        msg = None if not error else error.get("Message")
-        detail = None if not error else error.get("MessageDetail")
-        raise RuntimeError(f"[API Error] Status={status}, Code={code}, Message={msg}, Detail={detail}")
+    Returns:
+        {"success", "success_count", "fail_count", "slip_nos", "batch_count", "failed_batches", "error_details"}
+    """
+    save = save_sale if data_type == "sales" else save_purchase
+
+    def send(batch_df: pd.DataFrame) -> dict:
+        return session.call(lambda session_id: save(session_id, batch_df, zone=ZONE, test=USE_TEST_SERVER))
+
+    if len(batches) - start_batch + 1 > 1:
+        print(f"  📤 최대 {ECOUNT_UPLOAD_WORKERS}개 배치 동시 업로드 중... (초당 최대 {ECOUNT_RATE_LIMIT:g}회 요청)")
 
-    return result
+    upload = upload_batches(send, batches, start_batch=start_batch)
+    get_ecount_client(ZONE, USE_TEST_SERVER).print_timing_summary()
+    return upload
 
 
 def upload_dataframes_to_ecount(sales_df: pd.DataFrame, purchase_df: pd.DataFrame,
@@ -611,27 +626,15 @@ def upload_dataframes_to_ecount(sales_df: pd.DataFrame, purchase_df: pd.DataFram
     # ===== 1단계: 이카운트 로그인 =====
     print(f"\n[1단계] 이카운트 로그인 중...")
     try:
-        login_result = login_ecount(
-            com_code=COM_CODE,
-            user_id=USER_ID,
-            api_cert_key=API_CERT_KEY,
-            lan_type=LAN_TYPE,
-            zone=ZONE,
-            test=USE_TEST_SERVER
-        )
-
-        # SESSION_ID 추출
-        data = login_result.get("Data", {}) or {}
-        datas = data.get("Datas", {}) or {}
-        session_id = datas.get("SESSION_ID")
-
-        if not session_id:
-            print("❌ SESSION_ID를 찾을 수 없습니다.")
-            results["login"] = {"success": False, "error": "No SESSION_ID"}
-            return results
+        # 저장된 세션이 유효하면 재사용, 없거나 만료됐으면 로그인
+        session = get_ecount_session()
+        session_id = session.get_session_id()
 
         results["login"] = {"success": True, "session_id": session_id}
-        print(f"✅ 로그인 성공: SESSION_ID={session_id[:20]}...")
+        if session.from_cache:
+            print(f"✅ 저장된 세션 사용: SESSION_ID={session_id[:20]}...")
+        else:
+            print(f"✅ 로그인 성공: SESSION_ID={session_id[:20]}...")
 
     except Exception as e:
         print(f"❌ 로그인 실패: {e}")
@@ -649,51 +652,27 @@ def upload_dataframes_to_ecount(sales_df: pd.DataFrame, purchase_df: pd.DataFram
         if total_batches > 1:
             print(f"  ⚙️  이카운트 API 제한(300건)으로 인해 {total_batches}개 배치로 분할하여 업로드합니다.")
 
-        total_success_cnt = 0
-        total_fail_cnt = 0
-        all_slip_nos = []
-
         try:
-            for batch_idx, batch_df in enumerate(sales_batches, 1):
-                if total_batches > 1:
-                    print(f"\n  📤 배치 {batch_idx}/{total_batches} 업로드 중... ({len(batch_df)}건)")
-
-                sale_result = save_sale(
-                    session_id=session_id,
-                    sales_df=batch_df,
-                    zone=ZONE,
-                    test=USE_TEST_SERVER
-                )
-
-                result_data = sale_result.get("Data", {})
-                success_cnt = result_data.get("SuccessCnt", 0)
-                fail_cnt = result_data.get("FailCnt", 0)
-                slip_nos = result_data.get("SlipNos", [])
-
-                total_success_cnt += success_cnt
-                total_fail_cnt += fail_cnt
-                all_slip_nos.extend(slip_nos)
-
-                if total_batches > 1:
-                    print(f"     ✅ 배치 {batch_idx} 완료: 성공 {success_cnt}건, 실패 {fail_cnt}건")
-
-                # 실패 상세
-                if fail_cnt > 0:
-                    result_details = result_data.get("ResultDetails", [])
-                    for detail in result_details:
-                        if not detail.get("IsSuccess", False):
-                            print(f"     ⚠️ 오류: {detail.get('TotalError', '')}")
+            upload = upload_batches_to_ecount(session, sales_batches, "sales")
+            total_success_cnt = upload["success_count"]
+            total_fail_cnt = upload["fail_count"]
+            all_slip_nos = upload["slip_nos"]
+            failed_batches = upload["failed_batches"]
 
             results["sales_upload"] = {
-                "success": True,
+                "success": upload["success"],
                 "success_count": total_success_cnt,
                 "fail_count": total_fail_cnt,
-                "slip_nos": all_slip_nos
+                "slip_nos": all_slip_nos,
+                "batch_count": total_batches,
+                "failed_batches": failed_batches
             }
 
             print(f"\n✅ 판매 업로드 완료:")
             print(f"  - 성공: {total_success_cnt}건")
             print(f"  - 실패: {total_fail_cnt}건")
+            if failed_batches:
+                print(f"  ⚠️  실패한 배치: {', '.join(map(str, failed_batches))}")
 
         except Exception as e:
             print(f"❌ 판매 업로드 실패: {e}")
@@ -709,51 +688,27 @@ def upload_dataframes_to_ecount(sales_df: pd.DataFrame, purchase_df: pd.DataFram
         if total_batches > 1:
             print(f"  ⚙️  이카운트 API 제한(300건)으로 인해 {total_batches}개 배치로 분할하여 업로드합니다.")
 
-        total_success_cnt = 0
-        total_fail_cnt = 0
-        all_slip_nos = []
-
         try:
-            for batch_idx, batch_df in enumerate(purchase_batches, 1):
-                if total_batches > 1:
-                    print(f"\n  📤 배치 {batch_idx}/{total_batches} 업로드 중... ({len(batch_df)}건)")
-
-                purchase_result = save_purchase(
-                    session_id=session_id,
-                    purchase_df=batch_df,
-                    zone=ZONE,
-                    test=USE_TEST_SERVER
-                )
-
-                result_data = purchase_result.get("Data", {})
-                success_cnt = result_data.get("SuccessCnt", 0)
-                fail_cnt = result_data.get("FailCnt", 0)
-                slip_nos = result_data.get("SlipNos", [])
-
-                total_success_cnt += success_cnt
-                total_fail_cnt += fail_cnt
-                all_slip_nos.extend(slip_nos)
-
-                if total_batches > 1:
-                    print(f"     ✅ 배치 {batch_idx} 완료: 성공 {success_cnt}건, 실패 {fail_cnt}건")
-
-                # 실패 상세
-                if fail_cnt > 0:
-                    result_details = result_data.get("ResultDetails", [])
-                    for detail in result_details:
-                        if not detail.get("IsSuccess", False):
-                            print(f"     ⚠️ 오류: {detail.get('TotalError', '')}")
+            upload = upload_batches_to_ecount(session, purchase_batches, "purchase")
+            total_success_cnt = upload["success_count"]
+            total_fail_cnt = upload["fail_count"]
+            all_slip_nos = upload["slip_nos"]
+            failed_batches = upload["failed_batches"]
 
             results["purchase_upload"] = {
-                "success": True,
+                "success": upload["success"],
                 "success_count": total_success_cnt,
                 "fail_count": total_fail_cnt,
-                "slip_nos": all_slip_nos
+                "slip_nos": all_slip_nos,
+                "batch_count": total_batches,
+                "failed_batches": failed_batches
             }
 
             print(f"\n✅ 구매 업로드 완료:")
             print(f"  - 성공: {total_success_cnt}건")
             print(f"  - 실패: {total_fail_cnt}건")
+            if failed_batches:
+                print(f"  ⚠️  실패한 배치: {', '.join(map(str, failed_batches))}")
 
         except Exception as e:
             print(f"❌ 구매 업로드 실패: {e}")
@@ -823,27 +778,15 @@ def upload_coupang_to_ecount(target_date: str, upload_sales: bool = True,
     # ===== 2단계: 이카운트 로그인 =====
     print("\n[2단계] 이카운트 로그인 중...")
     try:
-        login_result = login_ecount(
-            com_code=COM_CODE,
-            user_id=USER_ID,
-            api_cert_key=API_CERT_KEY,
-            lan_type=LAN_TYPE,
-            zone=ZONE,
-            test=USE_TEST_SERVER
-        )
-
-        # SESSION_ID 추출
-        data = login_result.get("Data", {}) or {}
-        datas = data.get("Datas", {}) or {}
-        session_id = datas.get("SESSION_ID")
-
-        if not session_id:
-            print("❌ SESSION_ID를 찾을 수 없습니다.")
-            results["login"] = {"success": False, "error": "No SESSION_ID"}
-            return results
+        # 저장된 세션이 유효하면 재사용, 없거나 만료됐으면 로그인
+        session = get_ecount_session()
+        session_id = session.get_session_id()
 
         results["login"] = {"success": True, "session_id": session_id}
-        print(f"✅ 로그인 성공: SESSION_ID={session_id[:20]}...")
+        if session.from_cache:
+            print(f"✅ 저장된 세션 사용: SESSION_ID={session_id[:20]}...")
+        else:
+            print(f"✅ 로그인 성공: SESSION_ID={session_id[:20]}...")
 
     except Exception as e:
         print(f"❌ 로그인 실패: {e}")
@@ -861,54 +804,15 @@ def upload_coupang_to_ecount(target_date: str, upload_sales: bool = True,
         if total_batches > 1:
             print(f"  ⚙️  이카운트 API 제한(300건)으로 인해 {total_batches}개 배치로 분할하여 업로드합니다.")
 
-        total_success_cnt = 0
-        total_fail_cnt = 0
-        all_slip_nos = []
-        failed_batches = []
-
         try:
-            for batch_idx, batch_df in enumerate(sales_batches, 1):
-                if total_batches > 1:
-                    print(f"\n  📤 배치 {batch_idx}/{total_batches} 업로드 중... ({len(batch_df)}건)")
-
-                try:
-                    sale_result = save_sale(
-                        session_id=session_id,
-                        sales_df=batch_df,
-                        zone=ZONE,
-                        test=USE_TEST_SERVER
-                    )
-
-                    result_data = sale_result.get("Data", {})
-                    success_cnt = result_data.get("SuccessCnt", 0)
-                    fail_cnt = result_data.get("FailCnt", 0)
-                    slip_nos = result_data.get("SlipNos", [])
-
-                    total_success_cnt += success_cnt
-                    total_fail_cnt += fail_cnt
-                    all_slip_nos.extend(slip_nos)
-
-                    if fail_cnt > 0:
-                        failed_batches.append(batch_idx)
-                        if total_batches > 1:
-                            print(f"     ⚠️  배치 {batch_idx}: 성공 {success_cnt}건, 실패 {fail_cnt}건")
-
-                        # 실패 상세
-                        result_details = result_data.get("ResultDetails", [])
-                        for detail in result_details:
-                            if not detail.get("IsSuccess", False):
-                                print(f"         오류: {detail.get('TotalError', '')}")
-                    else:
-                        if total_batches > 1:
-                            print(f"     ✅ 배치 {batch_idx}: 성공 {success_cnt}건")
-
-                except Exception as e:
-                    print(f"     ❌ 배치 {batch_idx} 업로드 실패: {e}")
-                    failed_batches.append(batch_idx)
-                    continue
+            upload = upload_batches_to_ecount(session, sales_batches, "sales")
+            total_success_cnt = upload["success_count"]
+            total_fail_cnt = upload["fail_count"]
+            all_slip_nos = upload["slip_nos"]
+            failed_batches = upload["failed_batches"]
 
             results["sales_upload"] = {
-                "success": len(failed_batches) == 0,
+                "success": upload["success"],
                 "success_count": total_success_cnt,
                 "fail_count": total_fail_cnt,
                 "slip_nos": all_slip_nos,
@@ -931,7 +835,8 @@ def upload_coupang_to_ecount(target_date: str, upload_sales: bool = True,
                     "failed_batches": failed_batches,
                     "total_batches": total_batches,
                     "success_count": total_success_cnt,
-                    "fail_count": total_fail_cnt
+                    "fail_count": total_fail_cnt,
+                    "error_details": upload["error_details"]
                 }
                 log_file = save_failure_log(failure_info)
                 print(f"\n  📝 실패 기록 저장: {log_file}")
@@ -950,54 +855,15 @@ def upload_coupang_to_ecount(target_date: str, upload_sales: bool = True,
         if total_batches > 1:
             print(f"  ⚙️  이카운트 API 제한(300건)으로 인해 {total_batches}개 배치로 분할하여 업로드합니다.")
 
-        total_success_cnt = 0
-        total_fail_cnt = 0
-        all_slip_nos = []
-        failed_batches = []
-
         try:
-            for batch_idx, batch_df in enumerate(purchase_batches, 1):
-                if total_batches > 1:
-                    print(f"\n  📤 배치 {batch_idx}/{total_batches} 업로드 중... ({len(batch_df)}건)")
-
-                try:
-                    purchase_result = save_purchase(
-                        session_id=session_id,
-                        purchase_df=batch_df,
-                        zone=ZONE,
-                        test=USE_TEST_SERVER
-                    )
-
-                    result_data = purchase_result.get("Data", {})
-                    success_cnt = result_data.get("SuccessCnt", 0)
-                    fail_cnt = result_data.get("FailCnt", 0)
-                    slip_nos = result_data.get("SlipNos", [])
-
-                    total_success_cnt += success_cnt
-                    total_fail_cnt += fail_cnt
-                    all_slip_nos.extend(slip_nos)
-
-                    if fail_cnt > 0:
-                        failed_batches.append(batch_idx)
-                        if total_batches > 1:
-                            print(f"     ⚠️  배치 {batch_idx}: 성공 {success_cnt}건, 실패 {fail_cnt}건")
-
-                        # 실패 상세
-                        result_details = result_data.get("ResultDetails", [])
-                        for detail in result_details:
-                            if not detail.get("IsSuccess", False):
-                                print(f"         오류: {detail.get('TotalError', '')}")
-                    else:
-                        if total_batches > 1:
-                            print(f"     ✅ 배치 {batch_idx}: 성공 {success_cnt}건")
-
-                except Exception as e:
-                    print(f"     ❌ 배치 {batch_idx} 업로드 실패: {e}")
-                    failed_batches.append(batch_idx)
-                    continue
+            upload = upload_batches_to_ecount(session, purchase_batches, "purchase")
+            total_success_cnt = upload["success_count"]
+            total_fail_cnt = upload["fail_count"]
+            all_slip_nos = upload["slip_nos"]
+            failed_batches = upload["failed_batches"]
 
             results["purchase_upload"] = {
-                "success": len(failed_batches) == 0,
+                "success": upload["success"],
                 "success_count": total_success_cnt,
                 "fail_count": total_fail_cnt,
                 "slip_nos": all_slip_nos,
@@ -1020,7 +886,8 @@ def upload_coupang_to_ecount(target_date: str, upload_sales: bool = True,
                     "failed_batches": failed_batches,
                     "total_batches": total_batches,
                     "success_count": total_success_cnt,
-                    "fail_count": total_fail_cnt
+                    "fail_count": total_fail_cnt,
+                    "error_details": upload["error_details"]
                 }
                 log_file = save_failure_log(failure_info)
                 print(f"\n  📝 실패 기록 저장: {log_file}")
@@ -1094,26 +961,15 @@ def fix_upload_from_batch(excel_file: str, data_type: str, start_batch: int) ->
     # ===== 3단계: 이카운트 로그인 =====
     print(f"\n[3단계] 이카운트 로그인 중...")
     try:
-        login_result = login_ecount(
-            com_code=COM_CODE,
-            user_id=USER_ID,
-            api_cert_key=API_CERT_KEY,
-            lan_type=LAN_TYPE,
-            zone=ZONE,
-            test=USE_TEST_SERVER
-        )
-
-        data = login_result.get("Data", {}) or {}
-        datas = data.get("Datas", {}) or {}
-        session_id = datas.get("SESSION_ID")
-
-        if not session_id:
-            print("❌ SESSION_ID를 찾을 수 없습니다.")
-            results["login"] = {"success": False, "error": "No SESSION_ID"}
-            return results
+        # 저장된 세션이 유효하면 재사용, 없거나 만료됐으면 로그인
+        session = get_ecount_session()
+        session_id = session.get_session_id()
 
         results["login"] = {"success": True, "session_id": session_id}
-        print(f"✅ 로그인 성공: SESSION_ID={session_id[:20]}...")
+        if session.from_cache:
+            print(f"✅ 저장된 세션 사용: SESSION_ID={session_id[:20]}...")
+        else:
+            print(f"✅ 로그인 성공: SESSION_ID={session_id[:20]}...")
 
     except Exception as e:
         print(f"❌ 로그인 실패: {e}")
@@ -1123,62 +979,15 @@ def fix_upload_from_batch(excel_file: str, data_type: str, start_batch: int) ->
     # ===== 4단계: 특정 배치부터 업로드 =====
     print(f"\n[4단계] 배치 {start_batch}번부터 {total_batches}번까지 업로드 중...")
 
-    total_success_cnt = 0
-    total_fail_cnt = 0
-    all_slip_nos = []
-    failed_batches = []
-
     try:
-        for batch_idx in range(start_batch - 1, total_batches):
-            batch_num = batch_idx + 1
-            batch_df = batches[batch_idx]
-
-            print(f"\n  📤 배치 {batch_num}/{total_batches} 업로드 중... ({len(batch_df)}건)")
-
-            try:
-                if data_type == "sales":
-                    result = save_sale(
-                        session_id=session_id,
-                        sales_df=batch_df,
-                        zone=ZONE,
-                        test=USE_TEST_SERVER
-                    )
-                else:  # purchase
-                    result = save_purchase(
-                        session_id=session_id,
-                        purchase_df=batch_df,
-                        zone=ZONE,
-                        test=USE_TEST_SERVER
-                    )
-
-                result_data = result.get("Data", {})
-                success_cnt = result_data.get("SuccessCnt", 0)
-                fail_cnt = result_data.get("FailCnt", 0)
-                slip_nos = result_data.get("SlipNos", [])
-
-                total_success_cnt += success_cnt
-                total_fail_cnt += fail_cnt
-                all_slip_nos.extend(slip_nos)
-
-                if fail_cnt > 0:
-                    failed_batches.append(batch_num)
-                    print(f"     ⚠️  배치 {batch_num}: 성공 {success_cnt}건, 실패 {fail_cnt}건")
-
-                    # 실패 상세
-                    result_details = result_data.get("ResultDetails", [])
-                    for detail in result_details:
-                        if not detail.get("IsSuccess", False):
-                            print(f"         오류: {detail.get('TotalError', '')}")
-                else:
-                    print(f"     ✅ 배치 {batch_num}: 성공 {success_cnt}건")
-
-            except Exception as e:
-                print(f"     ❌ 배치 {batch_num} 업로드 실패: {e}")
-                failed_batches.append(batch_num)
-                continue
+        upload = upload_batches_to_ecount(session, batches, data_type, start_batch=start_batch)
+        total_success_cnt = upload["success_count"]
+        total_fail_cnt = upload["fail_count"]
+        all_slip_nos = upload["slip_nos"]
+        failed_batches = upload["failed_batches"]
 
         results["upload"] = {
-            "success": len(failed_batches) == 0,
+            "success": upload["success"],
             "success_count": total_success_cnt,
             "fail_count": total_fail_cnt,
             "slip_nos": all_slip_nos,
@@ -1203,7 +1012,8 @@ def fix_upload_from_batch(excel_file: str, data_type: str, start_batch: int) ->
                 "failed_batches": failed_batches,
                 "total_batches": total_batches,
                 "success_count": total_success_cnt,
-                "fail_count": total_fail_cnt
+                "fail_count": total_fail_cnt,
+                "error_details": upload["error_details"]
             }
             log_file = save_failure_log(failure_info)
             print(f"\n📝 실패 기록 저장: {log_file}")
@@ -1217,7 +1027,7 @@ def fix_upload_from_batch(excel_file: str, data_type: str, start_batch: int) ->
 
 
 def process_and_upload(upload_sales: bool = True, upload_purchase: bool = True,
-                       save_excel: bool = True) -> dict:
+                       save_excel: bool = True, workers: Optional[int] = None) -> dict:
     """
     이지어드민 엑셀 변환 → 이카운트 API 업로드 통합 처리
 
@@ -1225,11 +1035,12 @@ def process_and_upload(upload_sales: bool = True, upload_purchase: bool = True,
         upload_sales: 판매 데이터 업로드 여부
         upload_purchase: 구매 데이터 업로드 여부
         save_excel: 엑셀 파일로도 저장할지 여부
+        workers: 엑셀 파일 변환 프로세스 수 (2 이상이면 병렬 처리, None이면 EZADMIN_PARSE_WORKERS)
 
     Returns:
         처리 결과 딕셔너리
     """
-    from excel_converter import process_ezadmin_to_ecount, save_to_excel
+    from excel_converter import process_ezadmin_to_ecount, revalidate_pending_sellers, save_to_excel
 
     print("=" * 80)
     print("이지어드민 → 이카운트 통합 처리 시작")
@@ -1247,6 +1058,7 @@ def process_and_upload(upload_sales: bool = True, upload_purchase: bool = True,
     purchase_df = None
     voucher_df = None
     excel_result = None
+    pending_mappings = []
 
     max_retries = 5  # 최대 5번까지 재시도
     for attempt in range(1, max_retries + 1):
@@ -1256,7 +1068,11 @@ def process_and_upload(upload_sales: bool = True, upload_purchase: bool = True,
             else:
                 print(f"\n[1단계-재시도 {attempt}/{max_retries}] 매핑 후 재검증 중...")
 
-            excel_result, pending_mappings = process_ezadmin_to_ecount()
+            if excel_result is None:
+                excel_result, pending_mappings = process_ezadmin_to_ecount(workers=workers)
+            else:
+                # 매핑 후 재검증: 변환 결과는 그대로 두고 정제 불가 행만 다시 확인
+                excel_result, pending_mappings = revalidate_pending_sellers(excel_result, pending_mappings)
             sales_df = excel_result["sales"]
             purchase_df = excel_result["purchase"]
             voucher_df = excel_result["voucher"]
@@ -1358,27 +1174,15 @@ def process_and_upload(upload_sales: bool = True, upload_purchase: bool = True,
     # ===== 2단계: 이카운트 로그인 =====
     print("\n[2단계] 이카운트 로그인 중...")
     try:
-        login_result = login_ecount(
-            com_code=COM_CODE,
-            user_id=USER_ID,
-            api_cert_key=API_CERT_KEY,
-            lan_type=LAN_TYPE,
-            zone=ZONE,
-            test=USE_TEST_SERVER
-        )
-
-        # SESSION_ID 추출
-        data = login_result.get("Data", {}) or {}
-        datas = data.get("Datas", {}) or {}
-        session_id = datas.get("SESSION_ID")
-
-        if not session_id:
-            print("❌ SESSION_ID를 찾을 수 없습니다.")
-            results["login"] = {"success": False, "error": "No SESSION_ID"}
-            return results
+        # 저장된 세션이 유효하면 재사용, 없거나 만료됐으면 로그인
+        session = get_ecount_session()
+        session_id = session.get_session_id()
 
         results["login"] = {"success": True, "session_id": session_id}
-        print(f"✅ 로그인 성공: SESSION_ID={session_id[:20]}...")
+        if session.from_cache:
+            print(f"✅ 저장된 세션 사용: SESSION_ID={session_id[:20]}...")
+        else:
+            print(f"✅ 로그인 성공: SESSION_ID={session_id[:20]}...")
 
     except Exception as e:
         print(f"❌ 로그인 실패: {e}")
@@ -1399,55 +1203,15 @@ def process_and_upload(upload_sales: bool = True, upload_purchase: bool = True,
                 print(f"     배치 {i}/{total_batches}: {len(batch)}건")
 
         # 누적 결과
-        total_success_cnt = 0
-        total_fail_cnt = 0
-        all_slip_nos = []
-        failed_batches = []
-
         try:
-            for batch_idx, batch_df in enumerate(sales_batches, 1):
-                if total_batches > 1:
-                    print(f"\n  📤 배치 {batch_idx}/{total_batches} 업로드 중... ({len(batch_df)}건)")
-
-                try:
-                    sale_result = save_sale(
-                        session_id=session_id,
-                        sales_df=batch_df,
-                        zone=ZONE,
-                        test=USE_TEST_SERVER
-                    )
-
-                    # 결과 분석
-                    result_data = sale_result.get("Data", {})
-                    success_cnt = result_data.get("SuccessCnt", 0)
-                    fail_cnt = result_data.get("FailCnt", 0)
-                    slip_nos = result_data.get("SlipNos", [])
-
-                    total_success_cnt += success_cnt
-                    total_fail_cnt += fail_cnt
-                    all_slip_nos.extend(slip_nos)
-
-                    if fail_cnt > 0:
-                        failed_batches.append(batch_idx)
-                        if total_batches > 1:
-                            print(f"     ⚠️  배치 {batch_idx}: 성공 {success_cnt}건, 실패 {fail_cnt}건")
-
-                        # 실패 상세
-                        result_details = result_data.get("ResultDetails", [])
-                        for detail in result_details:
-                            if not detail.get("IsSuccess", False):
-                                print(f"         오류: {detail.get('TotalError', '')}")
-                    else:
-                        if total_batches > 1:
-                            print(f"     ✅ 배치 {batch_idx}: 성공 {success_cnt}건")
-
-                except Exception as e:
-                    print(f"     ❌ 배치 {batch_idx} 업로드 실패: {e}")
-                    failed_batches.append(batch_idx)
-                    continue
+            upload = upload_batches_to_ecount(session, sales_batches, "sales")
+            total_success_cnt = upload["success_count"]
+            total_fail_cnt = upload["fail_count"]
+            all_slip_nos = upload["slip_nos"]
+            failed_batches = upload["failed_batches"]
 
             results["sales_upload"] = {
-                "success": len(failed_batches) == 0,
+                "success": upload["success"],
                 "success_count": total_success_cnt,
                 "fail_count": total_fail_cnt,
                 "slip_nos": all_slip_nos,
@@ -1469,7 +1233,8 @@ def process_and_upload(upload_sales: bool = True, upload_purchase: bool = True,
                     "failed_batches": failed_batches,
                     "total_batches": total_batches,
                     "success_count": total_success_cnt,
-                    "fail_count": total_fail_cnt
+                    "fail_count": total_fail_cnt,
+                    "error_details": upload["error_details"]
                 }
                 log_file = save_failure_log(failure_info)
                 print(f"\n  📝 실패 기록 저장: {log_file}")
@@ -1500,49 +1265,15 @@ def process_and_upload(upload_sales: bool = True, upload_purchase: bool = True,
                 print(f"     배치 {i}/{total_batches}: {len(batch)}건")
 
         # 누적 결과
-        total_success_cnt = 0
-        total_fail_cnt = 0
-        all_slip_nos = []
-        failed_batches = []
-
         try:
-            for batch_idx, batch_df in enumerate(purchase_batches, 1):
-                if total_batches > 1:
-                    print(f"\n  📤 배치 {batch_idx}/{total_batches} 업로드 중... ({len(batch_df)}건)")
-
-                try:
-                    purchase_result = save_purchase(
-                        session_id=session_id,
-                        purchase_df=batch_df,
-                        zone=ZONE,
-                        test=USE_TEST_SERVER
-                    )
-
-                    # 결과 분석
-                    result_data = purchase_result.get("Data", {})
-                    success_cnt = result_data.get("SuccessCnt", 0)
-                    fail_cnt = result_data.get("FailCnt", 0)
-                    slip_nos = result_data.get("SlipNos", [])
-
-                    total_success_cnt += success_cnt
-                    total_fail_cnt += fail_cnt
-                    all_slip_nos.extend(slip_nos)
-
-                    if fail_cnt > 0:
-                        failed_batches.append(batch_idx)
-                        if total_batches > 1:
-                            print(f"     ⚠️  배치 {batch_idx}: 성공 {success_cnt}건, 실패 {fail_cnt}건")
-                    else:
-                        if total_batches > 1:
-                            print(f"     ✅ 배치 {batch_idx}: 성공 {success_cnt}건")
-
-                except Exception as e:
-                    print(f"     ❌ 배치 {batch_idx} 업로드 실패: {e}")
-                    failed_batches.append(batch_idx)
-                    continue
+            upload = upload_batches_to_ecount(session, purchase_batches, "purchase")
+            total_success_cnt = upload["success_count"]
+            total_fail_cnt = upload["fail_count"]
+            all_slip_nos = upload["slip_nos"]
+            failed_batches = upload["failed_batches"]
 
             results["purchase_upload"] = {
-                "success": len(failed_batches) == 0,
+                "success": upload["success"],
                 "success_count": total_success_cnt,
                 "fail_count": total_fail_cnt,
                 "slip_nos": all_slip_nos,
@@ -1564,7 +1295,8 @@ def process_and_upload(upload_sales: bool = True, upload_purchase: bool = True,
                     "failed_batches": failed_batches,
                     "total_batches": total_batches,
                     "success_count": total_success_cnt,
-                    "fail_count": total_fail_cnt
+                    "fail_count": total_fail_cnt,
+                    "error_details": upload["error_details"]
                 }
                 log_file = save_failure_log(failure_info)
                 print(f"\n  📝 실패 기록 저장: {log_file}")
@@ -1887,6 +1619,9 @@ if __name__ == "__main__":
             if session_id:
                 print(f"\n✅ 로그인 성공")
                 print(f"SESSION_ID: {session_id}")
+
+                # 이후 업로드에서 재사용하도록 세션 캐시에 저장
+                get_ecount_session().remember(session_id)
             else:
                 print("\n❌ SESSION_ID를 찾을 수 없습니다.")
                 print("응답 구조를 확인하세요:")
@@ -0,0 +1,274 @@
+"""
+DB 스키마 마이그레이션
+
+- schema_version 테이블에 적용된 버전 기록
+- MIGRATIONS 목록을 버전 순서대로 한 번씩만 적용 (모든 단계는 재실행해도 안전)
+- 평소 connect()는 schema_version 조회 1회로 끝남 (information_schema 확인/ALTER는 마이그레이션 시에만)
+
+사용법:
+    python migrations.py migrate   # 미적용 마이그레이션 적용
+    python migrations.py status    # 현재 버전 확인
+"""
+
+import os
+from typing import Callable, List, Tuple
+
+from mysql.connector import Error, errorcode
+from dotenv import load_dotenv
+
+from db_pool import ensure_database, get_connection
+
+# Load environment variables
+load_dotenv()
+
+# ===== 설정 =====
+DB_HOST = os.environ.get("DB_HOST", "localhost")
+DB_USER = os.environ.get("DB_USER", "root")
+DB_PASSWORD = os.environ.get("DB_PASSWORD", "")
+DB_NAME = os.environ.get("DB_NAME", "seller_mapping")
+
+
+# ===== 마이그레이션 단계 =====
+
+def _column_exists(cursor, database: str, table: str, column: str) -> bool:
+    """컬럼 존재 여부 (마이그레이션에서만 사용)"""
+    cursor.execute("""
+        SELECT COUNT(*) as count
+        FROM information_schema.columns
+        WHERE table_schema = %s AND table_name = %s AND column_name = %s
+    """, (database, table, column))
+    return cursor.fetchone()['count'] > 0
+
+
+def _create_seller_mapping(cursor, database: str):
+    """판매처 이름 매핑 테이블"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS seller_mapping (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            alias VARCHAR(255) NOT NULL UNIQUE,
+            standard_name VARCHAR(255) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_alias (alias),
+            INDEX idx_standard (standard_name)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+
+def _create_coupang_tables(cursor, database: str):
+    """쿠팡 상품 매핑 테이블 (스탠다드 상품, 매핑, 세트상품, 세트 구성품)"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS standard_products (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            product_name VARCHAR(500) NOT NULL UNIQUE COMMENT '이지어드민 스탠다드 상품명',
+            brand VARCHAR(100) NOT NULL COMMENT '브랜드 (닥터시드/딸로/테르스/에이더)',
+            cost_price DECIMAL(10, 2) DEFAULT 0 COMMENT '원가 (부가세 포함)',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_product_name (product_name),
+            INDEX idx_brand (brand)
+        ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS coupang_product_mapping (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            coupang_option_name VARCHAR(500) NOT NULL UNIQUE COMMENT '쿠팡 옵션명',
+            standard_product_name VARCHAR(500) NOT NULL COMMENT '이지어드민 스탠다드 상품명 또는 세트상품명',
+            quantity_multiplier INT NOT NULL DEFAULT 1 COMMENT '수량 배수 (N개 묶음)',
+            brand VARCHAR(100) NOT NULL COMMENT '브랜드',
+            is_set_product BOOLEAN DEFAULT FALSE COMMENT '세트상품 여부',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_coupang_option (coupang_option_name),
+            INDEX idx_standard_product (standard_product_name),
+            INDEX idx_brand (brand)
+        ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS set_products (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            set_name VARCHAR(500) NOT NULL UNIQUE COMMENT '세트상품명',
+            brand VARCHAR(100) NOT NULL COMMENT '브랜드',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_set_name (set_name),
+            INDEX idx_brand (brand)
+        ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS set_product_items (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            set_id INT NOT NULL COMMENT '세트상품 ID',
+            standard_product_name VARCHAR(500) NOT NULL COMMENT '구성품 상품명',
+            quantity INT NOT NULL DEFAULT 1 COMMENT '구성 수량',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_set_id (set_id),
+            INDEX idx_product_name (standard_product_name),
+            FOREIGN KEY (set_id) REFERENCES set_products(id) ON DELETE CASCADE
+        ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+    """)
+
+
+def _add_cost_price(cursor, database: str):
+    """기존 standard_products 테이블에 cost_price 컬럼 추가"""
+    if not _column_exists(cursor, database, "standard_products", "cost_price"):
+        cursor.execute("""
+            ALTER TABLE standard_products
+            ADD COLUMN cost_price DECIMAL(10, 2) DEFAULT 0 COMMENT '원가 (부가세 포함)'
+        """)
+
+
+def _add_is_set_product(cursor, database: str):
+    """기존 coupang_product_mapping 테이블에 is_set_product 컬럼 추가"""
+    if not _column_exists(cursor, database, "coupang_product_mapping", "is_set_product"):
+        cursor.execute("""
+            ALTER TABLE coupang_product_mapping
+            ADD COLUMN is_set_product BOOLEAN DEFAULT FALSE COMMENT '세트상품 여부'
+        """)
+
+
+# (버전, 설명, 적용 함수) - 새 마이그레이션은 항상 끝에 추가하고 기존 항목은 수정하지 않음
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "seller_mapping 테이블 생성", _create_seller_mapping),
+    (2, "쿠팡 상품 매핑 테이블 생성", _create_coupang_tables),
+    (3, "standard_products.cost_price 컬럼 추가", _add_cost_price),
+    (4, "coupang_product_mapping.is_set_product 컬럼 추가", _add_is_set_product),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ===== 실행 =====
+
+def get_schema_version(cursor) -> int:
+    """
+    현재 스키마 버전
+
+    Returns:
+        적용된 최신 버전 (schema_version 테이블이 없으면 0)
+    """
+    try:
+        cursor.execute("SELECT MAX(version) as version FROM schema_version")
+        row = cursor.fetchone()
+    except Error as e:
+        if e.errno == errorcode.ER_NO_SUCH_TABLE:
+            return 0
+        raise
+    return int(row['version'] or 0) if row else 0
+
+
+def apply_migrations(conn, database: str) -> int:
+    """
+    미적용 마이그레이션 적용
+
+    Args:
+        conn: 대상 DB에 연결된 MySQL 연결
+        database: 데이터베이스 이름
+
+    Returns:
+        이번에 적용한 마이그레이션 수
+    """
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INT PRIMARY KEY,
+                description VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+        """)
+        current = get_schema_version(cursor)
+
+        applied = 0
+        for version, description, migration in MIGRATIONS:
+            if version <= current:
+                continue
+            print(f"[INFO] 스키마 마이그레이션 {version}: {description}")
+            migration(cursor, database)
+            # 동시에 여러 프로세스가 마이그레이션해도 기록은 한 번만
+            cursor.execute(
+                "INSERT IGNORE INTO schema_version (version, description) VALUES (%s, %s)",
+                (version, description)
+            )
+            conn.commit()
+            applied += 1
+        return applied
+    finally:
+        cursor.close()
+
+
+def ensure_schema(conn, database: str):
+    """
+    connect() 시 스키마 확인: 최신이면 조회 1회로 끝, 뒤처져 있으면 마이그레이션 자동 적용
+
+    Args:
+        conn: 대상 DB에 연결된 MySQL 연결
+        database: 데이터베이스 이름
+    """
+    cursor = conn.cursor(dictionary=True)
+    try:
+        version = get_schema_version(cursor)
+    finally:
+        cursor.close()
+
+    if version < LATEST_VERSION:
+        applied = apply_migrations(conn, database)
+        if applied:
+            print(f"✅ 스키마 버전 {version} → {LATEST_VERSION} ({applied}건 적용)")
+
+
+def migrate(database: str = DB_NAME, host: str = DB_HOST, user: str = DB_USER,
+            password: str = DB_PASSWORD) -> int:
+    """
+    migrate CLI: 데이터베이스 생성 + 미적용 마이그레이션 적용
+
+    Returns:
+        적용한 마이그레이션 수
+    """
+    ensure_database(database, host, user, password)
+    conn = get_connection(database, host, user, password)
+    try:
+        applied = apply_migrations(conn, database)
+    finally:
+        conn.close()
+    print(f"✅ 마이그레이션 완료: {database} (버전 {LATEST_VERSION}, 이번에 {applied}건 적용)")
+    return applied
+
+
+def status(database: str = DB_NAME, host: str = DB_HOST, user: str = DB_USER,
+           password: str = DB_PASSWORD) -> int:
+    """
+    status CLI: 현재 스키마 버전 출력
+
+    Returns:
+        현재 버전
+    """
+    conn = get_connection(database, host, user, password)
+    try:
+        cursor = conn.cursor(dictionary=True)
+        version = get_schema_version(cursor)
+        cursor.close()
+    finally:
+        conn.close()
+
+    print(f"스키마 버전: {version} / 최신: {LATEST_VERSION}")
+    for number, description, _ in MIGRATIONS:
+        marker = "✅" if number <= version else "⏳"
+        print(f"  {marker} {number}: {description}")
+    return version
+
+
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "migrate"
+    try:
+        if command == "migrate":
+            migrate()
+        elif command == "status":
+            status()
+        else:
+            print(f"알 수 없는 명령: {command}")
+            print("사용법: python migrations.py [migrate|status]")
+            sys.exit(1)
+    except Error as e:
+        print(f"❌ 마이그레이션 실패: {e}")
+        sys.exit(1)
@@ -0,0 +1,284 @@
+"""
+로컬 이름 매칭 (GPT 호출 전 단계)
+
+공백/전각·반각/대소문자/영문 알파벳 읽기 차이 같은 단순 오타는 GPT 없이 교정:
+- 정규화 키 일치: "G 마켓", "Ｇ마켓", "지마켓" → 같은 키
+- 자모 분해 편집 거리: "스마트스토아" ↔ "스마트스토어" (자모 1개 차이)
+- 자모 n-gram 인덱스로 후보를 먼저 좁힌 뒤 편집 거리 계산
+- 문자 n-gram TF-IDF 인덱스: 상품 목록에서 GPT 프롬프트용 상위 후보 추리기
+- 상품명 유사 검색: 카탈로그 버전별로 한 번 만든 인덱스로 GPT 응답 보정
+"""
+
+import re
+import math
+import hashlib
+import threading
+import unicodedata
+from collections import Counter, OrderedDict, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+# ===== 설정 =====
+NGRAM_SIZE = 3            # 자모 n-gram 크기
+MAX_CANDIDATES = 20       # 편집 거리를 계산할 최대 후보 수
+FUZZY_SHORTLIST = 10      # 상품명 유사 검색 시 SequenceMatcher로 재평가할 후보 수
+FUZZY_INDEX_CACHE_SIZE = 4  # 카탈로그 버전별 보관할 인덱스 수
+
+# 영문 알파벳 한글 읽기 ("G마켓" ↔ "지마켓")
+LATIN_READINGS = {
+    "a": "에이", "b": "비", "c": "씨", "d": "디", "e": "이", "f": "에프", "g": "지",
+    "h": "에이치", "i": "아이", "j": "제이", "k": "케이", "l": "엘", "m": "엠", "n": "엔",
+    "o": "오", "p": "피", "q": "큐", "r": "알", "s": "에스", "t": "티", "u": "유",
+    "v": "브이", "w": "더블유", "x": "엑스", "y": "와이", "z": "제트",
+}
+
+# 한글 음절 → 초성/중성/종성 자모
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSUNG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+NON_WORD_PATTERN = re.compile(r"[^0-9a-z가-힣]")
+
+
+def normalize_key(name: str) -> str:
+    """
+    비교용 정규화 키
+
+    NFKC(전각→반각) → 소문자 → 공백/기호 제거 → 영문 알파벳을 한글 읽기로 변환
+
+    Args:
+        name: 원본 이름
+
+    Returns:
+        정규화 키 (예: "G 마켓" → "지마켓")
+    """
+    text = unicodedata.normalize("NFKC", str(name)).lower()
+    text = NON_WORD_PATTERN.sub("", text)
+    return "".join(LATIN_READINGS.get(ch, ch) for ch in text)
+
+
+def decompose_jamo(text: str) -> str:
+    """한글 음절을 자모로 분해 (그 외 문자는 그대로)"""
+    result = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            result.append(CHOSUNG[code // 588])
+            result.append(JUNGSUNG[(code % 588) // 28])
+            if code % 28:
+                result.append(JONGSUNG[code % 28])
+        else:
+            result.append(ch)
+    return "".join(result)
+
+
+def edit_distance(a: str, b: str) -> int:
+    """레벤슈타인 편집 거리"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def jamo_similarity(a: str, b: str) -> float:
+    """자모 분해 문자열 간 유사도 (1 - 편집 거리 / 긴 쪽 길이)"""
+    if not a or not b:
+        return 0.0
+    return 1.0 - edit_distance(a, b) / max(len(a), len(b))
+
+
+def _ngrams(text: str, n: int = NGRAM_SIZE) -> List[str]:
+    """문자 n-gram (짧은 문자열은 통째로 1개)"""
+    if len(text) <= n:
+        return [text]
+    return [text[i:i + n] for i in range(len(text) - n + 1)]
+
+
+class LocalNameMatcher:
+    """
+    표준 이름 목록에 대한 로컬 매칭 엔진
+
+    목록 하나로 한 번 만들어 두고 여러 이름을 조회 (조회는 읽기 전용이라 스레드 간 공유 가능)
+    """
+
+    def __init__(self, standard_names: List[str]):
+        """
+        Args:
+            standard_names: 표준 이름 목록
+        """
+        self.by_key: Dict[str, str] = {}
+        self.jamo_keys: List[Tuple[str, str]] = []  # [(자모 키, 표준 이름)]
+        self.index: Dict[str, List[int]] = defaultdict(list)
+
+        for name in standard_names:
+            key = normalize_key(name)
+            if not key or key in self.by_key:
+                continue
+            self.by_key[key] = name
+            jamo = decompose_jamo(key)
+            position = len(self.jamo_keys)
+            self.jamo_keys.append((jamo, name))
+            for gram in set(_ngrams(jamo)):
+                self.index[gram].append(position)
+
+    def match(self, name: str) -> Optional[Tuple[str, float]]:
+        """
+        가장 유사한 표준 이름 찾기
+
+        Args:
+            name: 매칭할 이름
+
+        Returns:
+            (표준 이름, 신뢰도 0.0 ~ 1.0) 또는 None (후보 없음)
+        """
+        key = normalize_key(name)
+        if not key:
+            return None
+        if key in self.by_key:
+            return self.by_key[key], 1.0
+
+        # n-gram을 많이 공유하는 후보만 편집 거리 계산
+        jamo = decompose_jamo(key)
+        shared = Counter()
+        for gram in set(_ngrams(jamo)):
+            shared.update(self.index.get(gram, ()))
+        if not shared:
+            return None
+
+        best_name, best_score = None, 0.0
+        for position, _ in shared.most_common(MAX_CANDIDATES):
+            candidate_jamo, candidate_name = self.jamo_keys[position]
+            score = jamo_similarity(jamo, candidate_jamo)
+            if score > best_score:
+                best_name, best_score = candidate_name, score
+
+        return (best_name, best_score) if best_name else None
+
+
+def _plain_key(text: str) -> str:
+    """n-gram 인덱스용 정규화 (NFKC → 대문자 → 공백/기호 제거, 영문은 그대로 유지)"""
+    return re.sub(r"[^0-9A-Z가-힣]", "", unicodedata.normalize("NFKC", str(text)).upper())
+
+
+class NgramTfidfIndex:
+    """
+    문자 2/3-gram TF-IDF 코사인 유사도 인덱스
+
+    상품명처럼 길고 영문 코드가 섞인 목록에서 상위 후보를 빠르게 추리는 용도
+    """
+
+    def __init__(self, texts: List[str]):
+        """
+        Args:
+            texts: 색인할 문자열 목록 (조회 결과는 이 목록의 위치로 반환)
+        """
+        term_counts = [Counter(self._terms(text)) for text in texts]
+        document_frequency = Counter(term for counts in term_counts for term in counts)
+        total = len(texts)
+        self.idf = {term: math.log((1 + total) / (1 + df)) + 1.0 for term, df in document_frequency.items()}
+
+        self.postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for position, counts in enumerate(term_counts):
+            weights = {term: count * self.idf[term] for term, count in counts.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, weight in weights.items():
+                self.postings[term].append((position, weight / norm))
+
+    @staticmethod
+    def _terms(text: str) -> List[str]:
+        key = _plain_key(text)
+        return _ngrams(key, 2) + _ngrams(key, 3)
+
+    def search(self, text: str, top_k: int) -> List[Tuple[int, float]]:
+        """
+        유사도 상위 후보
+
+        Args:
+            text: 조회 문자열
+            top_k: 최대 반환 개수
+
+        Returns:
+            [(위치, 코사인 유사도)] (유사도 내림차순, 공유 n-gram이 없는 항목은 제외)
+        """
+        counts = Counter(self._terms(text))
+        weights = {term: count * self.idf[term] for term, count in counts.items() if term in self.idf}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+
+        scores = defaultdict(float)
+        for term, weight in weights.items():
+            for position, doc_weight in self.postings[term]:
+                scores[position] += weight / norm * doc_weight
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+
+
+class FuzzyNameIndex:
+    """
+    상품명 유사 검색 인덱스 (difflib 전체 스캔 대체)
+
+    n-gram TF-IDF로 상위 후보만 추린 뒤 그 후보에만 SequenceMatcher 유사도 계산
+    → 점수 기준(ratio)은 기존 전체 스캔과 같고, 비교 횟수만 상품 수와 무관하게 줄어듦
+    """
+
+    def __init__(self, names: List[str]):
+        """
+        Args:
+            names: 상품명 목록 (조회 결과는 이 목록의 위치로 반환)
+        """
+        self.names = list(names)
+        self.lowered = [name.lower() for name in self.names]
+        self.tfidf = NgramTfidfIndex(self.names)
+
+    def best_match(self, query: str, shortlist: int = FUZZY_SHORTLIST) -> Optional[Tuple[int, float]]:
+        """
+        가장 유사한 이름
+
+        Args:
+            query: 조회 문자열
+            shortlist: SequenceMatcher로 재평가할 후보 수
+
+        Returns:
+            (위치, SequenceMatcher 유사도) 또는 None (공유 n-gram이 없는 경우)
+        """
+        query = query.lower()
+        best = None
+        for position, _ in self.tfidf.search(query, shortlist):
+            ratio = SequenceMatcher(None, query, self.lowered[position]).ratio()
+            if best is None or ratio > best[1]:
+                best = (position, ratio)
+        return best
+
+
+_fuzzy_index_cache: "OrderedDict[str, FuzzyNameIndex]" = OrderedDict()
+_fuzzy_index_lock = threading.Lock()
+
+
+def get_fuzzy_index(names: List[str]) -> FuzzyNameIndex:
+    """
+    이름 목록(카탈로그 버전)별로 한 번만 만든 FuzzyNameIndex 재사용
+
+    목록 내용의 해시를 키로 최근 FUZZY_INDEX_CACHE_SIZE개만 보관 → 상품이 추가/수정되면 새로 생성
+
+    Args:
+        names: 이름 목록
+
+    Returns:
+        FuzzyNameIndex
+    """
+    digest = hashlib.sha256("\0".join(names).encode("utf-8")).hexdigest()
+    with _fuzzy_index_lock:
+        index = _fuzzy_index_cache.get(digest)
+        if index is not None:
+            _fuzzy_index_cache.move_to_end(digest)
+            return index
+
+    index = FuzzyNameIndex(names)
+    with _fuzzy_index_lock:
+        _fuzzy_index_cache[digest] = index
+        while len(_fuzzy_index_cache) > FUZZY_INDEX_CACHE_SIZE:
+            _fuzzy_index_cache.popitem(last=False)
+    return index
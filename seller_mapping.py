@@ -14,6 +14,11 @@ import os
 from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
+from db_pool import ensure_database, get_connection, run_once
+from migrations import ensure_schema
+from gpt_utils import GPT_MAX_WORKERS, cached_chat_completion_json, run_concurrently
+from name_matcher import LocalNameMatcher
+
 # Load environment variables
 load_dotenv()
 
@@ -22,6 +27,7 @@ DB_HOST = os.environ.get("DB_HOST", "localhost")
 DB_USER = os.environ.get("DB_USER", "root")
 DB_PASSWORD = os.environ.get("DB_PASSWORD", "")
 DB_NAME = os.environ.get("DB_NAME", "seller_mapping")
+LOCAL_MATCH_THRESHOLD = 0.9  # 로컬 매칭 신뢰도가 이 값 이상이면 GPT 호출 생략
 
 
 class SellerMappingDB:
@@ -53,62 +59,23 @@ class SellerMappingDB:
         self.close()
 
     def connect(self):
-        """DB 연결 및 데이터베이스/테이블 자동 생성"""
+        """DB 연결 (연결 풀에서 빌림) 및 데이터베이스 생성/스키마 확인 (프로세스당 한 번)"""
         try:
-            # 먼저 DB 없이 연결하여 데이터베이스 생성
-            self.conn = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password
-            )
-            self.cursor = self.conn.cursor(dictionary=True)
-
             # 데이터베이스가 없으면 생성
-            self.cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
-            self.cursor.execute(f"USE {self.database}")
+            ensure_database(self.database, self.host, self.user, self.password)
 
-            # 테이블이 없으면 자동 생성
-            self._ensure_table_exists()
+            self.conn = get_connection(self.database, self.host, self.user, self.password)
+            self.cursor = self.conn.cursor(dictionary=True)
 
-            print(f"✅ 데이터베이스 연결: {self.database}")
+            # 스키마 버전 확인 (미적용 마이그레이션이 있으면 자동 적용)
+            if run_once(("schema", self.host, self.database), lambda: ensure_schema(self.conn, self.database)):
+                print(f"✅ 데이터베이스 연결: {self.database}")
         except Error as e:
             print(f"❌ DB 연결 실패: {e}")
             raise
 
-    def _ensure_table_exists(self):
-        """테이블 존재 확인 및 자동 생성"""
-        try:
-            # 테이블 존재 확인
-            self.cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM information_schema.tables
-                WHERE table_schema = %s AND table_name = 'seller_mapping'
-            """, (self.database,))
-
-            result = self.cursor.fetchone()
-
-            if result['count'] == 0:
-                # 테이블이 없으면 생성
-                print(f"[INFO] 테이블이 없습니다. 자동 생성 중...")
-                create_table_sql = """
-                CREATE TABLE seller_mapping (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    alias VARCHAR(255) NOT NULL UNIQUE,
-                    standard_name VARCHAR(255) NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    INDEX idx_alias (alias),
-                    INDEX idx_standard (standard_name)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-                """
-                self.cursor.execute(create_table_sql)
-                self.conn.commit()
-                print(f"✅ 테이블 생성 완료")
-        except Exception as e:
-            print(f"⚠️  테이블 확인/생성 중 오류: {e}")
-            # 치명적이지 않으므로 계속 진행
-
     def close(self):
-        """DB 연결 종료"""
+        """DB 연결 반환 (연결 풀)"""
         if self.conn:
             self.conn.commit()
             self.conn.close()
@@ -221,6 +188,34 @@ class SellerMappingDB:
         standard = self.get_standard_name(name)
         return standard if standard else name
 
+    def get_alias_map(self) -> Dict[str, str]:
+        """
+        전체 별칭 → 표준 이름 매핑을 한 번의 쿼리로 조회
+
+        키는 공백 제거 + 소문자로 저장 (utf8mb4_unicode_ci 비교와 동일하게 대소문자 무시)
+
+        Returns:
+            {별칭(소문자): 표준 이름}
+        """
+        self.cursor.execute("SELECT alias, standard_name FROM seller_mapping")
+        return {
+            row["alias"].strip().lower(): row["standard_name"]
+            for row in self.cursor.fetchall()
+        }
+
+    def normalize_many(self, names: List[str]) -> List[str]:
+        """
+        판매처 이름 일괄 정규화 (행마다 쿼리하지 않고 매핑 테이블을 한 번만 로드)
+
+        Args:
+            names: 원본 이름 리스트
+
+        Returns:
+            표준 이름 리스트 (입력 순서 유지, 매핑이 없으면 원본 그대로)
+        """
+        alias_map = self.get_alias_map()
+        return [alias_map.get(name.strip().lower()) or name for name in names]
+
     def update_mapping(self, alias: str, new_standard_name: str) -> bool:
         """
         기존 매핑 수정
@@ -326,13 +321,20 @@ class SellerMappingDB:
             print(f"⚠️  표준 이름 조회 실패: {e}")
             return []
 
-    def find_similar_with_gpt(self, seller_name: str, threshold: float = 0.7) -> Optional[Dict[str, any]]:
+    def find_similar_with_gpt(self, seller_name: str, threshold: float = 0.7,
+                              standard_names: Optional[List[str]] = None,
+                              matcher: Optional[LocalNameMatcher] = None) -> Optional[Dict[str, any]]:
         """
         GPT API를 사용하여 오타 교정 (수동발주 케이스용)
 
+        공백/전각·반각/자모 1~2개 차이 같은 단순 오타는 로컬 매칭으로 먼저 교정하고,
+        로컬 신뢰도가 LOCAL_MATCH_THRESHOLD 미만일 때만 GPT 호출
+
         Args:
             seller_name: 매칭할 판매처 이름
             threshold: 신뢰도 임계값 (0.0 ~ 1.0)
+            standard_names: 표준 이름 목록 (미리 조회한 목록, 없으면 DB에서 조회)
+            matcher: 표준 이름 목록으로 만든 로컬 매칭 엔진 (없으면 새로 생성)
 
         Returns:
             {
@@ -344,16 +346,29 @@ class SellerMappingDB:
             매칭 실패 시 None
         """
         try:
-            from openai import OpenAI
-
-            client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-
             # DB에서 모든 표준 이름 가져오기
-            standard_names = self.get_all_standard_names()
+            if standard_names is None:
+                standard_names = self.get_all_standard_names()
 
             if not standard_names:
                 return None
 
+            # 로컬 매칭으로 충분하면 GPT 호출 생략
+            local = (matcher or LocalNameMatcher(standard_names)).match(seller_name)
+            if local and local[1] >= max(threshold, LOCAL_MATCH_THRESHOLD):
+                return {
+                    "original": seller_name,
+                    "matched": local[0],
+                    "confidence": local[1],
+                    "requires_manual": False,
+                    "reason": "로컬 매칭 (공백/표기/자모 차이)"
+                }
+
+            from openai import OpenAI
+
+            # SDK 자체 재시도는 끄고 chat_completion_with_backoff의 백오프만 사용
+            client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"), max_retries=0)
+
             # GPT에게 가장 유사한 이름 찾기 요청
             prompt = f"""다음 판매처 이름을 아래 목록 중 가장 유사한 이름으로 매칭해주세요.
 오타나 띄어쓰기 차이를 고려하여 가장 적절한 것을 찾아주세요.
@@ -372,7 +387,11 @@ class SellerMappingDB:
 
 주의: matched_name은 반드시 위 목록에 있는 이름 중 하나여야 합니다. 확신이 없으면 confidence를 낮게 설정하세요."""
 
-            response = client.chat.completions.create(
+            result = cached_chat_completion_json(
+                client,
+                kind="seller",
+                input_name=seller_name,
+                candidates=standard_names,
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "당신은 판매처 이름 매칭 전문가입니다. 주어진 목록에서만 선택해야 합니다."},
@@ -380,10 +399,7 @@ class SellerMappingDB:
                 ],
                 temperature=0.1,
                 response_format={"type": "json_object"}
-            )
-
-            import json
-            result = json.loads(response.choices[0].message.content)
+            ) or {}
 
             matched_name = result.get("matched_name")
             confidence = float(result.get("confidence", 0.0))
@@ -415,6 +431,31 @@ class SellerMappingDB:
                 print(f"⚠️ GPT 매칭 실패: {error_msg}")
             return None
 
+    def find_similar_many_with_gpt(self, seller_names: List[str], threshold: float = 0.7,
+                                   max_workers: int = GPT_MAX_WORKERS) -> Dict[str, Optional[Dict[str, any]]]:
+        """
+        여러 판매처 이름을 GPT로 동시에 교정
+
+        - 표준 이름 목록과 로컬 매칭 엔진은 한 번만 생성 (DB 커서는 스레드 간 공유하지 않음)
+        - 동시 호출 수는 max_workers로 제한, 요청 제한 시 백오프 재시도
+
+        Args:
+            seller_names: 매칭할 판매처 이름 리스트
+            threshold: 신뢰도 임계값 (0.0 ~ 1.0)
+            max_workers: 동시 GPT 호출 수
+
+        Returns:
+            {판매처 이름: find_similar_with_gpt() 결과} (입력 순서 유지)
+        """
+        standard_names = self.get_all_standard_names()
+        matcher = LocalNameMatcher(standard_names)
+        return run_concurrently(
+            lambda name: self.find_similar_with_gpt(name, threshold, standard_names=standard_names,
+                                                    matcher=matcher),
+            seller_names,
+            max_workers=max_workers,
+        )
+
     def export_to_csv(self, csv_path: str = "seller_mapping.csv") -> bool:
         """
         매핑을 CSV로 내보내기